@@ -0,0 +1,409 @@
+"""
+Module for building the statements of many cohorts in one batch described by a manifest.
+
+A manifest is a JSON or TOML file with a "cohorts" array and an optional "defaults" table. Every
+cohort gives its semester files, themes file, template, output directory, speciality details and
+dates, and whatever a cohort leaves out is taken from the defaults. Relative paths are resolved
+against the directory of the manifest.
+
+Cohorts are scheduled across a pool of worker processes, the ones with the largest input files first.
+Each worker keeps parsed workbooks in memory and parsed templates per thread, so inputs shared by the
+cohorts it runs are parsed once, and all workers share an on-disk cache of parsed workbooks.
+
+Classes:
+- BatchManifestError: An error raised for an invalid batch manifest.
+
+Functions:
+- load_batch_manifest: Reads a manifest into the state holders of its cohorts.
+- run_batch: Builds the statements of every cohort and collects their reports.
+- get_cohort_status: Returns a short description of the outcome of a cohort.
+- format_batch_summary: Formats a batch report as a table with a row per cohort.
+- save_batch_report: Writes a batch report as JSON.
+
+Dependencies:
+- json, tomllib: For reading manifests.
+- concurrent.futures: For the pool of worker processes.
+- backend.runtime: Runs the pipeline of a single cohort.
+- backend.classes.batch_report, backend.classes.cohort_report: Report classes.
+"""
+
+import dataclasses
+import datetime
+import json
+import os
+import tempfile
+import time
+import tomllib
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+from typing import Any
+
+from backend import report_utils
+from backend.classes.batch_report import BatchReport
+from backend.classes.cohort_report import CohortReport
+from backend.classes.run_report import RunReport
+from backend.runtime import THREAD_INGEST_EXECUTOR, runtime
+
+BATCH_REPORT_FILE_NAME = 'batch_report.json'
+
+MANIFEST_COHORTS_KEY = 'cohorts'
+MANIFEST_DEFAULTS_KEY = 'defaults'
+MANIFEST_NAME_KEY = 'name'
+
+MANIFEST_PATHS_KEYS = {
+    'themes_file': 'diploma_file_path',
+    'template_file': 'template_file_path',
+    'output_directory': 'save_directory_path',
+}
+MANIFEST_TEXT_KEYS = (
+    'speciality_name',
+    'speciality_code',
+    'speciality_area_name',
+    'speciality_area_code',
+)
+MANIFEST_DATES_KEYS = ('start_date', 'end_date', 'statement_date')
+MANIFEST_RUN_SETTINGS_KEYS = (
+    'data_engine',
+    'compact_configs',
+    'streaming',
+    'streaming_queue_size',
+    'statements_workers',
+    'statements_chunk_size',
+    'single_document',
+    'incremental',
+    'ranking_columns',
+    'ranking_metric',
+    'write_report',
+    'trace_memory',
+)
+MANIFEST_SEMESTER_FILES_KEY = 'semester_files'
+MANIFEST_KEYS = frozenset(
+    (
+        MANIFEST_NAME_KEY,
+        MANIFEST_SEMESTER_FILES_KEY,
+        *MANIFEST_PATHS_KEYS,
+        *MANIFEST_TEXT_KEYS,
+        *MANIFEST_DATES_KEYS,
+        *MANIFEST_RUN_SETTINGS_KEYS,
+    )
+)
+
+RETURN_CODES_STATUSES = {
+    1: 'semester files error',
+    2: 'diploma themes error',
+    3: 'output error',
+    4: 'ok',
+    5: 'cancelled',
+}
+CRASHED_STATUS = 'crashed'
+
+
+class BatchManifestError(Exception):
+    """
+    An error raised when a batch manifest cannot be read or describes a cohort incompletely.
+    """
+
+
+def _read_manifest_file(manifest_path: str) -> dict[str, Any]:
+    try:
+        if manifest_path.lower().endswith('.toml'):
+            with open(manifest_path, 'rb') as file:
+                return tomllib.load(file)
+
+        with open(manifest_path, encoding='utf-8') as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        raise BatchManifestError(
+            f"Cannot read manifest {manifest_path}: {report_utils.describe_error(e)}"
+        ) from e
+
+
+def _parse_date(cohort_name: str, key: str, value: Any) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    try:
+        return datetime.date.fromisoformat(value)
+    except (TypeError, ValueError) as e:
+        raise BatchManifestError(
+            f"Cohort {cohort_name}: {key} must be a date in YYYY-MM-DD format, got {value!r}"
+        ) from e
+
+
+def _make_cohort_state_holder(
+    cohort_name: str, entry: dict[str, Any], manifest_directory_path: str
+) -> dict[str, Any]:
+    unknown_keys = sorted(entry.keys() - MANIFEST_KEYS)
+    if unknown_keys:
+        raise BatchManifestError(f"Cohort {cohort_name}: unknown keys {', '.join(unknown_keys)}")
+
+    missing_keys = [
+        key
+        for key in (
+            MANIFEST_SEMESTER_FILES_KEY,
+            *MANIFEST_PATHS_KEYS,
+            *MANIFEST_TEXT_KEYS,
+            'start_date',
+            'end_date',
+        )
+        if key not in entry
+    ]
+    if missing_keys:
+        raise BatchManifestError(f"Cohort {cohort_name}: missing keys {', '.join(missing_keys)}")
+
+    def resolve_path(path: str) -> str:
+        return os.path.normpath(os.path.join(manifest_directory_path, os.path.expanduser(path)))
+
+    semester_files = entry[MANIFEST_SEMESTER_FILES_KEY]
+    if isinstance(semester_files, str) or not semester_files:
+        raise BatchManifestError(f"Cohort {cohort_name}: semester_files must be a non-empty list")
+
+    return {
+        'semester_files_count': len(semester_files),
+        'semester_files_paths': [resolve_path(path) for path in semester_files],
+        **{
+            state_holder_key: resolve_path(entry[key])
+            for key, state_holder_key in MANIFEST_PATHS_KEYS.items()
+        },
+        **{key: str(entry[key]) for key in MANIFEST_TEXT_KEYS},
+        **{
+            key: _parse_date(cohort_name, key, entry.get(key, datetime.date.today()))
+            for key in MANIFEST_DATES_KEYS
+        },
+        **{key: entry[key] for key in MANIFEST_RUN_SETTINGS_KEYS if key in entry},
+    }
+
+
+def load_batch_manifest(manifest_path: str) -> dict[str, dict[str, Any]]:
+    """
+    Reads a JSON or TOML batch manifest into the state holders of its cohorts.
+
+    Cohorts without a name are named after their position in the manifest. The statement date
+    defaults to the current date.
+
+    :param manifest_path: The path to the manifest; files ending with .toml are read as TOML.
+    :type manifest_path: str
+    :raises BatchManifestError: If the manifest cannot be read, has no cohorts, has duplicated cohort
+        names or output directories, or describes a cohort with missing, unknown or malformed keys.
+    :return: The state holders of the cohorts by cohort name, in manifest order.
+    :rtype: dict[str, dict[str, Any]]
+    """
+    manifest = _read_manifest_file(manifest_path)
+    if not isinstance(manifest, dict):
+        manifest = {}
+    defaults = manifest.get(MANIFEST_DEFAULTS_KEY, {})
+    entries = manifest.get(MANIFEST_COHORTS_KEY)
+    if not isinstance(defaults, dict) or not isinstance(entries, list) or not entries:
+        raise BatchManifestError(
+            f"Manifest {manifest_path} must have a non-empty {MANIFEST_COHORTS_KEY} list"
+        )
+
+    manifest_directory_path = os.path.dirname(os.path.abspath(manifest_path))
+    cohorts = {}
+    cohorts_names_by_output_directory = {}
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise BatchManifestError(f"Cohort {i + 1} must be a table of keys")
+
+        cohort_name = str(entry.get(MANIFEST_NAME_KEY, f'cohort_{i + 1}'))
+        if cohort_name in cohorts:
+            raise BatchManifestError(f"Cohort {cohort_name} is listed more than once")
+
+        state_holder = _make_cohort_state_holder(
+            cohort_name, {**defaults, **entry}, manifest_directory_path
+        )
+        output_directory = os.path.normcase(os.path.realpath(state_holder['save_directory_path']))
+        if output_directory in cohorts_names_by_output_directory:
+            raise BatchManifestError(
+                f"Cohorts {cohorts_names_by_output_directory[output_directory]} and {cohort_name} "
+                f"write to the same output directory {state_holder['save_directory_path']}"
+            )
+
+        cohorts_names_by_output_directory[output_directory] = cohort_name
+        cohorts[cohort_name] = state_holder
+
+    return cohorts
+
+
+def _get_cohort_input_size(state_holder: dict[str, Any]) -> int:
+    input_size = 0
+    for path in (*state_holder['semester_files_paths'], state_holder['diploma_file_path']):
+        try:
+            input_size += os.path.getsize(path)
+        except OSError:
+            continue
+    return input_size
+
+
+def _run_cohort(cohort_name: str, state_holder: dict[str, Any]) -> CohortReport:
+    """
+    Runs the pipeline of a single cohort, creating its output directory if needed.
+
+    :return: The report of the cohort.
+    """
+    cohort_report = CohortReport(cohort_name, state_holder['save_directory_path'])
+    try:
+        os.makedirs(cohort_report.save_directory_path, exist_ok=True)
+    except OSError as e:
+        cohort_report.run_report.error = report_utils.describe_error(e)
+        cohort_report.run_report.return_code = 3
+        return cohort_report
+
+    runtime(state_holder, cohort_report.run_report)
+    return cohort_report
+
+
+def run_batch(
+    cohorts: dict[str, dict[str, Any]],
+    workers: int = 1,
+    cache_directory_path: str | None = None,
+    on_cohort_done: Callable[[CohortReport], None] | None = None,
+) -> BatchReport:
+    """
+    Builds the statements of every cohort, scheduling the cohorts across a pool of worker processes.
+
+    Workbooks are read in threads of the worker running the cohort, through the worker's in-memory
+    cache and an on-disk cache shared by all workers. Without a cache directory a temporary one is
+    used for the duration of the batch. A failed cohort, or one whose worker process crashed, does
+    not stop the others.
+
+    :param cohorts: The state holders of the cohorts by cohort name, as from load_batch_manifest.
+    :type cohorts: dict[str, dict[str, Any]]
+    :param workers: The number of worker processes (default is 1, running in the current process).
+    :type workers: int
+    :param cache_directory_path: The directory caching parsed workbooks (default is None).
+    :type cache_directory_path: str | None
+    :param on_cohort_done: A function called with the report of every cohort as soon as it finishes,
+        or None (default is None).
+    :type on_cohort_done: Callable[[CohortReport], None] | None
+    :return: The reports of the cohorts in the order of the manifest.
+    :rtype: BatchReport
+    """
+    workers = max(1, min(workers, len(cohorts)))
+    batch_report = BatchReport(workers=workers)
+    cohorts_reports = {}
+
+    start_wall_time = time.perf_counter()
+    start_cpu_time = report_utils.get_cpu_time()
+    with (
+        nullcontext(cache_directory_path)
+        if cache_directory_path is not None
+        else tempfile.TemporaryDirectory(prefix='diploma-cache-')
+    ) as batch_cache_directory_path:
+        cohorts_state_holders = {
+            cohort_name: {
+                **state_holder,
+                'cache_directory_path': batch_cache_directory_path,
+                'memory_cache': True,
+                'ingest_executor': THREAD_INGEST_EXECUTOR,
+            }
+            for cohort_name, state_holder in sorted(
+                cohorts.items(), key=lambda item: _get_cohort_input_size(item[1]), reverse=True
+            )
+        }
+
+        def add_cohort_report(cohort_report: CohortReport) -> None:
+            cohorts_reports[cohort_report.name] = cohort_report
+            if on_cohort_done is not None:
+                on_cohort_done(cohort_report)
+
+        if workers == 1:
+            for cohort_name, state_holder in cohorts_state_holders.items():
+                add_cohort_report(_run_cohort(cohort_name, state_holder))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(_run_cohort, cohort_name, state_holder): cohort_name
+                    for cohort_name, state_holder in cohorts_state_holders.items()
+                }
+                for future in as_completed(futures):
+                    cohort_name = futures[future]
+                    try:
+                        cohort_report = future.result()
+                    except BrokenProcessPool as e:
+                        cohort_report = CohortReport(
+                            cohort_name,
+                            cohorts[cohort_name]['save_directory_path'],
+                            RunReport(error=report_utils.describe_error(e)),
+                        )
+                    add_cohort_report(cohort_report)
+
+    batch_report.cohorts = [cohorts_reports[cohort_name] for cohort_name in cohorts]
+    batch_report.wall_time = time.perf_counter() - start_wall_time
+    batch_report.cpu_time = report_utils.get_cpu_time() - start_cpu_time
+    return batch_report
+
+
+def get_cohort_status(cohort_report: CohortReport) -> str:
+    """
+    Returns a short description of the outcome of a cohort.
+
+    :param cohort_report: The report of the cohort.
+    :type cohort_report: CohortReport
+    :return: "ok" for a successful run, otherwise the kind of failure.
+    :rtype: str
+    """
+    return RETURN_CODES_STATUSES.get(cohort_report.run_report.return_code, CRASHED_STATUS)
+
+
+def _get_counter(run_report: RunReport, counter_name: str, stage_names: tuple[str, ...]) -> str:
+    for stage_report in run_report.stages:
+        if stage_report.name in stage_names and counter_name in stage_report.counters:
+            return str(stage_report.counters[counter_name])
+    return '-'
+
+
+def format_batch_summary(batch_report: BatchReport) -> str:
+    """
+    Formats a batch report as a plain-text table with a row per cohort and a total row.
+
+    :param batch_report: The batch report.
+    :type batch_report: BatchReport
+    :return: The table with the status, counts and times of the cohorts.
+    :rtype: str
+    """
+    lines = [
+        f'{"cohort":<24} {"status":<22} {"students":>9} {"documents":>10} '
+        f'{"wall, s":>9} {"cpu, s":>9}'
+    ]
+    for cohort_report in batch_report.cohorts:
+        run_report = cohort_report.run_report
+        students_count = _get_counter(run_report, 'students', ('join_workbooks',))
+        documents_count = _get_counter(
+            run_report, 'documents_written', ('build_statements', 'stream_statements')
+        )
+        lines.append(
+            f'{cohort_report.name:<24} {get_cohort_status(cohort_report):<22} '
+            f'{students_count:>9} {documents_count:>10} '
+            f'{run_report.wall_time:>9.3f} {run_report.cpu_time:>9.3f}'
+        )
+        if run_report.error is not None:
+            lines.append(f'    {run_report.error}')
+
+    succeeded_count = sum(
+        get_cohort_status(cohort_report) == RETURN_CODES_STATUSES[4]
+        for cohort_report in batch_report.cohorts
+    )
+    lines.append(
+        f'{succeeded_count} of {len(batch_report.cohorts)} cohorts succeeded with '
+        f'{batch_report.workers} workers in {batch_report.wall_time:.3f} s '
+        f'(cpu {batch_report.cpu_time:.3f} s)'
+    )
+    return '\n'.join(lines)
+
+
+def save_batch_report(batch_report: BatchReport, report_path: str) -> None:
+    """
+    Writes a batch report as JSON.
+
+    :param batch_report: The batch report.
+    :type batch_report: BatchReport
+    :param report_path: The path to the written report.
+    :type report_path: str
+    :return: None
+    """
+    with open(report_path, 'w', encoding='utf-8') as file:
+        json.dump(dataclasses.asdict(batch_report), file, ensure_ascii=False, indent=2)
@@ -0,0 +1,242 @@
+"""
+Module implementing an on-disk cache of parsed DataFrames keyed by source file content.
+
+Parsing Excel workbooks is the most expensive fixed cost of a run, while the same semester files are
+usually read again and again. Parsed DataFrames are therefore pickled into a cache directory under
+a key derived from a streaming SHA-256 hash and the size of the source file. Hashes of the most
+recently used few hundred files are memoized per (path, size, mtime), so unchanged files are hashed
+only once per process. The cache directory is bounded in size and the least recently used entries
+are evicted first.
+
+Processes running many cohorts can additionally keep parsed DataFrames in an in-memory cache bounded
+by the number of entries, so workbooks shared by the cohorts are not even unpickled again.
+
+Functions:
+- get_file_digest: Computes the content digest of a file.
+- load_cached_dataframe: Loads a cached DataFrame by key.
+- store_cached_dataframe: Stores a DataFrame under a key and evicts old entries.
+- evict_cache: Removes least recently used entries until the cache fits into its size limit.
+- invalidate_cache: Removes cached entries of a single source file or the whole cache.
+- load_memory_cached_dataframe: Loads a DataFrame from the in-memory cache by key.
+- store_memory_cached_dataframe: Stores a DataFrame in the in-memory cache.
+- clear_memory_cache: Removes every entry of the in-memory cache.
+
+Dependencies:
+- pandas, pickle: For pickling DataFrames and telling corrupted cache entries apart.
+- hashlib, os: For hashing files and managing the cache directory.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import suppress
+
+import pandas
+from pandas import DataFrame
+
+CACHE_ENTRY_SUFFIX = '.pkl'
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_MEMORY_CACHE_MAX_ENTRIES = 32
+FILE_DIGESTS_MAX_ENTRIES = 256
+
+_file_digests: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+_file_digests_lock = threading.Lock()
+_memory_cached_dataframes: OrderedDict[str, DataFrame] = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+
+def get_file_digest(file_path: str) -> str:
+    """
+    Computes the digest of a file from a streaming SHA-256 hash of its content and its size.
+
+    The digest is memoized by the file's absolute path, size and modification time; only the
+    FILE_DIGESTS_MAX_ENTRIES most recently used digests are kept.
+
+    :param file_path: The path to the file.
+    :type file_path: str
+    :return: The digest of the file.
+    :rtype: str
+    """
+    file_stat = os.stat(file_path)
+    memo_key = (os.path.abspath(file_path), file_stat.st_size, file_stat.st_mtime_ns)
+    with _file_digests_lock:
+        digest = _file_digests.get(memo_key)
+        if digest is not None:
+            _file_digests.move_to_end(memo_key)
+            return digest
+
+    content_hash = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            content_hash.update(chunk)
+
+    digest = f"{content_hash.hexdigest()}-{file_stat.st_size}"
+    with _file_digests_lock:
+        _file_digests[memo_key] = digest
+        _file_digests.move_to_end(memo_key)
+        while len(_file_digests) > FILE_DIGESTS_MAX_ENTRIES:
+            _file_digests.popitem(last=False)
+
+    return digest
+
+
+def _get_cache_entry_path(cache_directory_path: str, key: str) -> str:
+    return os.path.join(cache_directory_path, key + CACHE_ENTRY_SUFFIX)
+
+
+def load_cached_dataframe(cache_directory_path: str, key: str) -> DataFrame | None:
+    """
+    Loads a cached DataFrame and marks its entry as recently used.
+
+    :param cache_directory_path: The path to the cache directory.
+    :type cache_directory_path: str
+    :param key: The key of the cache entry.
+    :type key: str
+    :return: The cached DataFrame, or None if there is no usable entry.
+    :rtype: DataFrame | None
+    """
+    entry_path = _get_cache_entry_path(cache_directory_path, key)
+    try:
+        df = pandas.read_pickle(entry_path)
+        os.utime(entry_path)
+    except FileNotFoundError:
+        return None
+    except (OSError, EOFError, ValueError, ImportError, AttributeError, pickle.UnpicklingError):
+        with suppress(OSError):
+            os.remove(entry_path)
+        return None
+
+    return df
+
+
+def store_cached_dataframe(
+    cache_directory_path: str,
+    key: str,
+    df: DataFrame,
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+) -> None:
+    """
+    Atomically stores a DataFrame in the cache and evicts entries exceeding the size limit.
+
+    :param cache_directory_path: The path to the cache directory, created if missing.
+    :type cache_directory_path: str
+    :param key: The key of the cache entry.
+    :type key: str
+    :param df: The DataFrame to store.
+    :type df: DataFrame
+    :param cache_max_bytes: The maximum total size of the cache directory in bytes.
+    :type cache_max_bytes: int
+    :return: None
+    """
+    os.makedirs(cache_directory_path, exist_ok=True)
+    file_descriptor, temporary_path = tempfile.mkstemp(dir=cache_directory_path, suffix='.tmp')
+    os.close(file_descriptor)
+    try:
+        df.to_pickle(temporary_path)
+        os.replace(temporary_path, _get_cache_entry_path(cache_directory_path, key))
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+    evict_cache(cache_directory_path, cache_max_bytes)
+
+
+def evict_cache(cache_directory_path: str, cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+    """
+    Removes the least recently used cache entries until the cache fits into the size limit.
+
+    :param cache_directory_path: The path to the cache directory.
+    :type cache_directory_path: str
+    :param cache_max_bytes: The maximum total size of the cache directory in bytes.
+    :type cache_max_bytes: int
+    :return: None
+    """
+    entries = []
+    with os.scandir(cache_directory_path) as directory_entries:
+        for directory_entry in directory_entries:
+            if directory_entry.is_file() and directory_entry.name.endswith(CACHE_ENTRY_SUFFIX):
+                entry_stat = directory_entry.stat()
+                entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, directory_entry.path))
+
+    total_size = sum(entry_size for _, entry_size, _ in entries)
+    for _, entry_size, entry_path in sorted(entries):
+        if total_size <= cache_max_bytes:
+            break
+        try:
+            os.remove(entry_path)
+        except OSError:
+            continue
+        total_size -= entry_size
+
+
+def invalidate_cache(cache_directory_path: str, file_path: str | None = None) -> None:
+    """
+    Removes cached entries of a single source file, or every entry if no file is given.
+
+    :param cache_directory_path: The path to the cache directory.
+    :type cache_directory_path: str
+    :param file_path: The path to the source file whose entries are removed (default is None).
+    :type file_path: str | None
+    :return: None
+    """
+    if not os.path.isdir(cache_directory_path):
+        return
+
+    prefix = get_file_digest(file_path) if file_path is not None else ''
+    for entry_name in os.listdir(cache_directory_path):
+        if entry_name.startswith(prefix) and entry_name.endswith(CACHE_ENTRY_SUFFIX):
+            os.remove(os.path.join(cache_directory_path, entry_name))
+
+
+def load_memory_cached_dataframe(key: str) -> DataFrame | None:
+    """
+    Loads a DataFrame from the in-memory cache of the process and marks it as recently used.
+
+    The same DataFrame object is returned to every caller, so it must not be modified.
+
+    :param key: The key of the cache entry.
+    :type key: str
+    :return: The cached DataFrame, or None if there is no entry.
+    :rtype: DataFrame | None
+    """
+    with _memory_cache_lock:
+        df = _memory_cached_dataframes.get(key)
+        if df is not None:
+            _memory_cached_dataframes.move_to_end(key)
+
+    return df
+
+
+def store_memory_cached_dataframe(
+    key: str, df: DataFrame, max_entries: int = DEFAULT_MEMORY_CACHE_MAX_ENTRIES
+) -> None:
+    """
+    Stores a DataFrame in the in-memory cache and evicts the least recently used entries.
+
+    :param key: The key of the cache entry.
+    :type key: str
+    :param df: The DataFrame to store.
+    :type df: DataFrame
+    :param max_entries: The maximum number of entries kept in memory.
+    :type max_entries: int
+    :return: None
+    """
+    with _memory_cache_lock:
+        _memory_cached_dataframes[key] = df
+        _memory_cached_dataframes.move_to_end(key)
+        while len(_memory_cached_dataframes) > max_entries:
+            _memory_cached_dataframes.popitem(last=False)
+
+
+def clear_memory_cache() -> None:
+    """
+    Removes every entry of the in-memory cache.
+
+    :return: None
+    """
+    with _memory_cache_lock:
+        _memory_cached_dataframes.clear()
@@ -0,0 +1,28 @@
+"""
+Module defining the BatchReport class for storing the consolidated results of a batch of cohorts.
+
+Classes:
+- BatchReport: A dataclass for storing the reports of all cohorts and the totals of a batch.
+"""
+
+from dataclasses import dataclass, field
+
+from backend.classes.cohort_report import CohortReport
+
+
+@dataclass
+class BatchReport:
+    """
+    A class representing the consolidated results of a batch run.
+
+    Attributes:
+        cohorts: The reports of the cohorts in manifest order.
+        workers: The number of worker processes the cohorts were scheduled across.
+        wall_time: The elapsed wall-clock time of the batch in seconds.
+        cpu_time: The CPU time of the batch in seconds, including finished child processes.
+    """
+
+    cohorts: list[CohortReport] = field(default_factory=list)
+    workers: int = 1
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
@@ -0,0 +1,49 @@
+"""
+Module defining the CohortPlan class for storing parsed discipline column headers of a cohort.
+
+Every student of a cohort shares exactly the same discipline columns, so the encoded column headers
+are parsed once into a plan and per-student processing only gathers values by column index.
+
+Classes:
+- CohortPlan: A dataclass for storing parsed discipline columns, their categories and orderings.
+"""
+
+from dataclasses import dataclass
+
+from backend.classes.control_form import ControlForm
+from backend.classes.discipline_category import DisciplineCategory
+
+
+@dataclass(frozen=True)
+class CohortPlan:
+    """
+    A class representing the compiled discipline columns shared by all students of a cohort.
+
+    Attributes:
+        discipline_infos: The encoded discipline column headers in column order.
+        control_forms: The form of control of each column's discipline.
+        names: The name of each column's discipline.
+        semesters: The semester number of each column's discipline.
+        study_hours: The number of study hours of each column's discipline.
+        credits_numbers: The number of credits of each column's discipline.
+        categories: The category of each column's discipline.
+        control_form_codes: The form of control of each column's discipline as an enumeration member,
+            or as its abbreviation if it is unknown.
+        category_codes: The category of each column's discipline as an enumeration member.
+        category_orders: Pairs of each category and its column indices, sorted by semester.
+        summarization_groups: Column indices of regular disciplines grouped by name, ordered by semester.
+        regular_summarization_groups: The same groups as positions in the regular category's order.
+    """
+
+    discipline_infos: tuple[str, ...]
+    control_forms: tuple[str, ...]
+    names: tuple[str, ...]
+    semesters: tuple[int, ...]
+    study_hours: tuple[int, ...]
+    credits_numbers: tuple[float, ...]
+    categories: tuple[str, ...]
+    control_form_codes: tuple[ControlForm | str, ...]
+    category_codes: tuple[DisciplineCategory, ...]
+    category_orders: tuple[tuple[str, tuple[int, ...]], ...]
+    summarization_groups: tuple[tuple[int, ...], ...]
+    regular_summarization_groups: tuple[tuple[int, ...], ...]
@@ -0,0 +1,26 @@
+"""
+Module defining the CohortReport class for storing the outcome of a single cohort of a batch.
+
+Classes:
+- CohortReport: A dataclass for storing the name, output directory and run report of a cohort.
+"""
+
+from dataclasses import dataclass, field
+
+from backend.classes.run_report import RunReport
+
+
+@dataclass
+class CohortReport:
+    """
+    A class representing the outcome of a cohort processed as part of a batch.
+
+    Attributes:
+        name: The name of the cohort from the batch manifest.
+        save_directory_path: The directory the cohort's outputs were written to.
+        run_report: The run report of the cohort, whose return code tells the status of the run.
+    """
+
+    name: str
+    save_directory_path: str
+    run_report: RunReport = field(default_factory=RunReport)
@@ -0,0 +1,64 @@
+"""
+Module defining the CompactDisciplineConfig class, a memory-efficient discipline configuration.
+
+Runs create one discipline configuration per student and discipline, i.e. hundreds of thousands of
+instances. This variant has no per-instance __dict__, stores the category and a known form of
+control as small-integer enumerations and is meant to share interned discipline names with a cohort
+plan. It exposes the contol_form and categoty attributes of DisciplineConfig as properties, so it can be
+processed by the same grouping and formatting functions. It is not frozen because the generated
+__init__ of frozen dataclasses is several times slower, which dominates when building instances.
+
+Classes:
+- CompactDisciplineConfig: A slotted dataclass for storing discipline configurations.
+"""
+
+from dataclasses import dataclass
+
+from backend.classes.control_form import ControlForm
+from backend.classes.discipline_category import DisciplineCategory
+
+
+@dataclass(slots=True)
+class CompactDisciplineConfig:
+    """
+    A class representing the configuration of a discipline with a compact memory layout.
+
+    Attributes:
+        control_form: The form of control for the discipline, or its abbreviation if it is unknown.
+        name: The name of the discipline.
+        semester: The semester number in which the discipline was studied.
+        mark: The mark or grade for the discipline. Can be an integer, string, or tuple of mixed values.
+        study_hours: The total number of study hours assigned to the discipline.
+        credits_number: The number of credits associated with the discipline.
+        category: The category of the discipline.
+    """
+
+    control_form: ControlForm | str
+    name: str
+    semester: int
+    mark: int | str | tuple[int | str, ...]
+    study_hours: int
+    credits_number: float
+    category: DisciplineCategory
+
+    @property
+    def contol_form(self) -> str:
+        """
+        Returns the abbreviation of the form of control, as stored by DisciplineConfig.
+
+        :return: The abbreviation, as written in the column header for an unknown form of control.
+        :rtype: str
+        """
+        if isinstance(self.control_form, str):
+            return self.control_form
+        return self.control_form.abbreviation
+
+    @property
+    def categoty(self) -> str:
+        """
+        Returns the string representation of the category, as stored by DisciplineConfig.
+
+        :return: The category, e.g. "regular".
+        :rtype: str
+        """
+        return self.category.label
@@ -0,0 +1,60 @@
+"""
+Module defining the ControlForm enumeration for compact discipline configurations.
+
+Classes:
+- ControlForm: An integer enumeration of the forms of control of disciplines.
+"""
+
+from enum import IntEnum
+
+
+class ControlForm(IntEnum):
+    """
+    An enumeration of the forms of control of disciplines.
+
+    Forms of control that are not known in advance have no member; compact configurations keep
+    their abbreviation as a string instead, and such disciplines are regular ones.
+    """
+
+    EXAM = 1
+    CREDIT = 2
+    PRACTICE = 3
+    COURSE_WORK = 4
+    COURSE_PROJECT = 5
+    SUMMARIZED = 6
+
+    @classmethod
+    def from_abbreviation(cls, abbreviation: str) -> 'ControlForm | None':
+        """
+        Returns the form of control by its abbreviation in a discipline column header.
+
+        :param abbreviation: The abbreviation, e.g. "ЭК".
+        :type abbreviation: str
+        :return: The form of control, or None if the abbreviation is unknown.
+        :rtype: ControlForm | None
+        """
+        return _CONTROL_FORMS_BY_ABBREVIATION.get(abbreviation)
+
+    @property
+    def abbreviation(self) -> str:
+        """
+        Returns the abbreviation of the form of control.
+
+        :return: The abbreviation, e.g. "ЭК".
+        :rtype: str
+        """
+        return _ABBREVIATIONS_BY_CONTROL_FORM[self]
+
+
+_CONTROL_FORMS_BY_ABBREVIATION = {
+    'ЭК': ControlForm.EXAM,
+    'ЗЧ': ControlForm.CREDIT,
+    'ПР': ControlForm.PRACTICE,
+    'КР': ControlForm.COURSE_WORK,
+    'КП': ControlForm.COURSE_PROJECT,
+    'СФ': ControlForm.SUMMARIZED,
+}
+_ABBREVIATIONS_BY_CONTROL_FORM = {
+    control_form: abbreviation
+    for abbreviation, control_form in _CONTROL_FORMS_BY_ABBREVIATION.items()
+}
@@ -0,0 +1,32 @@
+"""
+Module defining the DisciplineCategory enumeration for compact discipline configurations.
+
+Classes:
+- DisciplineCategory: An integer enumeration of discipline categories in statement table order.
+"""
+
+from enum import IntEnum
+
+
+class DisciplineCategory(IntEnum):
+    """
+    An enumeration of discipline categories, ordered as the statement's tables.
+
+    The lowercased member name of each category is its string representation used by
+    DisciplineConfig (e.g. "course_work").
+    """
+
+    REGULAR = 0
+    COURSE_WORK = 1
+    COURSE_PROJECT = 2
+    PRACTICE = 3
+
+    @property
+    def label(self) -> str:
+        """
+        Returns the string representation of the category.
+
+        :return: The lowercased member name.
+        :rtype: str
+        """
+        return self.name.lower()
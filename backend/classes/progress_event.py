@@ -0,0 +1,27 @@
+"""
+Module defining the ProgressEvent class for reporting the progress of a run.
+
+Classes:
+- ProgressEvent: A dataclass describing the current stage of a run and the items done in it.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """
+    A class representing the progress of a run at a point in time.
+
+    An event with no items done is sent when a stage starts; stages processing students then send
+    an event after every student.
+
+    Attributes:
+        stage: The name of the current stage.
+        done: The number of items processed in the stage so far.
+        total: The number of items the stage will process, or None if it is unknown.
+    """
+
+    stage: str
+    done: int = 0
+    total: int | None = None
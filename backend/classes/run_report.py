@@ -0,0 +1,35 @@
+"""
+Module defining the RunReport class for storing the instrumentation results of a whole run.
+
+Classes:
+- RunReport: A dataclass for storing the stages, the outcome and the totals of a run.
+"""
+
+from dataclasses import dataclass, field
+
+from backend.classes.stage_report import StageReport
+
+
+@dataclass
+class RunReport:
+    """
+    A class representing the instrumentation results of a run.
+
+    Attributes:
+        stages: The reports of the stages in execution order.
+        return_code: The return code of the run, or None while it is in progress.
+        error: The description of the error which stopped the run, or None.
+        wall_time: The elapsed wall-clock time of the run in seconds.
+        cpu_time: The CPU time of the run in seconds, including finished child processes.
+        profile_path: The path to the cProfile dump of the run, or None if it was not profiled.
+        dropped_students: Students missing from some semester files and therefore left out
+            of the run by the inner join of the files.
+    """
+
+    stages: list[StageReport] = field(default_factory=list)
+    return_code: int | None = None
+    error: str | None = None
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    profile_path: str | None = None
+    dropped_students: list[str] = field(default_factory=list)
@@ -0,0 +1,28 @@
+"""
+Module defining the StageReport class for storing measurements of a single pipeline stage.
+
+Classes:
+- StageReport: A dataclass for storing the timings, memory peak and counters of a stage.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class StageReport:
+    """
+    A class representing the measurements of a single stage of a run.
+
+    Attributes:
+        name: The name of the stage.
+        wall_time: The elapsed wall-clock time of the stage in seconds.
+        cpu_time: The CPU time of the stage in seconds, including finished child processes.
+        memory_peak: The peak of memory traced by tracemalloc in bytes, or None if not traced.
+        counters: Item counts of the stage, such as the number of students processed.
+    """
+
+    name: str
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    memory_peak: int | None = None
+    counters: dict[str, int] = field(default_factory=dict)
@@ -0,0 +1,28 @@
+"""
+Module defining the StatementsRequest class for storing a request to the statements service.
+
+Classes:
+- StatementsRequest: A dataclass for storing uploaded workbooks, an optional template and common details.
+"""
+
+from dataclasses import dataclass
+
+from backend.classes.common_config import CommonConfig
+
+
+@dataclass
+class StatementsRequest:
+    """
+    A class representing a parsed request to build a cohort's statements.
+
+    Attributes:
+        semester_files: Contents of the semester workbooks in chronological order.
+        themes_file: Content of the diploma themes workbook.
+        template_file: Content of the statement template, or None to use the service's default one.
+        common_config: Common configuration built from the request's dates and speciality details.
+    """
+
+    semester_files: list[bytes]
+    themes_file: bytes
+    template_file: bytes | None
+    common_config: CommonConfig
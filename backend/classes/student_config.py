@@ -11,7 +11,7 @@ Classes:
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class StudentConfig:
     """
     A class representing the configuration of a student.
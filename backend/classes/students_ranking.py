@@ -0,0 +1,35 @@
+"""
+Module defining the StudentsRanking class for storing the ranking of a cohort by its marks.
+
+Classes:
+- StudentsRanking: A dataclass for storing students' averages and ranks in ranking order.
+"""
+
+from dataclasses import dataclass
+
+import numpy
+
+
+@dataclass
+class StudentsRanking:
+    """
+    A class representing the ranking of a cohort, with one row per student in ranking order.
+
+    Averages are computed over integer marks only; a student without any has an average of 0,
+    and a semester without any of the student's integer marks has an average of NaN.
+
+    Attributes:
+        full_names: Students' full names.
+        ranks: Students' ranks; students with equal ranked averages share the best of their ranks.
+        avg_marks: Plain averages of students' marks.
+        weighted_avg_marks: Averages of students' marks weighted by disciplines' credits numbers.
+        semesters: The semester numbers of the columns of semesters_avg_marks, in ascending order.
+        semesters_avg_marks: Plain averages of students' marks per semester, one column per semester.
+    """
+
+    full_names: list[str]
+    ranks: numpy.ndarray
+    avg_marks: numpy.ndarray
+    weighted_avg_marks: numpy.ndarray
+    semesters: tuple[int, ...]
+    semesters_avg_marks: numpy.ndarray
@@ -0,0 +1,39 @@
+"""
+Module defining the TemplateAnchors class for storing the compiled anchors of a statement template.
+
+Classes:
+- TemplateAnchors: A dataclass mapping every filled field of a template to a body element.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class TemplateAnchors:
+    """
+    A class representing the positions of the filled paragraphs and tables of a statement template.
+
+    Every attribute is the index of a top-level element of the template body, so a copy of the body
+    is filled without searching it again.
+
+    Attributes:
+        full_name: The paragraph with the student's full name.
+        study_period: The paragraph with the study period dates.
+        speciality: The paragraph with the speciality code and name.
+        speciality_area: The paragraph with the speciality area code and name.
+        diploma_theme: The paragraph with the diploma theme.
+        statement_date: The paragraph with the statement date.
+        regular_disciplines: The table of regular disciplines.
+        course_disciplines: The table of course works and course projects.
+        practice_disciplines: The table of practices.
+    """
+
+    full_name: int
+    study_period: int
+    speciality: int
+    speciality_area: int
+    diploma_theme: int
+    statement_date: int
+    regular_disciplines: int
+    course_disciplines: int
+    practice_disciplines: int
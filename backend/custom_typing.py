@@ -11,11 +11,16 @@ Types:
     Maps student names to categorized lists of discipline configurations.
 - STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_GROUPED_BY_CATEGORY_SUMMARIZED_TYPE:
     Represents summarized discipline configurations grouped by categories.
+- STUDENTS_WITH_AVG_MARK_TYPE: Pairs of student names and average marks.
+- BINARY_SOURCE_TYPE: An input file given by its path, its content or a binary stream.
 
 Dependencies:
 - DisciplineConfig: A class representing the structure of a discipline configuration.
 """
 
+import os
+from typing import BinaryIO
+
 from backend.classes.discipline_config import DisciplineConfig
 
 STUDENTS_STATS_RAW_TYPE = list[dict[str, dict[str, str | int]]]
@@ -73,3 +78,12 @@ STUDENTS_WITH_AVG_MARK_TYPE: A tuple containing multiple tuples of student names
     - First element: Student's full name (str).
     - Second element: Average mark (float).
 """
+
+BINARY_SOURCE_TYPE = str | os.PathLike[str] | bytes | bytearray | memoryview | BinaryIO
+"""
+BINARY_SOURCE_TYPE: An input file given by its path, by its content or as an open binary stream.
+
+- str, os.PathLike[str]: The path to the file.
+- bytes, bytearray, memoryview: The content of the file.
+- BinaryIO: A binary stream read from its current position to the end.
+"""
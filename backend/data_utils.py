@@ -9,25 +9,48 @@ This module provides functions to:
 5. Calculate and sort students by their average marks.
 
 Functions:
+- get_discipline_category: Determines a discipline category by its form of control.
+- get_cohort_plan: Parses discipline column headers once per cohort.
+- get_discipline_configs: Builds a single student's discipline configurations from a cohort plan.
+- get_compact_discipline_configs: Builds a single student's compact discipline configurations.
 - get_students_stats_with_discipline_configs: Transforms raw statistics into discipline configurations.
+- get_discipline_configs_grouped_by_category: Groups a single student's disciplines by category.
 - get_students_stats_with_discipline_configs_grouped_by_category: Groups disciplines by category.
+- get_discipline_configs_grouped_by_category_summarized: Summarizes a single student's disciplines.
 - get_students_stats_with_discipline_configs_grouped_by_category_summarized: Summarizes disciplines by name.
+- get_hours_and_credits_number_repr: Formats study hours and credits for output.
 - get_disciplines_for_student_config: Formats disciplines for output.
+- get_student_config: Builds a single student's configuration.
+- get_diploma_themes_dict: Maps students' full names to their diploma themes.
+- get_students_without_diploma_theme: Finds students without a diploma theme.
 - get_students_configs: Generates a list of structured student configurations.
+- get_avg_mark: Computes a single student's average mark.
+- get_students_sorted_by_avg_mark: Sorts students by average mark.
 - get_students_with_avg_mark: Computes and sorts students by average mark.
+- iter_students_configs_with_avg_mark: Lazily yields every student's configuration and average mark.
+- get_students_configs_with_avg_marks: Fused single-pass transform from raw statistics to
+  student configurations and average marks.
 
 Dependencies:
 - pandas: For data manipulation.
 - backend.custom_typing: Custom typing definitions.
+- backend.classes.cohort_plan: Cohort plan class.
 - backend.classes.discipline_config: Discipline configuration class.
+- backend.classes.compact_discipline_config: Compact discipline configuration class.
 - backend.classes.student_config: Student configuration class.
 """
 
+import numbers
+import sys
 from collections import defaultdict
-from copy import deepcopy
+from collections.abc import Iterable, Iterator, Sequence
 
 from pandas import DataFrame
 
+from backend.classes.cohort_plan import CohortPlan
+from backend.classes.compact_discipline_config import CompactDisciplineConfig
+from backend.classes.control_form import ControlForm
+from backend.classes.discipline_category import DisciplineCategory
 from backend.classes.discipline_config import DisciplineConfig
 from backend.classes.student_config import StudentConfig
 from backend.custom_typing import (
@@ -53,9 +76,21 @@ COURSE_PROJECT_CATEGORY = 'course_project'
 COURSE_WORK_CATEGORY = 'course_work'
 REGULAR_CATEGORY = 'regular'
 
+DISCIPLINE_CATEGORIES = (
+    REGULAR_CATEGORY,
+    COURSE_WORK_CATEGORY,
+    COURSE_PROJECT_CATEGORY,
+    PRACTICE_CATEGORY,
+)
+
 DIPLOMA_THEMES_DATAFRAME_FULL_NAME_COLUMN = 'ФИО'
 DIPLOMA_THEMES_DATAFRAME_THEME_COLUMN = 'Тема дипломного проекта'
 
+DEBUG_CONFIGS_KEY = 'configs'
+DEBUG_GROUPED_KEY = 'grouped'
+DEBUG_SUMMARIZED_KEY = 'summarized'
+DEBUG_INTERMEDIATES_KEYS = (DEBUG_CONFIGS_KEY, DEBUG_GROUPED_KEY, DEBUG_SUMMARIZED_KEY)
+
 MARKS_MAPPING = {
     4: 'четыре',
     5: 'пять',
@@ -68,174 +103,413 @@ MARKS_MAPPING = {
 }
 
 
+def get_discipline_category(discipline_control_form: str) -> str:
+    """
+    Determines the category of a discipline by its form of control.
+
+    :param discipline_control_form: The abbreviation of the discipline's form of control.
+    :type discipline_control_form: str
+    :return: The category of the discipline.
+    :rtype: str
+    """
+    if discipline_control_form == PRACTICE_ABBREVIATION:
+        return PRACTICE_CATEGORY
+    if discipline_control_form == COURSE_PROJECT_ABBREVIATION:
+        return COURSE_PROJECT_CATEGORY
+    if discipline_control_form == COURSE_WORK_ABBREVIATION:
+        return COURSE_WORK_CATEGORY
+    return REGULAR_CATEGORY
+
+
+def get_cohort_plan(discipline_infos: Iterable[str]) -> CohortPlan:
+    """
+    Parses encoded discipline column headers once into a plan shared by all students of a cohort.
+
+    :param discipline_infos: The encoded discipline column headers in column order.
+    :type discipline_infos: Iterable[str]
+    :return: The compiled cohort plan.
+    :rtype: CohortPlan
+    """
+    discipline_infos = tuple(discipline_infos)
+    control_forms = []
+    control_form_codes = []
+    names = []
+    semesters = []
+    study_hours = []
+    credits_numbers = []
+    categories = []
+    for discipline_info in discipline_infos:
+        discipline_info_colon_parts = discipline_info.split(':')
+        discipline_control_form = discipline_info_colon_parts[2]
+
+        control_forms.append(discipline_control_form)
+        control_form_code = ControlForm.from_abbreviation(discipline_control_form)
+        control_form_codes.append(
+            discipline_control_form if control_form_code is None else control_form_code
+        )
+        names.append(sys.intern(discipline_info.split('.', 1)[1].split('/')[0]))
+        semesters.append(int(discipline_info.split('.')[0]))
+        study_hours.append(int(discipline_info.split('/')[1].split(':')[0]))
+        credits_numbers.append(float(discipline_info_colon_parts[1]))
+        categories.append(get_discipline_category(discipline_control_form))
+
+    category_orders = {}
+    for category in DISCIPLINE_CATEGORIES:
+        category_orders[category] = tuple(
+            sorted(
+                (i for i, column_category in enumerate(categories) if column_category == category),
+                key=lambda i: semesters[i],
+            )
+        )
+
+    column_indices_grouped_by_name = defaultdict(list)
+    positions_grouped_by_name = defaultdict(list)
+    for position, i in enumerate(category_orders[REGULAR_CATEGORY]):
+        column_indices_grouped_by_name[names[i]].append(i)
+        positions_grouped_by_name[names[i]].append(position)
+
+    return CohortPlan(
+        discipline_infos=discipline_infos,
+        control_forms=tuple(control_forms),
+        names=tuple(names),
+        semesters=tuple(semesters),
+        study_hours=tuple(study_hours),
+        credits_numbers=tuple(credits_numbers),
+        categories=tuple(categories),
+        control_form_codes=tuple(control_form_codes),
+        category_codes=tuple(DisciplineCategory[category.upper()] for category in categories),
+        category_orders=tuple(category_orders.items()),
+        summarization_groups=tuple(
+            tuple(column_indices) for column_indices in column_indices_grouped_by_name.values()
+        ),
+        regular_summarization_groups=tuple(
+            tuple(positions) for positions in positions_grouped_by_name.values()
+        ),
+    )
+
+
+def get_discipline_configs(
+    cohort_plan: CohortPlan,
+    discipline_marks: Sequence[int | str],
+) -> list[DisciplineConfig]:
+    """
+    Builds discipline configurations of a single student by gathering values from a cohort plan.
+
+    :param cohort_plan: The compiled plan of the cohort's discipline columns.
+    :type cohort_plan: CohortPlan
+    :param discipline_marks: The student's marks in the plan's column order.
+    :type discipline_marks: Sequence[int | str]
+    :return: A list of the student's discipline configurations.
+    :rtype: list[DisciplineConfig]
+    """
+    return [
+        DisciplineConfig(
+            control_form,
+            name,
+            semester,
+            mark,
+            study_hours,
+            credits_number,
+            category,
+        )
+        for control_form, name, semester, mark, study_hours, credits_number, category in zip(
+            cohort_plan.control_forms,
+            cohort_plan.names,
+            cohort_plan.semesters,
+            discipline_marks,
+            cohort_plan.study_hours,
+            cohort_plan.credits_numbers,
+            cohort_plan.categories,
+            strict=True,
+        )
+    ]
+
+
+def get_compact_discipline_configs(
+    cohort_plan: CohortPlan,
+    discipline_marks: Sequence[int | str],
+) -> list[CompactDisciplineConfig]:
+    """
+    Builds compact discipline configurations of a single student by gathering values from a plan.
+
+    The configurations share the plan's interned discipline names and enumeration members.
+
+    :param cohort_plan: The compiled plan of the cohort's discipline columns.
+    :type cohort_plan: CohortPlan
+    :param discipline_marks: The student's marks in the plan's column order.
+    :type discipline_marks: Sequence[int | str]
+    :return: A list of the student's compact discipline configurations.
+    :rtype: list[CompactDisciplineConfig]
+    """
+    return [
+        CompactDisciplineConfig(
+            control_form,
+            name,
+            semester,
+            mark,
+            study_hours,
+            credits_number,
+            category,
+        )
+        for control_form, name, semester, mark, study_hours, credits_number, category in zip(
+            cohort_plan.control_form_codes,
+            cohort_plan.names,
+            cohort_plan.semesters,
+            discipline_marks,
+            cohort_plan.study_hours,
+            cohort_plan.credits_numbers,
+            cohort_plan.category_codes,
+            strict=True,
+        )
+    ]
+
+
 def get_students_stats_with_discipline_configs(
     students_stats: STUDENTS_STATS_RAW_TYPE,
+    compact: bool = False,
 ) -> STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_TYPE:
     """
     Transforms raw student statistics into structured discipline configurations.
 
+    The discipline column headers are parsed once per cohort and reused for every student
+    sharing the same headers.
+
     :param students_stats: A list of dictionaries containing raw student statistics.
     :type students_stats: STUDENTS_STATS_RAW_TYPE
+    :param compact: Whether to build CompactDisciplineConfig objects instead of DisciplineConfig
+        ones (default is False).
+    :type compact: bool
     :return: A dictionary mapping student names to their discipline configurations.
     :rtype: STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_TYPE
     """
     students_stats_with_discipline_configs = {}
+    discipline_configs_getter = (
+        get_compact_discipline_configs if compact else get_discipline_configs
+    )
+    cohort_plan = None
     for student_stats in students_stats:
         for student_full_name, disciplines_dict in student_stats.items():
-            discipline_configs = []
-            for discipline_info, discipline_mark in disciplines_dict.items():
-                discipline_control_form = discipline_info.split(':')[2]
-                discipline_name = discipline_info.split('.', 1)[1].split('/')[0]
-                discipline_semester = int(discipline_info.split('.')[0])
-                discipline_study_hours = int(discipline_info.split('/')[1].split(':')[0])
-                discipline_credits_number = float(discipline_info.split(':')[1])
-
-                if discipline_control_form == PRACTICE_ABBREVIATION:
-                    discipline_category = PRACTICE_CATEGORY
-                elif discipline_control_form == COURSE_PROJECT_ABBREVIATION:
-                    discipline_category = COURSE_PROJECT_CATEGORY
-                elif discipline_control_form == COURSE_WORK_ABBREVIATION:
-                    discipline_category = COURSE_WORK_CATEGORY
-                else:
-                    discipline_category = REGULAR_CATEGORY
-
-                discipline_config = DisciplineConfig(
-                    discipline_control_form,
-                    discipline_name,
-                    discipline_semester,
-                    discipline_mark,
-                    discipline_study_hours,
-                    discipline_credits_number,
-                    discipline_category,
-                )
-                discipline_configs.append(discipline_config)
-            students_stats_with_discipline_configs[student_full_name] = discipline_configs
+            discipline_infos = tuple(disciplines_dict)
+            if cohort_plan is None or cohort_plan.discipline_infos != discipline_infos:
+                cohort_plan = get_cohort_plan(discipline_infos)
+
+            students_stats_with_discipline_configs[student_full_name] = discipline_configs_getter(
+                cohort_plan, tuple(disciplines_dict.values())
+            )
 
     return students_stats_with_discipline_configs
 
 
+def get_discipline_configs_grouped_by_category(
+    discipline_configs: Iterable[DisciplineConfig],
+    cohort_plan: CohortPlan | None = None,
+) -> dict[str, list[DisciplineConfig]]:
+    """
+    Groups a single student's discipline configurations into predefined categories.
+
+    With the cohort plan the configurations were built from, the groups are gathered by the plan's
+    precomputed column indices instead of dispatching and sorting every configuration.
+
+    :param discipline_configs: The student's discipline configurations, in the plan's column order
+        if a plan is given.
+    :type discipline_configs: Iterable[DisciplineConfig]
+    :param cohort_plan: The plan the configurations were built from (default is None).
+    :type cohort_plan: CohortPlan | None
+    :return: A dictionary mapping categories to discipline configurations sorted by semester.
+    :rtype: dict[str, list[DisciplineConfig]]
+    """
+    if cohort_plan is not None:
+        discipline_configs = tuple(discipline_configs)
+        return {
+            category: [discipline_configs[i] for i in column_indices]
+            for category, column_indices in cohort_plan.category_orders
+        }
+
+    discipline_configs_grouped_by_category = {
+        REGULAR_CATEGORY: [],
+        COURSE_WORK_CATEGORY: [],
+        COURSE_PROJECT_CATEGORY: [],
+        PRACTICE_CATEGORY: [],
+    }
+
+    for discipline_config in discipline_configs:
+        if discipline_config.categoty == PRACTICE_CATEGORY:
+            discipline_configs_grouped_by_category[PRACTICE_CATEGORY].append(discipline_config)
+        elif discipline_config.categoty == COURSE_WORK_CATEGORY:
+            discipline_configs_grouped_by_category[COURSE_WORK_CATEGORY].append(discipline_config)
+        elif discipline_config.categoty == COURSE_PROJECT_CATEGORY:
+            discipline_configs_grouped_by_category[COURSE_PROJECT_CATEGORY].append(
+                discipline_config
+            )
+        else:
+            discipline_configs_grouped_by_category[REGULAR_CATEGORY].append(discipline_config)
+
+    for category in DISCIPLINE_CATEGORIES:
+        discipline_configs_grouped_by_category[category].sort(
+            key=lambda discipline_config: discipline_config.semester
+        )
+
+    return discipline_configs_grouped_by_category
+
+
 def get_students_stats_with_discipline_configs_grouped_by_category(
     students_stats_with_discipline_configs: STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_TYPE,
+    cohort_plan: CohortPlan | None = None,
 ) -> STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_GROUPED_BY_CATEGORY_TYPE:
     """
     Groups student discipline configurations into predefined categories.
 
     :param students_stats_with_discipline_configs: A dictionary of student discipline configurations.
     :type students_stats_with_discipline_configs: STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_TYPE
+    :param cohort_plan: The plan every student's configurations were built from (default is None).
+    :type cohort_plan: CohortPlan | None
     :return: A dictionary mapping student names to their grouped discipline configurations.
     :rtype: STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_GROUPED_BY_CATEGORY_TYPE
     """
-    students_stats_with_discipline_configs_grouped_by_category = {}
-    categories = (
+    return {
+        student_full_name: get_discipline_configs_grouped_by_category(
+            stats_discipline_configs, cohort_plan
+        )
+        for (
+            student_full_name,
+            stats_discipline_configs,
+        ) in students_stats_with_discipline_configs.items()
+    }
+
+
+def _get_summarized_discipline_config(
+    discipline_configs_group_by_name: Sequence[DisciplineConfig | CompactDisciplineConfig],
+) -> DisciplineConfig | CompactDisciplineConfig:
+    summarized_semesters = []
+    summarized_mark = []
+    summarized_study_hours = 0
+    summarized_credits_number = 0.0
+
+    for discipline_config in discipline_configs_group_by_name:
+        summarized_semesters.append(discipline_config.semester)
+        summarized_mark.append(discipline_config.mark)
+        summarized_study_hours += discipline_config.study_hours
+        summarized_credits_number += discipline_config.credits_number
+
+    if isinstance(discipline_configs_group_by_name[0], CompactDisciplineConfig):
+        return CompactDisciplineConfig(
+            ControlForm.SUMMARIZED,
+            discipline_configs_group_by_name[0].name,
+            min(summarized_semesters),
+            tuple(summarized_mark),
+            summarized_study_hours,
+            summarized_credits_number,
+            DisciplineCategory.REGULAR,
+        )
+
+    return DisciplineConfig(
+        SUMMARIZED_CONTROL_FORM_ABBREVIATION,
+        discipline_configs_group_by_name[0].name,
+        min(summarized_semesters),
+        summarized_mark,
+        summarized_study_hours,
+        summarized_credits_number,
         REGULAR_CATEGORY,
-        COURSE_WORK_CATEGORY,
-        COURSE_PROJECT_CATEGORY,
-        PRACTICE_CATEGORY,
     )
-    for (
-        student_full_name,
-        stats_discipline_configs,
-    ) in students_stats_with_discipline_configs.items():
-        discipline_configs_grouped_by_category = {
-            REGULAR_CATEGORY: [],
-            COURSE_WORK_CATEGORY: [],
-            COURSE_PROJECT_CATEGORY: [],
-            PRACTICE_CATEGORY: [],
-        }
 
-        for stats_discipline_config in stats_discipline_configs:
-            if stats_discipline_config.categoty == PRACTICE_CATEGORY:
-                discipline_configs_grouped_by_category[PRACTICE_CATEGORY].append(
-                    stats_discipline_config
-                )
-            elif stats_discipline_config.categoty == COURSE_WORK_CATEGORY:
-                discipline_configs_grouped_by_category[COURSE_WORK_CATEGORY].append(
-                    stats_discipline_config
-                )
-            elif stats_discipline_config.categoty == COURSE_PROJECT_CATEGORY:
-                discipline_configs_grouped_by_category[COURSE_PROJECT_CATEGORY].append(
-                    stats_discipline_config
-                )
-            else:
-                discipline_configs_grouped_by_category[REGULAR_CATEGORY].append(
-                    stats_discipline_config
-                )
 
-        for category in categories:
-            discipline_configs_grouped_by_category[category].sort(
-                key=lambda discipline_config: discipline_config.semester
+def get_discipline_configs_grouped_by_category_summarized(
+    discipline_configs_grouped_by_category: dict[str, list[DisciplineConfig]],
+    cohort_plan: CohortPlan | None = None,
+) -> dict[str, list[DisciplineConfig]]:
+    """
+    Summarizes a single student's regular disciplines grouped by name.
+
+    With the cohort plan the configurations were built and grouped from, the disciplines of every
+    name are gathered by the plan's precomputed positions instead of being grouped and sorted.
+
+    The input is not modified: a new dictionary of categories is returned which shares
+    the unchanged course work, course project and practice lists with the input.
+
+    :param discipline_configs_grouped_by_category: The student's grouped discipline configurations.
+    :type discipline_configs_grouped_by_category: dict[str, list[DisciplineConfig]]
+    :param cohort_plan: The plan the configurations were built from (default is None).
+    :type cohort_plan: CohortPlan | None
+    :return: A dictionary of categories with summarized regular disciplines.
+    :rtype: dict[str, list[DisciplineConfig]]
+    """
+    regular_discipline_configs = discipline_configs_grouped_by_category[REGULAR_CATEGORY]
+    if cohort_plan is not None:
+        summarized_regular_discipline_configs = [
+            _get_summarized_discipline_config(
+                [regular_discipline_configs[position] for position in positions]
             )
+            for positions in cohort_plan.regular_summarization_groups
+        ]
+    else:
+        discipline_configs_grouped_by_name = defaultdict(list)
+        for discipline_config in regular_discipline_configs:
+            discipline_configs_grouped_by_name[discipline_config.name].append(discipline_config)
 
-        students_stats_with_discipline_configs_grouped_by_category[student_full_name] = (
-            discipline_configs_grouped_by_category
+        summarized_regular_discipline_configs = [
+            _get_summarized_discipline_config(discipline_configs_group_by_name)
+            for discipline_configs_group_by_name in discipline_configs_grouped_by_name.values()
+        ]
+        summarized_regular_discipline_configs.sort(
+            key=lambda summarized_discipline_config: summarized_discipline_config.semester
         )
 
-    return students_stats_with_discipline_configs_grouped_by_category
+    return {
+        **discipline_configs_grouped_by_category,
+        REGULAR_CATEGORY: summarized_regular_discipline_configs,
+    }
 
 
 def get_students_stats_with_discipline_configs_grouped_by_category_summarized(
     students_stats_with_discipline_configs_grouped_by_category: STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_GROUPED_BY_CATEGORY_TYPE,
+    cohort_plan: CohortPlan | None = None,
 ) -> STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_GROUPED_BY_CATEGORY_SUMMARIZED_TYPE:
     """
     Summarizes regular disciplines grouped by name, combining marks, hours, and credits.
 
+    The input is not modified: every student gets a new dictionary of categories which shares
+    the unchanged course work, course project and practice lists with the input.
+
     :param students_stats_with_discipline_configs_grouped_by_category: Grouped discipline configurations.
     :type students_stats_with_discipline_configs_grouped_by_category: STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_GROUPED_BY_CATEGORY_TYPE
+    :param cohort_plan: The plan every student's configurations were built from (default is None).
+    :type cohort_plan: CohortPlan | None
     :return: A dictionary with summarized discipline configurations.
     :rtype: STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_GROUPED_BY_CATEGORY_SUMMARIZED_TYPE
     """
-    students_stats_with_discipline_configs_grouped_by_category_summarized = deepcopy(
-        students_stats_with_discipline_configs_grouped_by_category
-    )
-
-    for (
-        student_full_name,
-        stats_discipline_configs,
-    ) in students_stats_with_discipline_configs_grouped_by_category_summarized.items():
-        regular_disciplines_configs = stats_discipline_configs[REGULAR_CATEGORY]
+    return {
+        student_full_name: get_discipline_configs_grouped_by_category_summarized(
+            stats_discipline_configs, cohort_plan
+        )
+        for (
+            student_full_name,
+            stats_discipline_configs,
+        ) in students_stats_with_discipline_configs_grouped_by_category.items()
+    }
 
-        discipline_configs_grouped_by_name = defaultdict(list)
-        for discipline_config in regular_disciplines_configs:
-            discipline_configs_grouped_by_name[discipline_config.name].append(discipline_config)
 
-        discipline_configs_groups_by_name = list(discipline_configs_grouped_by_name.values())
-
-        summarized_regular_stats_discipline_configs = []
-
-        for discipline_configs_group_by_name in discipline_configs_groups_by_name:
-            summarized_control_form = SUMMARIZED_CONTROL_FORM_ABBREVIATION
-            summarized_name = discipline_configs_group_by_name[0].name
-            summarized_semesters = []
-            summarized_mark = []
-            summarized_study_hours = 0
-            summarized_credits_number = 0.0
-            summarized_category = REGULAR_CATEGORY
-
-            for discipline_config in discipline_configs_group_by_name:
-                summarized_semesters.append(discipline_config.semester)
-                summarized_mark.append(discipline_config.mark)
-                summarized_study_hours += discipline_config.study_hours
-                summarized_credits_number += discipline_config.credits_number
-
-            summarized_regular_stats_discipline_configs.append(
-                DisciplineConfig(
-                    summarized_control_form,
-                    summarized_name,
-                    min(summarized_semesters),
-                    summarized_mark,
-                    summarized_study_hours,
-                    summarized_credits_number,
-                    summarized_category,
-                )
-            )
+def get_hours_and_credits_number_repr(study_hours: int, credits_number: float) -> str:
+    """
+    Formats study hours and credits of a discipline for output, e.g. "120 (3,5 з.е.)".
+
+    :param study_hours: The number of study hours of the discipline.
+    :type study_hours: int
+    :param credits_number: The number of credits of the discipline.
+    :type credits_number: float
+    :return: The formatted hours, followed by the credits number unless it is zero.
+    :rtype: str
+    """
+    discipline_hours = str(study_hours)
 
-        summarized_regular_stats_discipline_configs.sort(
-            key=lambda summarized_discipline_config: summarized_discipline_config.semester
-        )
+    if credits_number.is_integer():
+        discipline_credits_number = str(int(credits_number)) if int(credits_number) != 0 else ''
+    else:
+        discipline_credits_number = str(credits_number).replace('.', ',')
 
-        stats_discipline_configs[REGULAR_CATEGORY] = summarized_regular_stats_discipline_configs
+    if discipline_credits_number == '':
+        return discipline_hours
 
-    return students_stats_with_discipline_configs_grouped_by_category_summarized
+    return discipline_hours + CREDITS_NUMBER_TEMPLATE.format(discipline_credits_number)
 
 
 def get_disciplines_for_student_config(
@@ -252,25 +526,11 @@ def get_disciplines_for_student_config(
     disciplines = []
     for discipline_config in stats_discipline_configs:
         discipline_name = discipline_config.name
-        discipline_hours = str(discipline_config.study_hours)
-
-        if discipline_config.credits_number.is_integer():
-            discipline_credits_number = (
-                str(int(discipline_config.credits_number))
-                if int(discipline_config.credits_number) != 0
-                else ''
-            )
-        else:
-            discipline_credits_number = str(discipline_config.credits_number).replace('.', ',')
-
-        if discipline_credits_number == '':
-            discipline_hours_and_credits_number = discipline_hours
-        else:
-            discipline_hours_and_credits_number = discipline_hours + CREDITS_NUMBER_TEMPLATE.format(
-                discipline_credits_number
-            )
+        discipline_hours_and_credits_number = get_hours_and_credits_number_repr(
+            discipline_config.study_hours, discipline_config.credits_number
+        )
 
-        if isinstance(discipline_config.mark, list):
+        if isinstance(discipline_config.mark, list | tuple):
             if all(mark == CREDIT_MARK for mark in discipline_config.mark):
                 discipline_mark = MARKS_MAPPING[CREDIT_MARK]
             else:
@@ -283,6 +543,77 @@ def get_disciplines_for_student_config(
     return disciplines
 
 
+def get_student_config(
+    full_name: str,
+    discipline_configs_grouped_by_category_summarized: dict[str, list[DisciplineConfig]],
+    diploma_theme: str,
+) -> StudentConfig:
+    """
+    Builds a single student's configuration from the summarized discipline configurations.
+
+    :param full_name: The full name of the student.
+    :type full_name: str
+    :param discipline_configs_grouped_by_category_summarized: The student's summarized disciplines.
+    :type discipline_configs_grouped_by_category_summarized: dict[str, list[DisciplineConfig]]
+    :param diploma_theme: The theme of the student's diploma project.
+    :type diploma_theme: str
+    :return: The student's configuration.
+    :rtype: StudentConfig
+    """
+    return StudentConfig(
+        full_name,
+        get_disciplines_for_student_config(
+            discipline_configs_grouped_by_category_summarized[REGULAR_CATEGORY]
+        ),
+        get_disciplines_for_student_config(
+            discipline_configs_grouped_by_category_summarized[COURSE_WORK_CATEGORY]
+        ),
+        get_disciplines_for_student_config(
+            discipline_configs_grouped_by_category_summarized[COURSE_PROJECT_CATEGORY]
+        ),
+        get_disciplines_for_student_config(
+            discipline_configs_grouped_by_category_summarized[PRACTICE_CATEGORY]
+        ),
+        diploma_theme,
+    )
+
+
+def get_diploma_themes_dict(diploma_themes_df: DataFrame) -> dict[str, str]:
+    """
+    Maps students' full names to their diploma themes.
+
+    :param diploma_themes_df: A DataFrame containing student names and their corresponding diploma themes.
+    :type diploma_themes_df: DataFrame
+    :return: A dictionary mapping full names to diploma themes.
+    :rtype: dict[str, str]
+    """
+    return diploma_themes_df.set_index(DIPLOMA_THEMES_DATAFRAME_FULL_NAME_COLUMN)[
+        DIPLOMA_THEMES_DATAFRAME_THEME_COLUMN
+    ].to_dict()
+
+
+def get_students_without_diploma_theme(
+    students_full_names: Iterable[str],
+    diploma_themes_df: DataFrame,
+) -> list[str]:
+    """
+    Finds students that have no diploma theme, so that missing themes are detected up front.
+
+    :param students_full_names: The full names of the students.
+    :type students_full_names: Iterable[str]
+    :param diploma_themes_df: A DataFrame containing student names and their corresponding diploma themes.
+    :type diploma_themes_df: DataFrame
+    :return: The full names of students without a diploma theme, in input order.
+    :rtype: list[str]
+    """
+    diploma_themes_full_names = set(diploma_themes_df[DIPLOMA_THEMES_DATAFRAME_FULL_NAME_COLUMN])
+    return [
+        full_name
+        for full_name in dict.fromkeys(students_full_names)
+        if full_name not in diploma_themes_full_names
+    ]
+
+
 def get_students_configs(
     students_stats_with_discipline_configs_grouped_by_category_summarized: STUDENTS_STATS_WITH_DISCIPLINE_CONFIGS_GROUPED_BY_CATEGORY_SUMMARIZED_TYPE,
     diploma_themes_df: DataFrame,
@@ -299,47 +630,45 @@ def get_students_configs(
     :return: A list of StudentConfig objects containing structured student data.
     :rtype: list[StudentConfig]
     """
-    students_configs = []
-
-    diploma_themes_dict = diploma_themes_df.set_index(DIPLOMA_THEMES_DATAFRAME_FULL_NAME_COLUMN)[
-        DIPLOMA_THEMES_DATAFRAME_THEME_COLUMN
-    ].to_dict()
-    for (
-        full_name,
-        stats_disciplines_configs,
-    ) in students_stats_with_discipline_configs_grouped_by_category_summarized.items():
-        student_full_name = full_name
+    diploma_themes_dict = get_diploma_themes_dict(diploma_themes_df)
+    return [
+        get_student_config(full_name, stats_disciplines_configs, diploma_themes_dict[full_name])
+        for (
+            full_name,
+            stats_disciplines_configs,
+        ) in students_stats_with_discipline_configs_grouped_by_category_summarized.items()
+    ]
 
-        student_regular_disciplines = get_disciplines_for_student_config(
-            stats_disciplines_configs[REGULAR_CATEGORY]
-        )
 
-        student_course_work_disciplines = get_disciplines_for_student_config(
-            stats_disciplines_configs[COURSE_WORK_CATEGORY]
-        )
-
-        student_course_project_disciplines = get_disciplines_for_student_config(
-            stats_disciplines_configs[COURSE_PROJECT_CATEGORY]
-        )
+def get_avg_mark(discipline_configs: Iterable[DisciplineConfig]) -> float:
+    """
+    Calculates the average of a single student's integer marks, NumPy integers included.
 
-        student_practice_disciplines = get_disciplines_for_student_config(
-            stats_disciplines_configs[PRACTICE_CATEGORY]
-        )
+    :param discipline_configs: The student's discipline configurations.
+    :type discipline_configs: Iterable[DisciplineConfig]
+    :return: The average mark, or 0 if the student has no integer marks.
+    :rtype: float
+    """
+    student_marks = [
+        discipline_config.mark
+        for discipline_config in discipline_configs
+        if isinstance(discipline_config.mark, numbers.Integral)
+    ]
+    return sum(student_marks) / len(student_marks) if student_marks else 0
 
-        student_diploma_theme = diploma_themes_dict[full_name]
 
-        students_configs.append(
-            StudentConfig(
-                student_full_name,
-                student_regular_disciplines,
-                student_course_work_disciplines,
-                student_course_project_disciplines,
-                student_practice_disciplines,
-                student_diploma_theme,
-            )
-        )
+def get_students_sorted_by_avg_mark(
+    students_with_avg_mark: Iterable[tuple[str, float]],
+) -> STUDENTS_WITH_AVG_MARK_TYPE:
+    """
+    Sorts students by average mark in descending order, keeping the input order of equal marks.
 
-    return students_configs
+    :param students_with_avg_mark: Pairs of student names and average marks.
+    :type students_with_avg_mark: Iterable[tuple[str, float]]
+    :return: A sorted tuple of student names with their average marks, from highest to lowest.
+    :rtype: STUDENTS_WITH_AVG_MARK_TYPE
+    """
+    return tuple(sorted(students_with_avg_mark, key=lambda x: x[1], reverse=True))
 
 
 def get_students_with_avg_mark(
@@ -353,17 +682,126 @@ def get_students_with_avg_mark(
     :return: A sorted tuple of student names with their average marks, from highest to lowest.
     :rtype: STUDENTS_WITH_AVG_MARK_TYPE
     """
+    return get_students_sorted_by_avg_mark(
+        (student_full_name, get_avg_mark(stats_discipline_configs))
+        for (
+            student_full_name,
+            stats_discipline_configs,
+        ) in students_stats_with_discipline_configs.items()
+    )
+
+
+def iter_students_configs_with_avg_mark(
+    students_stats: Iterable[dict[str, dict[str, str | int]]],
+    diploma_themes_df: DataFrame,
+    compact: bool = False,
+    debug_intermediates: dict[str, dict] | None = None,
+) -> Iterator[tuple[StudentConfig, tuple[str, float]]]:
+    """
+    Lazily transforms raw student statistics into student configurations and average marks.
+
+    Every student goes from raw marks to a finished StudentConfig before it is yielded, so only
+    a single student's intermediate structures are alive at a time. A student appearing more than
+    once is yielded every time they appear.
+
+    :param students_stats: Raw student statistics, e.g. a lazily produced iterable of them.
+    :type students_stats: Iterable[dict[str, dict[str, str | int]]]
+    :param diploma_themes_df: A DataFrame containing student names and their corresponding diploma themes.
+    :type diploma_themes_df: DataFrame
+    :param compact: Whether to use CompactDisciplineConfig objects (default is False).
+    :type compact: bool
+    :param debug_intermediates: A dictionary which, if given, is filled with the cohort-wide
+        intermediate structures under the keys of DEBUG_INTERMEDIATES_KEYS (default is None).
+    :type debug_intermediates: dict[str, dict] | None
+    :return: An iterator over every student's configuration and (full name, average mark) pair.
+    :rtype: Iterator[tuple[StudentConfig, tuple[str, float]]]
+    """
+    diploma_themes_dict = get_diploma_themes_dict(diploma_themes_df)
+    discipline_configs_getter = (
+        get_compact_discipline_configs if compact else get_discipline_configs
+    )
+    if debug_intermediates is not None:
+        for key in DEBUG_INTERMEDIATES_KEYS:
+            debug_intermediates[key] = {}
+
+    cohort_plan = None
+    for student_stats in students_stats:
+        for student_full_name, disciplines_dict in student_stats.items():
+            discipline_infos = tuple(disciplines_dict)
+            if cohort_plan is None or cohort_plan.discipline_infos != discipline_infos:
+                cohort_plan = get_cohort_plan(discipline_infos)
+
+            discipline_configs = discipline_configs_getter(
+                cohort_plan, tuple(disciplines_dict.values())
+            )
+            discipline_configs_grouped_by_category = get_discipline_configs_grouped_by_category(
+                discipline_configs, cohort_plan
+            )
+            discipline_configs_grouped_by_category_summarized = (
+                get_discipline_configs_grouped_by_category_summarized(
+                    discipline_configs_grouped_by_category, cohort_plan
+                )
+            )
+
+            if debug_intermediates is not None:
+                for key, value in zip(
+                    DEBUG_INTERMEDIATES_KEYS,
+                    (
+                        discipline_configs,
+                        discipline_configs_grouped_by_category,
+                        discipline_configs_grouped_by_category_summarized,
+                    ),
+                    strict=True,
+                ):
+                    debug_intermediates[key][student_full_name] = value
+
+            yield (
+                get_student_config(
+                    student_full_name,
+                    discipline_configs_grouped_by_category_summarized,
+                    diploma_themes_dict[student_full_name],
+                ),
+                (student_full_name, get_avg_mark(discipline_configs)),
+            )
+
+
+def get_students_configs_with_avg_marks(
+    students_stats: Iterable[dict[str, dict[str, str | int]]],
+    diploma_themes_df: DataFrame,
+    compact: bool = False,
+    debug_intermediates: dict[str, dict] | None = None,
+) -> tuple[list[StudentConfig], STUDENTS_WITH_AVG_MARK_TYPE]:
+    """
+    Transforms raw student statistics into student configurations and average marks in one pass.
+
+    The result is the same as running get_students_stats_with_discipline_configs,
+    get_students_with_avg_mark, the grouping and summarizing functions and get_students_configs one
+    after another; a student appearing more than once keeps their first position and their last data.
+
+    :param students_stats: Raw student statistics, e.g. a lazily produced iterable of them.
+    :type students_stats: Iterable[dict[str, dict[str, str | int]]]
+    :param diploma_themes_df: A DataFrame containing student names and their corresponding diploma themes.
+    :type diploma_themes_df: DataFrame
+    :param compact: Whether to use CompactDisciplineConfig objects (default is False).
+    :type compact: bool
+    :param debug_intermediates: A dictionary which, if given, is filled with the cohort-wide
+        intermediate structures under the keys of DEBUG_INTERMEDIATES_KEYS (default is None).
+    :type debug_intermediates: dict[str, dict] | None
+    :return: The students' configurations and the students sorted by average mark.
+    :rtype: tuple[list[StudentConfig], STUDENTS_WITH_AVG_MARK_TYPE]
+    """
+    students_configs = []
     students_with_avg_mark = []
-    for (
-        student_full_name,
-        stats_discipline_configs,
-    ) in students_stats_with_discipline_configs.items():
-        student_marks = [
-            stats_discipline_config.mark
-            for stats_discipline_config in stats_discipline_configs
-            if isinstance(stats_discipline_config.mark, int)
-        ]
-        avg_mark = sum(student_marks) / len(student_marks) if student_marks else 0
-        students_with_avg_mark.append((student_full_name, avg_mark))
+    students_positions = {}
+    for student_config, student_with_avg_mark in iter_students_configs_with_avg_mark(
+        students_stats, diploma_themes_df, compact, debug_intermediates
+    ):
+        position = students_positions.setdefault(student_config.full_name, len(students_configs))
+        if position == len(students_configs):
+            students_configs.append(student_config)
+            students_with_avg_mark.append(student_with_avg_mark)
+        else:
+            students_configs[position] = student_config
+            students_with_avg_mark[position] = student_with_avg_mark
 
-    return tuple(sorted(students_with_avg_mark, key=lambda x: x[1], reverse=True))
+    return students_configs, get_students_sorted_by_avg_mark(students_with_avg_mark)
@@ -4,55 +4,212 @@ Module for building Word documents (.docx) using student and common configuratio
 This module processes template Word files, fills in the required fields, and generates formatted
 documents for students based on their disciplines, diploma themes, and other configurations.
 
+Classes:
+- StatementsBuildError: An error listing every statement that could not be built.
+- StatementTemplate: A template parsed once and cloned for every statement.
+- TableRowsBuilder: Appends table rows assembled from cached pre-rendered cells.
+
 Functions:
+- get_statement_template: Returns a parsed template cached for the current thread.
+- get_table_rows_builder: Returns the table rows builder of the current thread.
 - build_docx: Generates a single Word document for a specific student.
-- build_statements: Builds multiple Word documents for a list of students.
+- render_docx: Renders a single student's Word document into a stream or bytes.
+- build_statements: Builds Word documents for a list of students, optionally in parallel or as one file.
+- build_statements_zip: Builds a ZIP archive of students' Word documents into a stream or bytes.
 
 Dependencies:
-- python-docx: For creating and modifying Word documents.
+- python-docx, lxml: For creating and modifying Word documents.
 - os: For handling file paths.
+- concurrent.futures: For rendering statements in a pool of worker processes.
+- backend.manifest_utils: For incremental regeneration of statements.
+- backend.template_utils: For compiling the anchors of templates.
+- backend.progress_utils: For making worker processes ignore Ctrl+C.
+- backend.io_utils: For templates and documents given as bytes or binary streams, and their digests.
+- zipfile: For archiving statements in memory.
 - backend.classes.student_config: Student configuration class.
 - backend.classes.common_config: Common configuration class.
 """
 
+import dataclasses
+import io
 import os
+import threading
+import zipfile
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from copy import deepcopy
+from itertools import count, islice
+from typing import Any, BinaryIO
 
 from docx import Document
+from docx.document import Document as DocumentObject
 from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls, qn
 from docx.shared import Pt
+from docx.table import Table, _Cell
+from docx.text.paragraph import Paragraph
+from lxml import etree
 
+from backend import io_utils, manifest_utils, progress_utils, template_utils
 from backend.classes.common_config import CommonConfig
 from backend.classes.student_config import StudentConfig
+from backend.classes.template_anchors import TemplateAnchors
+from backend.custom_typing import BINARY_SOURCE_TYPE
 
+DEFAULT_CHUNK_SIZE = 16
+DEFAULT_MAX_TASKS_PER_CHILD = 32
+PENDING_CHUNKS_PER_WORKER = 2
+STATEMENT_TEMPLATES_CACHE_SIZE = 4
+BAKED_BODIES_CACHE_SIZE = 4
+TABLE_CELLS_CACHE_SIZE = 4096
 
-def build_docx(
-    template_path: str,
-    save_directory_path: str,
-    student_config: StudentConfig,
+# Failures of a single statement caused by its student's data, such as characters not allowed in XML,
+# or by an unwritable file
+STATEMENT_ERRORS = (OSError, ValueError)
+
+SINGLE_DOCUMENT_FILE_NAME = "Выписки.docx"
+PAGE_BREAK_PARAGRAPH_XML = f'<w:p {nsdecls("w")}><w:r><w:br w:type="page"/></w:r></w:p>'
+BOOKMARK_TAGS = (qn('w:bookmarkStart'), qn('w:bookmarkEnd'))
+
+
+class StatementsBuildError(Exception):
+    """
+    An error raised when one or more statements could not be built.
+
+    Attributes:
+        errors: Failures as (position, student's full name, error description) tuples in input order.
+    """
+
+    def __init__(self, errors: list[tuple[int, str, str]]) -> None:
+        self.errors = errors
+        super().__init__(
+            '\n'.join(f"{full_name}: {description}" for _, full_name, description in errors)
+        )
+
+
+class TableRowsBuilder:
+    """
+    Appends discipline rows to statement tables by cloning pre-rendered cells.
+
+    A row is rendered once per table through python-docx, the same way as table.add_row() followed
+    by a 10 pt run in every cell and centered hours and mark cells, and its cells are kept as lxml
+    elements. Cells are cached by their column's pristine XML and text, so a discipline name, an
+    hours/credits string or a mark shared by many students is rendered only once, and every later
+    row is assembled from deep copies of the cached cells. The resulting XML is identical to the
+    one built run by run.
+    """
+
+    def __init__(self, max_cached_cells: int = TABLE_CELLS_CACHE_SIZE) -> None:
+        """
+        Initializes an empty cells cache.
+
+        :param max_cached_cells: The number of most recently used rendered cells kept (default is
+            TABLE_CELLS_CACHE_SIZE).
+        :type max_cached_cells: int
+        """
+        self.max_cached_cells = max_cached_cells
+        self._cells: OrderedDict[tuple[bytes, str, bool], Any] = OrderedDict()
+
+    def _get_cell(
+        self, table: Table, pristine_tc: Any, pristine_tc_xml: bytes, text: str, centered: bool
+    ) -> Any:
+        key = (pristine_tc_xml, text, centered)
+        tc = self._cells.get(key)
+        if tc is not None:
+            self._cells.move_to_end(key)
+        else:
+            tc = deepcopy(pristine_tc)
+            cell_paragraph = _Cell(tc, table).paragraphs[0]
+            cell_run = cell_paragraph.add_run(text)
+            cell_run.font.size = Pt(10)
+            if centered:
+                cell_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+
+            self._cells[key] = tc
+            if len(self._cells) > self.max_cached_cells:
+                self._cells.popitem(last=False)
+
+        return deepcopy(tc)
+
+    def add_rows(self, table: Table, rows: Iterable[tuple[str, str, str]]) -> None:
+        """
+        Appends a row per discipline to the bottom of a table.
+
+        :param table: The table to append rows to.
+        :type table: Table
+        :param rows: Discipline names, hours/credits strings and marks.
+        :type rows: Iterable[tuple[str, str, str]]
+        :return: None
+        """
+        rows = list(rows)
+        if not rows:
+            return
+
+        tbl = table._tbl
+        pristine_tr = tbl.add_tr()
+        for grid_col in tbl.tblGrid.gridCol_lst:
+            tc = pristine_tr.add_tc()
+            if grid_col.w is not None:
+                tc.width = grid_col.w
+        tbl.remove(pristine_tr)
+
+        pristine_tcs = pristine_tr.tc_lst
+        pristine_tcs_xml = [etree.tostring(tc) for tc in pristine_tcs]
+        for tc in pristine_tcs:
+            pristine_tr.remove(tc)
+
+        for row in rows:
+            tr = deepcopy(pristine_tr)
+            tr.extend(
+                self._get_cell(table, pristine_tc, pristine_tc_xml, text, i > 0)
+                for i, (pristine_tc, pristine_tc_xml, text) in enumerate(
+                    zip(pristine_tcs, pristine_tcs_xml, row, strict=True)
+                )
+            )
+            tbl.append(tr)
+
+
+_table_rows_builders = threading.local()
+
+
+def get_table_rows_builder() -> TableRowsBuilder:
+    """
+    Returns the table rows builder of the current thread, so cached cells are shared by statements.
+
+    :return: The table rows builder.
+    :rtype: TableRowsBuilder
+    """
+    table_rows_builder = getattr(_table_rows_builders, 'builder', None)
+    if table_rows_builder is None:
+        table_rows_builder = _table_rows_builders.builder = TableRowsBuilder()
+
+    return table_rows_builder
+
+
+def _fill_common_config(
+    body_elements: list[Any],
+    parent: Any,
     common_config: CommonConfig,
+    anchors: TemplateAnchors,
 ) -> None:
     """
-    Generates a single Word document (.docx) for a student based on the provided template.
+    Fills the paragraphs shared by every statement of a run.
 
-    :param template_path: The file path to the Word document template.
-    :type template_path: str
-    :param save_directory_path: The directory path where the generated document will be saved.
-    :type save_directory_path: str
-    :param student_config: Configuration containing student's disciplines, full name, and diploma theme.
-    :type student_config: StudentConfig
+    These are the study period, the speciality, the speciality area and the statement date.
+
+    :param body_elements: The top-level elements of the template body to fill in place.
+    :type body_elements: list[Any]
+    :param parent: The document body the paragraphs belong to.
+    :type parent: Any
     :param common_config: Configuration containing common information such as dates and specialty details.
     :type common_config: CommonConfig
+    :param anchors: The compiled anchors of the template.
+    :type anchors: TemplateAnchors
     :return: None
     """
-    document = Document(template_path)
-
-    paragraph_1 = document.paragraphs[5]
-    paragraph_1.clear()
-    run_1_1 = paragraph_1.add_run(student_config.full_name)
-    run_1_1.font.size = Pt(13.5)
-    run_1_1.underline = True
-
-    paragraph_2 = document.paragraphs[10]
+    paragraph_2 = Paragraph(body_elements[anchors.study_period], parent)
     paragraph_2.clear()
     run_2_1 = paragraph_2.add_run(
         f"с {common_config.start_date_day} {common_config.start_date_month} 20"
@@ -71,7 +228,7 @@ def build_docx(
     run_2_5 = paragraph_2.add_run(" г.")
     run_2_5.font.size = Pt(12)
 
-    paragraph_3 = document.paragraphs[11]
+    paragraph_3 = Paragraph(body_elements[anchors.speciality], parent)
     paragraph_3.clear()
     run_3_1 = paragraph_3.add_run("по специальности ")
     run_3_1.font.size = Pt(12)
@@ -81,7 +238,7 @@ def build_docx(
     run_3_2.font.size = Pt(12)
     run_3_2.underline = True
 
-    paragraph_4 = document.paragraphs[12]
+    paragraph_4 = Paragraph(body_elements[anchors.speciality_area], parent)
     paragraph_4.clear()
     run_4_1 = paragraph_4.add_run("направлению специальности ")
     run_4_1.font.size = Pt(12)
@@ -91,7 +248,42 @@ def build_docx(
     run_4_2.font.size = Pt(12)
     run_4_2.underline = True
 
-    paragraph_5 = document.paragraphs[19]
+    paragraph_6 = Paragraph(body_elements[anchors.statement_date], parent)
+    paragraph_6.clear()
+    run_6_1 = paragraph_6.add_run(
+        f"г. Могилев «{common_config.statement_date_day}»"
+        f" {common_config.statement_date_month}"
+        f" {common_config.statement_date_year}\tРегистрационный № ____"
+    )
+    run_6_1.font.size = Pt(11)
+
+
+def _fill_student_config(
+    body_elements: list[Any],
+    parent: Any,
+    student_config: StudentConfig,
+    anchors: TemplateAnchors,
+) -> None:
+    """
+    Fills the student's full name, diploma theme and discipline tables.
+
+    :param body_elements: The top-level elements of the template body to fill in place.
+    :type body_elements: list[Any]
+    :param parent: The document body the paragraphs and tables belong to.
+    :type parent: Any
+    :param student_config: Configuration containing student's disciplines, full name, and diploma theme.
+    :type student_config: StudentConfig
+    :param anchors: The compiled anchors of the template.
+    :type anchors: TemplateAnchors
+    :return: None
+    """
+    paragraph_1 = Paragraph(body_elements[anchors.full_name], parent)
+    paragraph_1.clear()
+    run_1_1 = paragraph_1.add_run(student_config.full_name)
+    run_1_1.font.size = Pt(13.5)
+    run_1_1.underline = True
+
+    paragraph_5 = Paragraph(body_elements[anchors.diploma_theme], parent)
     paragraph_5.clear()
     run_5_1 = paragraph_5.add_run("Выполнил(а) дипломный проект на тему: ")
     run_5_1.font.size = Pt(11)
@@ -99,125 +291,657 @@ def build_docx(
     run_5_2.font.size = Pt(11)
     run_5_2.underline = True
 
-    paragraph_6 = document.paragraphs[31]
-    paragraph_6.clear()
-    run_6_1 = paragraph_6.add_run(
-        f"г. Могилев «{common_config.statement_date_day}»"
-        f" {common_config.statement_date_month}"
-        f" {common_config.statement_date_year}\tРегистрационный № ____"
+    table_rows_builder = get_table_rows_builder()
+    table_rows_builder.add_rows(
+        Table(body_elements[anchors.regular_disciplines], parent),
+        student_config.regular_disciplines,
     )
-    run_6_1.font.size = Pt(11)
+    table_rows_builder.add_rows(
+        Table(body_elements[anchors.course_disciplines], parent),
+        [*student_config.course_work_disciplines, *student_config.course_project_disciplines],
+    )
+    table_rows_builder.add_rows(
+        Table(body_elements[anchors.practice_disciplines], parent),
+        student_config.practice_disciplines,
+    )
+
 
-    table1 = document.tables[0]
-    for discipline in student_config.regular_disciplines:
-        new_row = table1.add_row()
-
-        cell_1 = new_row.cells[0]
-        cell_paragraph_1 = cell_1.paragraphs[0]
-        cell_run_1 = cell_paragraph_1.add_run(discipline[0])
-        cell_run_1.font.size = Pt(10)
-
-        cell_2 = new_row.cells[1]
-        cell_paragraph_2 = cell_2.paragraphs[0]
-        cell_run_2 = cell_paragraph_2.add_run(discipline[1])
-        cell_run_2.font.size = Pt(10)
-
-        cell_3 = new_row.cells[2]
-        cell_paragraph_3 = cell_3.paragraphs[0]
-        cell_run_3 = cell_paragraph_3.add_run(discipline[2])
-        cell_run_3.font.size = Pt(10)
-
-        cell_paragraph_2.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        cell_paragraph_3.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-
-    table2 = document.tables[1]
-    for discipline in student_config.course_work_disciplines:
-        new_row = table2.add_row()
-
-        cell_1 = new_row.cells[0]
-        cell_paragraph_1 = cell_1.paragraphs[0]
-        cell_run_1 = cell_paragraph_1.add_run(discipline[0])
-        cell_run_1.font.size = Pt(10)
-
-        cell_2 = new_row.cells[1]
-        cell_paragraph_2 = cell_2.paragraphs[0]
-        cell_run_2 = cell_paragraph_2.add_run(discipline[1])
-        cell_run_2.font.size = Pt(10)
-
-        cell_3 = new_row.cells[2]
-        cell_paragraph_3 = cell_3.paragraphs[0]
-        cell_run_3 = cell_paragraph_3.add_run(discipline[2])
-        cell_run_3.font.size = Pt(10)
-
-        cell_paragraph_2.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        cell_paragraph_3.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-
-    for discipline in student_config.course_project_disciplines:
-        new_row = table2.add_row()
-
-        cell_1 = new_row.cells[0]
-        cell_paragraph_1 = cell_1.paragraphs[0]
-        cell_run_1 = cell_paragraph_1.add_run(discipline[0])
-        cell_run_1.font.size = Pt(10)
-
-        cell_2 = new_row.cells[1]
-        cell_paragraph_2 = cell_2.paragraphs[0]
-        cell_run_2 = cell_paragraph_2.add_run(discipline[1])
-        cell_run_2.font.size = Pt(10)
-
-        cell_3 = new_row.cells[2]
-        cell_paragraph_3 = cell_3.paragraphs[0]
-        cell_run_3 = cell_paragraph_3.add_run(discipline[2])
-        cell_run_3.font.size = Pt(10)
-
-        cell_paragraph_2.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        cell_paragraph_3.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-
-    table3 = document.tables[2]
-    for discipline in student_config.practice_disciplines:
-        new_row = table3.add_row()
-
-        cell_1 = new_row.cells[0]
-        cell_paragraph_1 = cell_1.paragraphs[0]
-        cell_run_1 = cell_paragraph_1.add_run(discipline[0])
-        cell_run_1.font.size = Pt(10)
-
-        cell_2 = new_row.cells[1]
-        cell_paragraph_2 = cell_2.paragraphs[0]
-        cell_run_2 = cell_paragraph_2.add_run(discipline[1])
-        cell_run_2.font.size = Pt(10)
-
-        cell_3 = new_row.cells[2]
-        cell_paragraph_3 = cell_3.paragraphs[0]
-        cell_run_3 = cell_paragraph_3.add_run(discipline[2])
-        cell_run_3.font.size = Pt(10)
-
-        cell_paragraph_2.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-        cell_paragraph_3.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
-
-    file_name = f"Выписка_{student_config.full_name}.docx"
-    save_path = os.path.join(save_directory_path, file_name)
+def _get_statement_file_name(full_name: str) -> str:
+    return f"Выписка_{full_name}.docx"
+
+
+def _save_document(
+    document: DocumentObject,
+    save_directory_path: str,
+    student_config: StudentConfig,
+) -> None:
+    """
+    Saves a filled statement document to the save directory under the student's name.
+
+    :param document: The filled statement document.
+    :type document: DocumentObject
+    :param save_directory_path: The directory path where the document will be saved.
+    :type save_directory_path: str
+    :param student_config: Configuration of the student the statement belongs to.
+    :type student_config: StudentConfig
+    :return: None
+    """
+    save_path = os.path.join(
+        save_directory_path, _get_statement_file_name(student_config.full_name)
+    )
     document.save(save_path)
 
 
-def build_statements(
-    template_path: str,
+class StatementTemplate:
+    """
+    A Word document template parsed once and reused for rendering any number of statements.
+
+    The template package is loaded a single time and a pristine copy of its body XML is kept in memory.
+    Every statement gets a deep copy of that body, while styles, numbering and all other parts of the
+    package are shared. The anchors of the filled paragraphs and tables are compiled on loading, so
+    a malformed template is rejected before any statement is rendered.
+
+    The paragraphs filled from a common configuration are the same for every statement of a run,
+    so they are filled once into a baked copy of the pristine body, kept for the last few common
+    configurations; rendering a statement then only fills the student's paragraphs and tables.
+
+    Attributes:
+        document: The loaded template document whose body is replaced for every statement.
+        anchors: The compiled anchors of the template.
+    """
+
+    def __init__(self, template_path: BINARY_SOURCE_TYPE) -> None:
+        """
+        Loads and compiles the template and stores a pristine copy of its body elements.
+
+        :param template_path: The Word document template's path, content or binary stream.
+        :type template_path: BINARY_SOURCE_TYPE
+        :raises template_utils.TemplateError: If the template's anchors are malformed.
+        """
+        self.document = Document(io_utils.open_source(io_utils.normalize_source(template_path)))
+        self.anchors = template_utils.compile_template(self.document.element.body)
+        self._pristine_body_elements = [deepcopy(element) for element in self.document.element.body]
+        self._baked_bodies_elements: dict[tuple[str, ...], list[Any]] = {}
+
+    def _get_baked_body_elements(self, common_config: CommonConfig) -> list[Any]:
+        common_config_key = dataclasses.astuple(common_config)
+        baked_body_elements = self._baked_bodies_elements.get(common_config_key)
+        if baked_body_elements is None:
+            baked_body_elements = [deepcopy(element) for element in self._pristine_body_elements]
+            _fill_common_config(
+                baked_body_elements, self.document._body, common_config, self.anchors
+            )
+            if len(self._baked_bodies_elements) >= BAKED_BODIES_CACHE_SIZE:
+                del self._baked_bodies_elements[next(iter(self._baked_bodies_elements))]
+            self._baked_bodies_elements[common_config_key] = baked_body_elements
+
+        return baked_body_elements
+
+    def render(self, student_config: StudentConfig, common_config: CommonConfig) -> DocumentObject:
+        """
+        Renders a student's statement from the body baked with the common configuration.
+
+        The returned document is the same object on every call, so it must be saved before
+        the next call.
+
+        :param student_config: Configuration containing student's disciplines, full name, and diploma theme.
+        :type student_config: StudentConfig
+        :param common_config: Configuration containing common information such as dates and specialty details.
+        :type common_config: CommonConfig
+        :return: The filled template document.
+        :rtype: DocumentObject
+        """
+        body_elements = [
+            deepcopy(element) for element in self._get_baked_body_elements(common_config)
+        ]
+        self.document.element.body[:] = body_elements
+        _fill_student_config(body_elements, self.document._body, student_config, self.anchors)
+        return self.document
+
+
+_statement_templates = threading.local()
+
+
+def get_statement_template(template_path: BINARY_SOURCE_TYPE) -> StatementTemplate:
+    """
+    Returns the parsed template of a file, parsing it only on the first call in the current thread.
+
+    Templates are cached per thread because a StatementTemplate renders one statement at a time,
+    and keyed by the file's content digest, so an edited template is parsed and compiled again.
+    A process running many cohorts therefore parses and compiles a template shared by them once.
+
+    :param template_path: The Word document template's path, content or binary stream.
+    :type template_path: BINARY_SOURCE_TYPE
+    :raises template_utils.TemplateError: If the template's anchors are malformed.
+    :return: The parsed template.
+    :rtype: StatementTemplate
+    """
+    statement_templates = getattr(_statement_templates, 'by_digest', None)
+    if statement_templates is None:
+        statement_templates = _statement_templates.by_digest = {}
+
+    template_source = io_utils.normalize_source(template_path)
+    template_digest = io_utils.get_source_digest(template_source)
+    statement_template = statement_templates.get(template_digest)
+    if statement_template is None:
+        statement_template = StatementTemplate(template_source)
+        if len(statement_templates) >= STATEMENT_TEMPLATES_CACHE_SIZE:
+            del statement_templates[next(iter(statement_templates))]
+        statement_templates[template_digest] = statement_template
+
+    return statement_template
+
+
+def build_docx(
+    template_path: BINARY_SOURCE_TYPE,
     save_directory_path: str,
-    students_configs: list[StudentConfig],
+    student_config: StudentConfig,
     common_config: CommonConfig,
 ) -> None:
+    """
+    Generates a single Word document (.docx) for a student based on the provided template.
+
+    The template is parsed and compiled through the cache of get_statement_template.
+
+    :param template_path: The Word document template's path, content or binary stream.
+    :type template_path: BINARY_SOURCE_TYPE
+    :param save_directory_path: The directory path where the generated document will be saved.
+    :type save_directory_path: str
+    :param student_config: Configuration containing student's disciplines, full name, and diploma theme.
+    :type student_config: StudentConfig
+    :param common_config: Configuration containing common information such as dates and specialty details.
+    :type common_config: CommonConfig
+    :return: None
+    """
+    statement_template = get_statement_template(template_path)
+    document = statement_template.render(student_config, common_config)
+    _save_document(document, save_directory_path, student_config)
+
+
+def render_docx(
+    template_path: BINARY_SOURCE_TYPE,
+    student_config: StudentConfig,
+    common_config: CommonConfig,
+    output: BinaryIO | None = None,
+) -> bytes | None:
+    """
+    Renders a student's Word document (.docx) in memory instead of saving it to a directory.
+
+    :param template_path: The Word document template's path, content or binary stream.
+    :type template_path: BINARY_SOURCE_TYPE
+    :param student_config: Configuration containing student's disciplines, full name, and diploma theme.
+    :type student_config: StudentConfig
+    :param common_config: Configuration containing common information such as dates and specialty details.
+    :type common_config: CommonConfig
+    :param output: The binary stream to write the document to, or None to return it (default is None).
+    :type output: BinaryIO | None
+    :return: The document bytes if no stream was given, otherwise None.
+    :rtype: bytes | None
+    """
+    document = get_statement_template(template_path).render(student_config, common_config)
+    return io_utils.write_or_return(document.save, output)
+
+
+_worker_statement_template: StatementTemplate | None = None
+
+
+def _init_statements_worker(template_path: str | bytes) -> None:
+    """
+    Loads the statement template once per worker process, which ignores Ctrl+C.
+
+    :param template_path: The path to the Word document template or its content.
+    :type template_path: str | bytes
+    :return: None
+    """
+    global _worker_statement_template
+    progress_utils.ignore_interrupts()
+    _worker_statement_template = StatementTemplate(template_path)
+
+
+def _build_indexed_statements(
+    statement_template: StatementTemplate,
+    save_directory_path: str,
+    indexed_students_configs: Iterable[tuple[int, StudentConfig]],
+    common_config: CommonConfig,
+) -> list[tuple[int, str, str]]:
+    """
+    Builds the statements of students paired with their positions in the input.
+
+    A failure of a single statement does not stop the rest of the students from being built.
+
+    :param statement_template: The parsed statement template.
+    :type statement_template: StatementTemplate
+    :param save_directory_path: The directory path where the generated documents will be saved.
+    :type save_directory_path: str
+    :param indexed_students_configs: Students' configurations paired with their positions in the input.
+    :type indexed_students_configs: Iterable[tuple[int, StudentConfig]]
+    :param common_config: Common configuration containing shared details like dates and specialties.
+    :type common_config: CommonConfig
+    :return: Errors as (position, student's full name, error description) tuples.
+    :rtype: list[tuple[int, str, str]]
+    """
+    errors = []
+    for index, student_config in indexed_students_configs:
+        try:
+            document = statement_template.render(student_config, common_config)
+            _save_document(document, save_directory_path, student_config)
+        except STATEMENT_ERRORS as e:
+            errors.append((index, student_config.full_name, f"{type(e).__name__}: {e}"))
+
+    return errors
+
+
+def _build_statements_chunk(
+    save_directory_path: str,
+    indexed_students_configs: list[tuple[int, StudentConfig]],
+    common_config: CommonConfig,
+) -> list[tuple[int, str, str]]:
+    """
+    Builds statements for a chunk of students inside a worker process.
+
+    :return: Errors as (position, student's full name, error description) tuples.
+    """
+    return _build_indexed_statements(
+        _worker_statement_template, save_directory_path, indexed_students_configs, common_config
+    )
+
+
+def _build_statements_parallel(
+    template_path: str | bytes,
+    save_directory_path: str,
+    students_configs: Iterable[StudentConfig],
+    common_config: CommonConfig,
+    workers: int,
+    chunk_size: int,
+    max_tasks_per_child: int | None,
+) -> int:
+    """
+    Distributes statements across a pool of worker processes in chunks.
+
+    At most a few chunks per worker are submitted ahead, so students' configurations are consumed
+    from the iterable lazily. Workers are replaced after max_tasks_per_child chunks to cap
+    the memory growth of python-docx.
+
+    :raises StatementsBuildError: If any statement could not be built.
+    :return: The number of statements written.
+    """
+    errors = []
+    students_count = 0
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_statements_worker,
+        initargs=(template_path,),
+        max_tasks_per_child=max_tasks_per_child,
+    ) as executor:
+        pending_futures = set()
+        indexed_students_configs = enumerate(students_configs)
+        while chunk := list(islice(indexed_students_configs, chunk_size)):
+            students_count += len(chunk)
+            if len(pending_futures) >= workers * PENDING_CHUNKS_PER_WORKER:
+                done_futures, pending_futures = wait(pending_futures, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    errors.extend(future.result())
+
+            pending_futures.add(
+                executor.submit(_build_statements_chunk, save_directory_path, chunk, common_config)
+            )
+
+        for future in as_completed(pending_futures):
+            errors.extend(future.result())
+
+    if errors:
+        raise StatementsBuildError(sorted(errors))
+
+    return students_count
+
+
+def _renumber_bookmarks(elements: Iterable[Any], bookmark_ids: Iterator[int]) -> None:
+    """
+    Gives the bookmarks of a statement's body elements IDs that are unique in the combined document.
+
+    :param elements: The body elements of a rendered statement.
+    :type elements: Iterable[Any]
+    :param bookmark_ids: The IDs not used yet in the combined document.
+    :type bookmark_ids: Iterator[int]
+    :return: None
+    """
+    new_ids = {}
+    for element in elements:
+        for bookmark in element.iter(*BOOKMARK_TAGS):
+            old_id = bookmark.get(qn('w:id'))
+            if old_id not in new_ids:
+                new_ids[old_id] = str(next(bookmark_ids))
+            bookmark.set(qn('w:id'), new_ids[old_id])
+
+
+def _build_single_document(
+    template_path: str | bytes,
+    save_directory_path: str,
+    students_configs: Iterable[StudentConfig],
+    common_config: CommonConfig,
+) -> int:
+    """
+    Builds a single Word document containing every student's statement separated by page breaks.
+
+    Each statement is rendered into the template document and its body elements are then moved into
+    the combined document, so the template's styles and numbering are stored only once and no
+    separate document is kept per student. The bookmarks of every statement are renumbered, since
+    each one comes with the template's bookmark IDs.
+
+    :return: The number of documents written, which is always 1.
+    """
+    statement_template = get_statement_template(template_path)
+    combined_document = Document(io_utils.open_source(template_path))
+    combined_body = combined_document.element.body
+    section_properties = combined_body.sectPr
+    for element in list(combined_body):
+        if element is not section_properties:
+            combined_body.remove(element)
+
+    bookmark_ids = count()
+    for i, student_config in enumerate(students_configs):
+        document = statement_template.render(student_config, common_config)
+
+        statement_section_properties = document.element.body.sectPr
+        statement_elements = [
+            element
+            for element in document.element.body
+            if element is not statement_section_properties
+        ]
+        _renumber_bookmarks(statement_elements, bookmark_ids)
+        if i != 0:
+            statement_elements.insert(0, parse_xml(PAGE_BREAK_PARAGRAPH_XML))
+
+        for element in statement_elements:
+            if section_properties is None:
+                combined_body.append(element)
+            else:
+                section_properties.addprevious(element)
+
+    combined_document.save(os.path.join(save_directory_path, SINGLE_DOCUMENT_FILE_NAME))
+    return 1
+
+
+def _build_statements(
+    template_path: str | bytes,
+    save_directory_path: str,
+    students_configs: Iterable[StudentConfig],
+    common_config: CommonConfig,
+    workers: int,
+    chunk_size: int,
+    max_tasks_per_child: int | None,
+    single_document: bool,
+) -> int:
+    """
+    Builds statements with the rendering mode selected by the arguments of build_statements.
+
+    :return: The number of documents written.
+    """
+    if single_document:
+        return _build_single_document(
+            template_path, save_directory_path, students_configs, common_config
+        )
+
+    if workers > 1:
+        return _build_statements_parallel(
+            template_path,
+            save_directory_path,
+            students_configs,
+            common_config,
+            workers,
+            chunk_size,
+            max_tasks_per_child,
+        )
+
+    students_count = 0
+
+    def count_students() -> Iterator[tuple[int, StudentConfig]]:
+        nonlocal students_count
+        for indexed_student_config in enumerate(students_configs):
+            students_count += 1
+            yield indexed_student_config
+
+    errors = _build_indexed_statements(
+        get_statement_template(template_path), save_directory_path, count_students(), common_config
+    )
+    if errors:
+        raise StatementsBuildError(errors)
+
+    return students_count
+
+
+def _update_statements_manifest(
+    save_directory_path: str,
+    manifest: dict[str, Any],
+    previous_statements_entries: dict[str, dict[str, Any]],
+    statements_hashes: dict[str, str],
+) -> None:
+    manifest_utils.remove_stale_files(
+        save_directory_path, previous_statements_entries, statements_hashes
+    )
+    manifest[manifest_utils.MANIFEST_STATEMENTS_KEY] = {
+        file_name: manifest_utils.make_manifest_entry(save_directory_path, file_name, data_hash)
+        for file_name, data_hash in statements_hashes.items()
+    }
+    manifest_utils.save_manifest(save_directory_path, manifest)
+
+
+def _build_statements_incremental(
+    template_path: str | bytes,
+    save_directory_path: str,
+    students_configs: Iterable[StudentConfig],
+    common_config: CommonConfig,
+    workers: int,
+    chunk_size: int,
+    max_tasks_per_child: int | None,
+    single_document: bool,
+) -> int:
+    """
+    Rebuilds only the statements whose data changed since the run recorded in the manifest.
+
+    Statement hashes cover the student's configuration, the common configuration and the template
+    fingerprint. A statement is skipped only if its hash matches the manifest and the file still has
+    the size and modification time recorded there. Statements that are not generated anymore are
+    removed, and statements that failed to build are left out of the manifest so that the next run
+    retries them. If the run stops on any other error, the manifest is left as it was; statements
+    rewritten meanwhile no longer match their recorded stamps and are rebuilt by the next run.
+
+    :raises StatementsBuildError: If any statement could not be built.
+    :return: The number of documents rebuilt.
+    """
+    manifest = manifest_utils.load_manifest(save_directory_path)
+    previous_statements_entries = manifest[manifest_utils.MANIFEST_STATEMENTS_KEY]
+    base_hash = manifest_utils.get_data_hash(
+        common_config, io_utils.get_source_digest(template_path)
+    )
+    statements_hashes = {}
+
+    if single_document:
+        students_configs = list(students_configs)
+        statements_hashes[SINGLE_DOCUMENT_FILE_NAME] = manifest_utils.get_data_hash(
+            base_hash, students_configs
+        )
+        outdated_students_configs = (
+            None
+            if manifest_utils.is_file_up_to_date(
+                save_directory_path,
+                SINGLE_DOCUMENT_FILE_NAME,
+                previous_statements_entries,
+                statements_hashes[SINGLE_DOCUMENT_FILE_NAME],
+            )
+            else students_configs
+        )
+    else:
+
+        def get_outdated_students_configs() -> Iterator[StudentConfig]:
+            for student_config in students_configs:
+                file_name = _get_statement_file_name(student_config.full_name)
+                statements_hashes[file_name] = manifest_utils.get_data_hash(
+                    base_hash, student_config
+                )
+                if not manifest_utils.is_file_up_to_date(
+                    save_directory_path,
+                    file_name,
+                    previous_statements_entries,
+                    statements_hashes[file_name],
+                ):
+                    yield student_config
+
+        outdated_students_configs = get_outdated_students_configs()
+
+    documents_count = 0
+    try:
+        if outdated_students_configs is not None:
+            documents_count = _build_statements(
+                template_path,
+                save_directory_path,
+                outdated_students_configs,
+                common_config,
+                workers,
+                chunk_size,
+                max_tasks_per_child,
+                single_document,
+            )
+    except StatementsBuildError as e:
+        for _, full_name, _ in e.errors:
+            statements_hashes.pop(_get_statement_file_name(full_name), None)
+        _update_statements_manifest(
+            save_directory_path, manifest, previous_statements_entries, statements_hashes
+        )
+        raise
+
+    _update_statements_manifest(
+        save_directory_path, manifest, previous_statements_entries, statements_hashes
+    )
+    return documents_count
+
+
+def build_statements(
+    template_path: BINARY_SOURCE_TYPE,
+    save_directory_path: str,
+    students_configs: Iterable[StudentConfig],
+    common_config: CommonConfig,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_tasks_per_child: int | None = DEFAULT_MAX_TASKS_PER_CHILD,
+    single_document: bool = False,
+    incremental: bool = False,
+) -> int:
     """
     Generates multiple Word documents (.docx) for a list of students using a provided template.
 
-    :param template_path: The file path to the Word document template.
-    :type template_path: str
+    The template is parsed once and every student gets a copy of its pristine body. With more than one
+    worker the statements are rendered in parallel by a pool of processes, each parsing the template
+    once. Either way a statement that fails does not stop the others: failures are collected for all
+    students and reported in input order.
+
+    In single document mode all statements are written to one file separated by page breaks instead
+    of one file per student. This mode always renders in the current process, so workers, chunk_size
+    and max_tasks_per_child do not apply to it.
+
+    In incremental mode a manifest in the save directory records a hash of every statement's data, and
+    only statements whose data, common configuration or template changed, or whose file was rewritten
+    since, are rebuilt, while statements of students that are gone are removed. Other modes clear
+    the statements recorded in an existing manifest, since they may overwrite them.
+
+    :param template_path: The Word document template's path, content or binary stream.
+    :type template_path: BINARY_SOURCE_TYPE
     :param save_directory_path: The directory path where all generated documents will be saved.
     :type save_directory_path: str
-    :param students_configs: A list of StudentConfig objects containing individual student data.
-    :type students_configs: list[StudentConfig]
+    :param students_configs: StudentConfig objects containing individual student data.
+    :type students_configs: Iterable[StudentConfig]
     :param common_config: Common configuration containing shared details like dates and specialties.
     :type common_config: CommonConfig
-    :return: None
+    :param workers: The number of worker processes (default is 1, rendering in the current process);
+        ignored in single document mode.
+    :type workers: int
+    :param chunk_size: The number of students submitted to a worker at once.
+    :type chunk_size: int
+    :param max_tasks_per_child: The number of chunks after which a worker process is replaced,
+        or None to keep workers for the whole run.
+    :type max_tasks_per_child: int | None
+    :param single_document: Whether to write all statements into a single document (default is False).
+    :type single_document: bool
+    :param incremental: Whether to rebuild only changed statements (default is False).
+    :type incremental: bool
+    :raises template_utils.TemplateError: If the template's anchors are malformed; this is checked
+        before any statement is rendered.
+    :raises StatementsBuildError: If any statement could not be built.
+    :return: The number of documents written; skipped up-to-date statements are not counted.
+    :rtype: int
+    """
+    template_path = io_utils.normalize_source(template_path)
+    get_statement_template(template_path)
+
+    if incremental:
+        return _build_statements_incremental(
+            template_path,
+            save_directory_path,
+            students_configs,
+            common_config,
+            workers,
+            chunk_size,
+            max_tasks_per_child,
+            single_document,
+        )
+
+    manifest_utils.clear_manifest_section(
+        save_directory_path, manifest_utils.MANIFEST_STATEMENTS_KEY
+    )
+    return _build_statements(
+        template_path,
+        save_directory_path,
+        students_configs,
+        common_config,
+        workers,
+        chunk_size,
+        max_tasks_per_child,
+        single_document,
+    )
+
+
+def build_statements_zip(
+    template_path: BINARY_SOURCE_TYPE,
+    students_configs: Iterable[StudentConfig],
+    common_config: CommonConfig,
+    output: BinaryIO | None = None,
+    extra_files: dict[str, bytes] | None = None,
+) -> bytes | None:
+    """
+    Builds a ZIP archive of students' statements in memory, named as build_statements names files.
+
+    Statements are rendered in the current process and every document is compressed into the archive
+    as soon as it is rendered, so no file is written to disk.
+
+    :param template_path: The Word document template's path, content or binary stream.
+    :type template_path: BINARY_SOURCE_TYPE
+    :param students_configs: StudentConfig objects containing individual student data.
+    :type students_configs: Iterable[StudentConfig]
+    :param common_config: Common configuration containing shared details like dates and specialties.
+    :type common_config: CommonConfig
+    :param output: The binary stream to write the archive to, or None to return it (default is None).
+    :type output: BinaryIO | None
+    :param extra_files: Contents of other files to add after the statements, such as the average
+        marks workbook, by file name (default is None).
+    :type extra_files: dict[str, bytes] | None
+    :raises template_utils.TemplateError: If the template's anchors are malformed; this is checked
+        before any statement is rendered.
+    :return: The archive bytes if no stream was given, otherwise None.
+    :rtype: bytes | None
     """
-    for student_config in students_configs:
-        build_docx(template_path, save_directory_path, student_config, common_config)
+    statement_template = get_statement_template(template_path)
+
+    def write_archive(stream: BinaryIO) -> None:
+        with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for student_config in students_configs:
+                document_buffer = io.BytesIO()
+                statement_template.render(student_config, common_config).save(document_buffer)
+                archive.writestr(
+                    _get_statement_file_name(student_config.full_name),
+                    document_buffer.getvalue(),
+                )
+
+            for file_name, content in (extra_files or {}).items():
+                archive.writestr(file_name, content)
+
+    return io_utils.write_or_return(write_archive, output)
@@ -0,0 +1,94 @@
+"""
+Module for reading inputs and writing outputs given as paths, bytes or binary streams.
+
+Inputs are normalized once into a path or the content bytes, so they can be hashed, sent to worker
+processes and opened several times. Outputs are either written to a stream provided by the caller
+or returned as bytes, so results can be served or archived without temporary files.
+
+Functions:
+- normalize_source: Converts an input into its path or its content bytes.
+- get_source_digest: Computes the content digest of a normalized input.
+- open_source: Returns a normalized input in a form accepted by pandas and python-docx.
+- write_or_return: Writes an output to a stream, or returns it as bytes.
+
+Dependencies:
+- io, hashlib, os: For in-memory streams, hashing and paths.
+- backend.cache_utils: Content digests of files.
+- backend.custom_typing: Custom typing definition for BINARY_SOURCE_TYPE.
+"""
+
+import hashlib
+import io
+import os
+from collections.abc import Callable
+from typing import BinaryIO
+
+from backend import cache_utils
+from backend.custom_typing import BINARY_SOURCE_TYPE
+
+
+def normalize_source(source: BINARY_SOURCE_TYPE) -> str | bytes:
+    """
+    Converts an input into its path or its content bytes, reading binary streams to the end.
+
+    :param source: The path to the file, its content or a binary stream.
+    :type source: BINARY_SOURCE_TYPE
+    :return: The path for path inputs and the content otherwise.
+    :rtype: str | bytes
+    """
+    if isinstance(source, str | os.PathLike):
+        return os.fspath(source)
+    if isinstance(source, bytes | bytearray | memoryview):
+        return bytes(source)
+
+    return source.read()
+
+
+def get_source_digest(source: str | bytes) -> str:
+    """
+    Computes the digest of a normalized input in the format of cache_utils.get_file_digest.
+
+    :param source: The path to the file or its content.
+    :type source: str | bytes
+    :return: The digest of the content.
+    :rtype: str
+    """
+    if isinstance(source, str):
+        return cache_utils.get_file_digest(source)
+
+    return f"{hashlib.sha256(source).hexdigest()}-{len(source)}"
+
+
+def open_source(source: str | bytes) -> str | BinaryIO:
+    """
+    Returns a normalized input in a form accepted by pandas.read_excel and docx.Document.
+
+    :param source: The path to the file or its content.
+    :type source: str | bytes
+    :return: The path, or a new in-memory stream over the content.
+    :rtype: str | BinaryIO
+    """
+    if isinstance(source, str):
+        return source
+
+    return io.BytesIO(source)
+
+
+def write_or_return(write: Callable[[BinaryIO], None], output: BinaryIO | None) -> bytes | None:
+    """
+    Writes an output to a caller-provided stream, or to memory returning its bytes.
+
+    :param write: A function writing the output to a binary stream.
+    :type write: Callable[[BinaryIO], None]
+    :param output: The stream to write to, or None to return the bytes.
+    :type output: BinaryIO | None
+    :return: The written bytes if no stream was given, otherwise None.
+    :rtype: bytes | None
+    """
+    if output is not None:
+        write(output)
+        return None
+
+    buffer = io.BytesIO()
+    write(buffer)
+    return buffer.getvalue()
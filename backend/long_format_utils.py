@@ -0,0 +1,317 @@
+"""
+Module implementing the long-format engine for aggregating student statistics.
+
+Instead of walking nested dictionaries of discipline configurations, the joined semester DataFrame is
+melted into a long DataFrame with one row per (student, discipline) pair. Category assignment,
+summarization of regular disciplines by name and average marks are then computed with vectorized
+pandas/NumPy operations. The results are identical to the ones produced by backend.data_utils.
+
+This module provides the following functions:
+1. get_students_stats_long: Melts the joined semester DataFrame into long format.
+2. get_students_with_avg_mark: Computes and sorts students by average mark.
+3. get_students_configs: Generates a list of structured student configurations.
+
+Functions:
+- get_students_stats_long: Builds the long DataFrame annotated with parsed discipline columns.
+- get_students_with_avg_mark: Computes average marks with a groupby over the long DataFrame.
+- get_students_configs: Summarizes regular disciplines by name and builds StudentConfig objects.
+
+Dependencies:
+- numpy, pandas: For vectorized data manipulation.
+- backend.data_utils: Cohort plan compilation, categories, marks mapping and formatting.
+- backend.pandas_utils: Removal of duplicated students.
+- backend.classes.student_config: Student configuration class.
+"""
+
+from itertools import pairwise
+
+import numpy
+import pandas
+from pandas import DataFrame
+
+from backend import data_utils, pandas_utils
+from backend.classes.student_config import StudentConfig
+from backend.custom_typing import STUDENTS_WITH_AVG_MARK_TYPE
+
+STUDENT_COLUMN = 'student'
+STUDENT_POSITION_COLUMN = 'student_position'
+SEMESTER_COLUMN = 'semester'
+DISCIPLINE_COLUMN = 'discipline'
+STUDY_HOURS_COLUMN = 'study_hours'
+CREDITS_NUMBER_COLUMN = 'credits_number'
+CONTROL_FORM_COLUMN = 'control_form'
+CATEGORY_COLUMN = 'category'
+MARK_COLUMN = 'mark'
+IS_INTEGER_MARK_COLUMN = 'is_integer_mark'
+CATEGORY_CODE_COLUMN = 'category_code'
+CATEGORY_ORDER_COLUMN = 'category_order'
+SUMMARIZATION_GROUP_COLUMN = 'summarization_group'
+HOURS_AND_CREDITS_NUMBER_COLUMN = 'hours_and_credits_number'
+
+CATEGORY_CODES = {category: code for code, category in enumerate(data_utils.DISCIPLINE_CATEGORIES)}
+
+
+def _get_is_integer_marks(marks_df: DataFrame) -> numpy.ndarray:
+    """
+    Flags marks that are integers, matching the isinstance check of the dictionary-based path.
+
+    :param marks_df: A DataFrame containing only discipline mark columns.
+    :type marks_df: DataFrame
+    :return: A boolean array of the same shape as the DataFrame.
+    :rtype: numpy.ndarray
+    """
+    is_integer_marks = numpy.zeros(marks_df.shape, dtype=bool)
+    for i, (_, column) in enumerate(marks_df.items()):
+        if pandas.api.types.is_integer_dtype(column.dtype):
+            is_integer_marks[:, i] = True
+        elif column.dtype == object:
+            is_integer_marks[:, i] = [
+                isinstance(mark, int | numpy.integer) for mark in column.to_numpy()
+            ]
+
+    return is_integer_marks
+
+
+def get_students_stats_long(joined_df: DataFrame, key_column: str = "ФИО") -> DataFrame:
+    """
+    Melts the joined semester DataFrame into long format, one row per student and discipline.
+
+    Every row is annotated with the parsed discipline column (semester, name, hours, credits, control
+    form and category) as well as its order within the category and its summarization group. Rows are
+    sorted by student, category and order within the category.
+
+    :param joined_df: The joined semester DataFrame with one row per student.
+    :type joined_df: DataFrame
+    :param key_column: The column containing students' full names (default is "ФИО").
+    :type key_column: str
+    :return: The long DataFrame.
+    :rtype: DataFrame
+    """
+    df = pandas_utils.deduplicate_students(joined_df, key_column)
+    discipline_columns = [column for column in df.columns if column != key_column]
+    cohort_plan = data_utils.get_cohort_plan(discipline_columns)
+
+    columns_count = len(discipline_columns)
+    category_codes = numpy.empty(columns_count, dtype=numpy.int64)
+    category_orders = numpy.empty(columns_count, dtype=numpy.int64)
+    for category, column_indices in cohort_plan.category_orders:
+        category_codes[list(column_indices)] = CATEGORY_CODES[category]
+        category_orders[list(column_indices)] = numpy.arange(len(column_indices))
+
+    summarization_groups = numpy.full(columns_count, -1, dtype=numpy.int64)
+    hours_and_credits_numbers = numpy.array(
+        [
+            data_utils.get_hours_and_credits_number_repr(study_hours, credits_number)
+            for study_hours, credits_number in zip(
+                cohort_plan.study_hours, cohort_plan.credits_numbers, strict=True
+            )
+        ],
+        dtype=object,
+    )
+    for group, column_indices in enumerate(cohort_plan.summarization_groups):
+        summarized_study_hours = 0
+        summarized_credits_number = 0.0
+        for i in column_indices:
+            summarized_study_hours += cohort_plan.study_hours[i]
+            summarized_credits_number += cohort_plan.credits_numbers[i]
+        summarization_groups[list(column_indices)] = group
+        hours_and_credits_numbers[list(column_indices)] = (
+            data_utils.get_hours_and_credits_number_repr(
+                summarized_study_hours, summarized_credits_number
+            )
+        )
+
+    marks_df = df[discipline_columns]
+    students_count = len(df)
+    student_positions = numpy.repeat(numpy.arange(students_count), columns_count)
+    columns = numpy.tile(numpy.arange(columns_count), students_count)
+
+    students_stats_long = DataFrame(
+        {
+            STUDENT_COLUMN: df[key_column].to_numpy(dtype=object)[student_positions],
+            STUDENT_POSITION_COLUMN: student_positions,
+            SEMESTER_COLUMN: numpy.asarray(cohort_plan.semesters, dtype=numpy.int64)[columns],
+            DISCIPLINE_COLUMN: numpy.asarray(cohort_plan.names, dtype=object)[columns],
+            STUDY_HOURS_COLUMN: numpy.asarray(cohort_plan.study_hours, dtype=numpy.int64)[columns],
+            CREDITS_NUMBER_COLUMN: numpy.asarray(cohort_plan.credits_numbers)[columns],
+            CONTROL_FORM_COLUMN: numpy.asarray(cohort_plan.control_forms, dtype=object)[columns],
+            CATEGORY_COLUMN: numpy.asarray(cohort_plan.categories, dtype=object)[columns],
+            MARK_COLUMN: marks_df.to_numpy(dtype=object).ravel(),
+            IS_INTEGER_MARK_COLUMN: _get_is_integer_marks(marks_df).ravel(),
+            CATEGORY_CODE_COLUMN: category_codes[columns],
+            CATEGORY_ORDER_COLUMN: category_orders[columns],
+            SUMMARIZATION_GROUP_COLUMN: summarization_groups[columns],
+            HOURS_AND_CREDITS_NUMBER_COLUMN: hours_and_credits_numbers[columns],
+        }
+    )
+
+    return students_stats_long.sort_values(
+        [STUDENT_POSITION_COLUMN, CATEGORY_CODE_COLUMN, CATEGORY_ORDER_COLUMN],
+        kind='stable',
+        ignore_index=True,
+    )
+
+
+def get_students_with_avg_mark(students_stats_long: DataFrame) -> STUDENTS_WITH_AVG_MARK_TYPE:
+    """
+    Calculates the average integer mark for each student and sorts them in descending order.
+
+    :param students_stats_long: The long DataFrame built by get_students_stats_long.
+    :type students_stats_long: DataFrame
+    :return: A sorted tuple of student names with their average marks, from highest to lowest.
+    :rtype: STUDENTS_WITH_AVG_MARK_TYPE
+    """
+    integer_marks = pandas.to_numeric(
+        students_stats_long[MARK_COLUMN].where(students_stats_long[IS_INTEGER_MARK_COLUMN])
+    )
+    marks_aggregated = integer_marks.groupby(
+        students_stats_long[STUDENT_POSITION_COLUMN], sort=True
+    ).agg(['sum', 'count'])
+    students_full_names = (
+        students_stats_long[STUDENT_COLUMN]
+        .groupby(students_stats_long[STUDENT_POSITION_COLUMN], sort=True)
+        .first()
+    )
+
+    students_with_avg_mark = [
+        (student_full_name, marks_sum / marks_count if marks_count else 0)
+        for student_full_name, marks_sum, marks_count in zip(
+            students_full_names.tolist(),
+            marks_aggregated['sum'].tolist(),
+            marks_aggregated['count'].tolist(),
+            strict=True,
+        )
+    ]
+
+    return tuple(sorted(students_with_avg_mark, key=lambda x: x[1], reverse=True))
+
+
+def get_students_configs(
+    students_stats_long: DataFrame,
+    diploma_themes_df: DataFrame,
+) -> list[StudentConfig]:
+    """
+    Generates a list of student configurations from the long DataFrame.
+
+    Regular disciplines are summarized by name over contiguous sorted groups, the remaining categories are taken
+    as is. Discipline rows of all students are then sliced per student and category.
+
+    :param students_stats_long: The long DataFrame built by get_students_stats_long.
+    :type students_stats_long: DataFrame
+    :param diploma_themes_df: A DataFrame containing student names and their corresponding diploma themes.
+    :type diploma_themes_df: DataFrame
+    :return: A list of StudentConfig objects containing structured student data.
+    :rtype: list[StudentConfig]
+    """
+    diploma_themes_dict = dict(
+        zip(
+            diploma_themes_df[data_utils.DIPLOMA_THEMES_DATAFRAME_FULL_NAME_COLUMN],
+            diploma_themes_df[data_utils.DIPLOMA_THEMES_DATAFRAME_THEME_COLUMN],
+            strict=True,
+        )
+    )
+
+    marks = students_stats_long[MARK_COLUMN]
+    marks_reprs = marks.map(data_utils.MARKS_MAPPING)
+    unknown_marks = marks_reprs.isna()
+    if unknown_marks.any():
+        raise KeyError(marks[unknown_marks].iloc[0])
+
+    is_regular = (
+        students_stats_long[CATEGORY_CODE_COLUMN] == CATEGORY_CODES[data_utils.REGULAR_CATEGORY]
+    )
+    regular_df = (
+        students_stats_long[is_regular]
+        .assign(
+            mark_repr=marks_reprs[is_regular],
+            is_credit_mark=marks[is_regular] == data_utils.CREDIT_MARK,
+        )
+        .sort_values(
+            [STUDENT_POSITION_COLUMN, SUMMARIZATION_GROUP_COLUMN, CATEGORY_ORDER_COLUMN],
+            kind='stable',
+            ignore_index=True,
+        )
+    )
+    regular_student_positions = regular_df[STUDENT_POSITION_COLUMN].to_numpy()
+    regular_summarization_groups = regular_df[SUMMARIZATION_GROUP_COLUMN].to_numpy()
+    is_group_start = numpy.ones(len(regular_df), dtype=bool)
+    is_group_start[1:] = (regular_student_positions[1:] != regular_student_positions[:-1]) | (
+        regular_summarization_groups[1:] != regular_summarization_groups[:-1]
+    )
+    groups_starts = numpy.flatnonzero(is_group_start)
+    groups_bounds = numpy.append(groups_starts, len(regular_df)).tolist()
+
+    regular_marks_reprs = regular_df['mark_repr'].tolist()
+    regular_summarized_df = regular_df.iloc[groups_starts].set_index(STUDENT_POSITION_COLUMN)[
+        [CATEGORY_CODE_COLUMN, DISCIPLINE_COLUMN, HOURS_AND_CREDITS_NUMBER_COLUMN]
+    ]
+    regular_summarized_df['mark_repr'] = numpy.where(
+        (
+            numpy.logical_and.reduceat(regular_df['is_credit_mark'].to_numpy(), groups_starts)
+            if len(groups_starts)
+            else numpy.empty(0, dtype=bool)
+        ),
+        data_utils.MARKS_MAPPING[data_utils.CREDIT_MARK],
+        numpy.array(
+            [
+                ', '.join(regular_marks_reprs[group_start:group_end])
+                for group_start, group_end in pairwise(groups_bounds)
+            ],
+            dtype=object,
+        ),
+    )
+
+    other_df = students_stats_long[~is_regular].assign(mark_repr=marks_reprs[~is_regular])
+    other_df = other_df.set_index(STUDENT_POSITION_COLUMN)[
+        [CATEGORY_CODE_COLUMN, DISCIPLINE_COLUMN, HOURS_AND_CREDITS_NUMBER_COLUMN, 'mark_repr']
+    ]
+
+    rows_df = pandas.concat([regular_summarized_df, other_df]).reset_index()
+    rows_df = rows_df.sort_values(
+        [STUDENT_POSITION_COLUMN, CATEGORY_CODE_COLUMN], kind='stable', ignore_index=True
+    )
+    rows = list(
+        zip(
+            rows_df[DISCIPLINE_COLUMN].tolist(),
+            rows_df[HOURS_AND_CREDITS_NUMBER_COLUMN].tolist(),
+            rows_df['mark_repr'].tolist(),
+            strict=True,
+        )
+    )
+
+    students_full_names = (
+        students_stats_long[STUDENT_COLUMN]
+        .groupby(students_stats_long[STUDENT_POSITION_COLUMN], sort=True)
+        .first()
+        .tolist()
+    )
+    categories_count = len(data_utils.DISCIPLINE_CATEGORIES)
+    rows_counts = numpy.zeros((len(students_full_names), categories_count), dtype=numpy.int64)
+    numpy.add.at(
+        rows_counts,
+        (rows_df[STUDENT_POSITION_COLUMN].to_numpy(), rows_df[CATEGORY_CODE_COLUMN].to_numpy()),
+        1,
+    )
+    rows_bounds = numpy.concatenate(([0], numpy.cumsum(rows_counts.ravel()))).tolist()
+
+    students_configs = []
+    for student_position, student_full_name in enumerate(students_full_names):
+        student_disciplines = {}
+        for category_code, category in enumerate(data_utils.DISCIPLINE_CATEGORIES):
+            bound_index = student_position * categories_count + category_code
+            student_disciplines[category] = rows[
+                rows_bounds[bound_index] : rows_bounds[bound_index + 1]
+            ]
+
+        students_configs.append(
+            StudentConfig(
+                student_full_name,
+                student_disciplines[data_utils.REGULAR_CATEGORY],
+                student_disciplines[data_utils.COURSE_WORK_CATEGORY],
+                student_disciplines[data_utils.COURSE_PROJECT_CATEGORY],
+                student_disciplines[data_utils.PRACTICE_CATEGORY],
+                diploma_themes_dict[student_full_name],
+            )
+        )
+
+    return students_configs
@@ -0,0 +1,216 @@
+"""
+Module for keeping a manifest of generated output files to regenerate only what has changed.
+
+The manifest is a JSON file stored in the save directory. It maps every generated statement file to
+a hash of the data it was built from (the student's configuration, the common configuration and the
+template fingerprint) and stores the hash of the ranking data written to the average marks file.
+Every entry also records the size and modification time the file had when the entry was written, so
+a file rewritten by a non-incremental or an interrupted run is not mistaken for an up-to-date one.
+
+Functions:
+- get_data_hash: Computes a stable hash of configuration dataclasses and plain values.
+- get_file_stamp: Returns the size and modification time of a file.
+- make_manifest_entry: Builds the manifest entry of a file written from some data.
+- is_file_up_to_date: Checks a file against its manifest entry.
+- load_manifest: Loads the manifest of a save directory.
+- save_manifest: Atomically writes the manifest of a save directory.
+- clear_manifest_section: Forgets every file of a manifest section.
+- remove_stale_files: Removes files recorded in the manifest that are no longer generated.
+
+Dependencies:
+- hashlib, json, os: For hashing data and storing the manifest.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+from collections.abc import Iterable
+from contextlib import suppress
+from typing import Any
+
+MANIFEST_FILE_NAME = '.statements_manifest.json'
+MANIFEST_VERSION = 2
+
+MANIFEST_STATEMENTS_KEY = 'statements'
+MANIFEST_RANKING_KEY = 'ranking'
+MANIFEST_HASH_KEY = 'hash'
+MANIFEST_STAMP_KEY = 'stamp'
+
+
+def _to_json_compatible(value: Any) -> Any:
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return str(value)
+
+
+def get_data_hash(*values: Any) -> str:
+    """
+    Computes a stable SHA-256 hash of configuration dataclasses and plain values.
+
+    :param values: Dataclass instances, strings, numbers and nested lists/tuples of them.
+    :type values: Any
+    :return: The hexadecimal hash.
+    :rtype: str
+    """
+    serialized_values = json.dumps(
+        values, default=_to_json_compatible, ensure_ascii=False, sort_keys=True
+    )
+    return hashlib.sha256(serialized_values.encode('utf-8')).hexdigest()
+
+
+def get_file_stamp(file_path: str) -> str | None:
+    """
+    Returns the size and modification time of a file, which change whenever the file is rewritten.
+
+    :param file_path: The path to the file.
+    :type file_path: str
+    :return: The stamp of the file, or None if it does not exist.
+    :rtype: str | None
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+
+    return f"{file_stat.st_size}-{file_stat.st_mtime_ns}"
+
+
+def make_manifest_entry(save_directory_path: str, file_name: str, data_hash: str) -> dict[str, Any]:
+    """
+    Builds the manifest entry of a file written from data with the given hash.
+
+    :param save_directory_path: The directory path where generated files are saved.
+    :type save_directory_path: str
+    :param file_name: The name of the file in the save directory.
+    :type file_name: str
+    :param data_hash: The hash of the data the file was written from.
+    :type data_hash: str
+    :return: The entry recording the data hash and the file's current stamp.
+    :rtype: dict[str, Any]
+    """
+    return {
+        MANIFEST_HASH_KEY: data_hash,
+        MANIFEST_STAMP_KEY: get_file_stamp(os.path.join(save_directory_path, file_name)),
+    }
+
+
+def is_file_up_to_date(
+    save_directory_path: str,
+    file_name: str,
+    entries: dict[str, dict[str, Any]],
+    data_hash: str,
+) -> bool:
+    """
+    Checks whether a file was written from the given data and has not been rewritten since.
+
+    :param save_directory_path: The directory path where generated files are saved.
+    :type save_directory_path: str
+    :param file_name: The name of the file in the save directory.
+    :type file_name: str
+    :param entries: The entries of a manifest section by file name.
+    :type entries: dict[str, dict[str, Any]]
+    :param data_hash: The hash of the data the file should be written from.
+    :type data_hash: str
+    :return: Whether the file exists and matches its entry.
+    :rtype: bool
+    """
+    entry = entries.get(file_name)
+    return (
+        isinstance(entry, dict)
+        and entry.get(MANIFEST_HASH_KEY) == data_hash
+        and entry.get(MANIFEST_STAMP_KEY) is not None
+        and entry.get(MANIFEST_STAMP_KEY)
+        == get_file_stamp(os.path.join(save_directory_path, file_name))
+    )
+
+
+def _get_empty_manifest() -> dict[str, Any]:
+    return {
+        'version': MANIFEST_VERSION,
+        MANIFEST_STATEMENTS_KEY: {},
+        MANIFEST_RANKING_KEY: {},
+    }
+
+
+def load_manifest(save_directory_path: str) -> dict[str, Any]:
+    """
+    Loads the manifest of a save directory.
+
+    A missing, unreadable or outdated manifest is treated as empty, so every file is regenerated.
+
+    :param save_directory_path: The directory path where generated files are saved.
+    :type save_directory_path: str
+    :return: The manifest with "statements" and "ranking" sections mapping file names to entries.
+    :rtype: dict[str, Any]
+    """
+    try:
+        with open(os.path.join(save_directory_path, MANIFEST_FILE_NAME), encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return _get_empty_manifest()
+
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return _get_empty_manifest()
+
+    return manifest
+
+
+def save_manifest(save_directory_path: str, manifest: dict[str, Any]) -> None:
+    """
+    Atomically writes the manifest of a save directory.
+
+    :param save_directory_path: The directory path where generated files are saved.
+    :type save_directory_path: str
+    :param manifest: The manifest to write.
+    :type manifest: dict[str, Any]
+    :return: None
+    """
+    manifest_path = os.path.join(save_directory_path, MANIFEST_FILE_NAME)
+    temporary_path = manifest_path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2)
+    os.replace(temporary_path, manifest_path)
+
+
+def clear_manifest_section(save_directory_path: str, section_key: str) -> None:
+    """
+    Forgets every file of a manifest section, if the save directory has a manifest.
+
+    Runs writing files without the manifest call this, so the files they overwrite are rebuilt
+    by the next incremental run even if their stamps happen to match.
+
+    :param save_directory_path: The directory path where generated files are saved.
+    :type save_directory_path: str
+    :param section_key: MANIFEST_STATEMENTS_KEY or MANIFEST_RANKING_KEY.
+    :type section_key: str
+    :return: None
+    """
+    if not os.path.exists(os.path.join(save_directory_path, MANIFEST_FILE_NAME)):
+        return
+
+    manifest = load_manifest(save_directory_path)
+    if manifest[section_key]:
+        manifest[section_key] = {}
+        save_manifest(save_directory_path, manifest)
+
+
+def remove_stale_files(
+    save_directory_path: str,
+    previous_file_names: Iterable[str],
+    current_file_names: Iterable[str],
+) -> None:
+    """
+    Removes previously generated files that are not generated anymore.
+
+    :param save_directory_path: The directory path where generated files are saved.
+    :type save_directory_path: str
+    :param previous_file_names: File names recorded in the previous manifest.
+    :type previous_file_names: Iterable[str]
+    :param current_file_names: File names generated by the current run.
+    :type current_file_names: Iterable[str]
+    :return: None
+    """
+    for file_name in set(previous_file_names) - set(current_file_names):
+        with suppress(FileNotFoundError):
+            os.remove(os.path.join(save_directory_path, file_name))
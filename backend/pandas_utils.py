@@ -2,49 +2,112 @@
 Module for processing data from/to Excel files and performing operations on pandas DataFrames.
 
 This module provides the following functions:
-1. read_xlsx: Reads an Excel file and converts its content into a pandas DataFrame.
+1. read_xlsx: Reads an Excel file and converts its content into a pandas DataFrame, optionally cached.
 2. map_dfs_columns: Updates column names in a list of DataFrames by adding prefixes.
-3. join_dfs: Merges multiple DataFrames based on a common column.
-4. get_students_stats_raw: Converts DataFrame rows into a list of dictionaries indexed by a specified column.
-5. make_students_with_avg_mark_xlsx_file: Builds Dataframe with students' full names and average marks, writing it to .xlsx file.
+3. join_dfs, join_dfs_indexed: Merges multiple DataFrames based on a common column.
+4. get_students_stats_raw: Converts DataFrame rows into a list of dictionaries keyed by a specified column.
+5. iter_students_stats_raw: Lazily converts DataFrame rows into dictionaries, a chunk of rows at a time.
+6. deduplicate_students: Leaves a single row per student, keeping the last row's values.
+7. make_students_with_avg_mark_xlsx_file: Builds Dataframe with students' full names and average marks, writing it to .xlsx file.
+8. write_students_with_avg_mark_xlsx: Builds the same workbook into a stream or bytes.
 
 Functions:
 - read_xlsx: Reads an Excel file and returns a DataFrame.
 - map_dfs_columns: Adds prefixes to column names in DataFrames.
 - join_dfs: Performs inner joins on a list of DataFrames.
-- get_students_stats_raw: Splits rows into dictionaries with the specified index.
+- join_dfs_indexed: Performs the same inner join with a single alignment of all DataFrames.
+- get_students_dropped_by_join: Lists the students missing from the result of an inner join.
+- get_students_stats_raw: Converts all rows into dictionaries keyed by the specified column in one pass.
+- iter_students_stats_raw: Yields rows as dictionaries keyed by the specified column, chunk by chunk.
+- deduplicate_students: Removes duplicated students the way a name-keyed dictionary does.
 - make_students_with_avg_mark_xlsx_file: Writes students' full names and average marks to .xlsx file.
+- write_students_with_avg_mark_xlsx: Writes the same workbook to a binary stream or returns its bytes.
 
 Dependencies:
 - pandas: For data manipulation and analysis.
 - os: For handling file paths.
+- backend.cache_utils: On-disk cache of parsed Excel files.
+- backend.manifest_utils: Manifest of generated files for incremental runs.
+- backend.io_utils: Inputs and outputs given as paths, bytes or binary streams.
 - backend.custom_typing: Custom typing definition for STUDENTS_STATS_RAW_TYPE.
 """
 
 import os
+from collections.abc import Iterator
+from typing import BinaryIO
 
 import pandas
 from pandas import DataFrame
 
-from backend.custom_typing import STUDENTS_STATS_RAW_TYPE, STUDENTS_WITH_AVG_MARK_TYPE
+from backend import cache_utils, io_utils, manifest_utils
+from backend.custom_typing import (
+    BINARY_SOURCE_TYPE,
+    STUDENTS_STATS_RAW_TYPE,
+    STUDENTS_WITH_AVG_MARK_TYPE,
+)
 
+AVG_MARKS_FILE_NAME = "СРЕДНИЕ БАЛЛЫ.xlsx"
+DEFAULT_STUDENTS_CHUNK_SIZE = 512
 
-def read_xlsx(file_path: str) -> DataFrame:
+
+def read_xlsx(
+    file_path: BINARY_SOURCE_TYPE,
+    cache_directory_path: str | None = None,
+    cache_max_bytes: int = cache_utils.DEFAULT_CACHE_MAX_BYTES,
+    memory_cache: bool = False,
+) -> DataFrame:
     """
     Reads an Excel file and returns its content as a DataFrame.
 
-    :param file_path: The path to the Excel file.
-    :type file_path: str
+    The file can be given by its path, by its content bytes or as a binary stream.
+
+    If a cache directory is given, the parsed DataFrame is looked up there by the file's content
+    digest first and stored there after parsing on a miss. With the in-memory cache enabled, it is
+    looked up in the memory of the process before that; such a DataFrame is shared between callers
+    and must not be modified.
+
+    :param file_path: The path to the Excel file, its content or a binary stream.
+    :type file_path: BINARY_SOURCE_TYPE
+    :param cache_directory_path: The path to the cache directory of parsed files (default is None).
+    :type cache_directory_path: str | None
+    :param cache_max_bytes: The maximum total size of the cache directory in bytes.
+    :type cache_max_bytes: int
+    :param memory_cache: Whether to use the in-memory cache of the process (default is False).
+    :type memory_cache: bool
     :return: A DataFrame containing the data from the Excel file.
     :rtype: DataFrame
     """
-    return pandas.read_excel(file_path)
+    source = io_utils.normalize_source(file_path)
+    if cache_directory_path is None and not memory_cache:
+        return pandas.read_excel(io_utils.open_source(source))
+
+    cache_key = f"{io_utils.get_source_digest(source)}-pandas{pandas.__version__}"
+    if memory_cache:
+        df = cache_utils.load_memory_cached_dataframe(cache_key)
+        if df is not None:
+            return df
+
+    df = None
+    if cache_directory_path is not None:
+        df = cache_utils.load_cached_dataframe(cache_directory_path, cache_key)
+    if df is None:
+        df = pandas.read_excel(io_utils.open_source(source))
+        if cache_directory_path is not None:
+            cache_utils.store_cached_dataframe(cache_directory_path, cache_key, df, cache_max_bytes)
+
+    if memory_cache:
+        cache_utils.store_memory_cached_dataframe(cache_key, df)
+
+    return df
 
 
 def map_dfs_columns(dfs: list[DataFrame], key_column: str = "ФИО") -> list[DataFrame]:
     """
     Updates column names for a list of DataFrames, prefixing column names with an index.
 
+    The returned DataFrames are shallow copies sharing their data with the input ones, so only
+    the column labels are created anew.
+
     :param dfs: A list of DataFrames to be updated.
     :type dfs: list[DataFrame]
     :param key_column: The column name to exclude from renaming (default is "ФИО").
@@ -54,7 +117,7 @@ def map_dfs_columns(dfs: list[DataFrame], key_column: str = "ФИО") -> list[Da
     """
     mapped_dfs = []
     for i, df in enumerate(dfs):
-        updated_df = df.copy()
+        updated_df = df.copy(deep=False)
         updated_df.columns = [f"{i + 1}.{col}" if col != key_column else col for col in df.columns]
         mapped_dfs.append(updated_df)
 
@@ -79,9 +142,81 @@ def join_dfs(dfs: list[DataFrame], join_column: str = "ФИО") -> DataFrame:
     return result_df
 
 
+def _can_join_indexed(
+    dfs: list[DataFrame], keys_indexes: list[pandas.Index], join_column: str
+) -> bool:
+    value_columns = [column for df in dfs for column in df.columns if column != join_column]
+    if len(set(value_columns)) != len(value_columns):
+        return False
+
+    return all(
+        keys_index.is_unique and not keys_index.hasnans and df.columns.is_unique
+        for df, keys_index in zip(dfs, keys_indexes, strict=True)
+    )
+
+
+def join_dfs_indexed(dfs: list[DataFrame], join_column: str = "ФИО") -> DataFrame:
+    """
+    Performs an inner join on a list of DataFrames with a single alignment of all of them at once.
+
+    The join column of every DataFrame is indexed once, the keys common to all DataFrames are found
+    by intersecting the indexes, and every DataFrame is reordered to those keys and concatenated with
+    the others column-wise, instead of merging them pairwise and re-hashing the growing result at
+    every step. The result is the same as the one of join_dfs, including the order of rows and
+    columns. Input with duplicated or missing keys, or with value columns present in several
+    DataFrames, is joined with join_dfs, because only pairwise merges reproduce its row products and
+    column suffixes.
+
+    :param dfs: A list of DataFrames to be joined.
+    :type dfs: list[DataFrame]
+    :param join_column: The name of the column to join on (default is "ФИО").
+    :type join_column: str
+    :return: A single DataFrame resulting from the inner join of the input DataFrames.
+    :rtype: DataFrame
+    """
+    keys_indexes = [pandas.Index(df[join_column]) for df in dfs]
+    if len(dfs) == 1 or not _can_join_indexed(dfs, keys_indexes, join_column):
+        return join_dfs(dfs, join_column)
+
+    common_keys_index = keys_indexes[0]
+    for keys_index in keys_indexes[1:]:
+        common_keys_index = common_keys_index.intersection(keys_index, sort=False)
+
+    aligned_dfs = []
+    for i, (df, keys_index) in enumerate(zip(dfs, keys_indexes, strict=True)):
+        aligned_df = df.take(keys_index.get_indexer(common_keys_index))
+        if i != 0:
+            aligned_df = aligned_df.drop(columns=join_column)
+        aligned_df.index = pandas.RangeIndex(len(common_keys_index))
+        aligned_dfs.append(aligned_df)
+
+    return pandas.concat(aligned_dfs, axis=1)
+
+
+def get_students_dropped_by_join(
+    dfs: list[DataFrame], joined_df: DataFrame, join_column: str = "ФИО"
+) -> list[str]:
+    """
+    Returns the students present in some of the DataFrames but missing from their inner join.
+
+    :param dfs: The joined DataFrames.
+    :type dfs: list[DataFrame]
+    :param joined_df: The result of the inner join.
+    :type joined_df: DataFrame
+    :param join_column: The name of the column the DataFrames were joined on (default is "ФИО").
+    :type join_column: str
+    :return: The full names of the dropped students in order of first appearance.
+    :rtype: list[str]
+    """
+    students_full_names = pandas.concat(
+        [df[join_column] for df in dfs], ignore_index=True
+    ).drop_duplicates()
+    return students_full_names[~students_full_names.isin(joined_df[join_column])].tolist()
+
+
 def get_students_stats_raw(df: DataFrame, set_index: str = "ФИО") -> STUDENTS_STATS_RAW_TYPE:
     """
-    Splits a DataFrame row-by-row into individual DataFrames and converts each row into a dictionary.
+    Converts every DataFrame row into a dictionary keyed by the specified column in a single pass.
 
     :param df: The input DataFrame containing student statistics.
     :type df: DataFrame
@@ -90,22 +225,140 @@ def get_students_stats_raw(df: DataFrame, set_index: str = "ФИО") -> STUDENTS
     :return: A list of dictionaries representing each row in the DataFrame.
     :rtype: STUDENTS_STATS_RAW_TYPE
     """
-    dfs_divided_by_full_name = [row.to_frame().T.reset_index(drop=True) for _, row in df.iterrows()]
-    return [df.set_index(set_index).to_dict(orient='index') for df in dfs_divided_by_full_name]
+    students_full_names = df[set_index].tolist()
+    students_stats = df.drop(columns=set_index).to_dict(orient='records')
+    return [
+        {student_full_name: student_stats}
+        for student_full_name, student_stats in zip(
+            students_full_names, students_stats, strict=True
+        )
+    ]
+
+
+def iter_students_stats_raw(
+    df: DataFrame,
+    set_index: str = "ФИО",
+    chunk_size: int = DEFAULT_STUDENTS_CHUNK_SIZE,
+) -> Iterator[dict[str, dict[str, str | int]]]:
+    """
+    Lazily converts DataFrame rows into dictionaries keyed by the specified column.
+
+    Rows are converted a chunk at a time, so only a chunk's worth of dictionaries exists at once.
+
+    :param df: The input DataFrame containing student statistics.
+    :type df: DataFrame
+    :param set_index: The column to use as the index for the resulting dictionaries (default is "ФИО").
+    :type set_index: str
+    :param chunk_size: The number of rows converted at once.
+    :type chunk_size: int
+    :return: An iterator over the same dictionaries as returned by get_students_stats_raw.
+    :rtype: Iterator[dict[str, dict[str, str | int]]]
+    """
+    for start in range(0, len(df), chunk_size):
+        yield from get_students_stats_raw(df.iloc[start : start + chunk_size], set_index)
+
+
+def deduplicate_students(df: DataFrame, key_column: str = "ФИО") -> DataFrame:
+    """
+    Leaves a single row per student the same way building a dictionary keyed by student name does.
+
+    A duplicated student keeps the position of their first row and the values of their last row.
+
+    :param df: The input DataFrame containing student statistics.
+    :type df: DataFrame
+    :param key_column: The column containing students' full names (default is "ФИО").
+    :type key_column: str
+    :return: A DataFrame with unique students and a fresh RangeIndex.
+    :rtype: DataFrame
+    """
+    if not df[key_column].duplicated().any():
+        return df
+
+    students_full_names = df[key_column].drop_duplicates(keep='first')
+    last_rows_df = df.drop_duplicates(subset=key_column, keep='last').set_index(key_column)
+    return last_rows_df.loc[students_full_names.to_numpy()].reset_index()[df.columns]
 
 
 def make_students_with_avg_mark_xlsx_file(
     data_with_avg_marks: STUDENTS_WITH_AVG_MARK_TYPE,
     save_directory_path: str,
+    incremental: bool = False,
+    ranking_df: DataFrame | None = None,
 ) -> None:
     """
     Builds Dataframe with students' full names and average marks, writing it to .xlsx file.
 
+    A ranking DataFrame built by backend.ranking_utils.get_ranking_df can be given to export other
+    columns, such as ranks, weighted and per-semester averages, instead of the two default ones.
+
+    In incremental mode the file is rewritten only if the ranking data differs from the one recorded
+    in the save directory's manifest or the file was rewritten since. Outside incremental mode the
+    ranking recorded in an existing manifest is cleared.
+
     :param data_with_avg_marks: A sorted tuple of student names with their average marks, from highest to lowest.
     :type data_with_avg_marks: STUDENTS_WITH_AVG_MARK_TYPE
     :param save_directory_path: The path to the directory to save the generated file.
     :type save_directory_path: str
+    :param incremental: Whether to skip writing an unchanged file (default is False).
+    :type incremental: bool
+    :param ranking_df: The ranking columns to write instead of data_with_avg_marks (default is None).
+    :type ranking_df: DataFrame | None
+    """
+    output_path = os.path.join(save_directory_path, AVG_MARKS_FILE_NAME)
+    if incremental:
+        manifest = manifest_utils.load_manifest(save_directory_path)
+        if ranking_df is None:
+            ranking_hash = manifest_utils.get_data_hash(data_with_avg_marks)
+        else:
+            ranking_hash = manifest_utils.get_data_hash(
+                list(ranking_df.columns), ranking_df.to_numpy(dtype=object).tolist()
+            )
+        if manifest_utils.is_file_up_to_date(
+            save_directory_path,
+            AVG_MARKS_FILE_NAME,
+            manifest[manifest_utils.MANIFEST_RANKING_KEY],
+            ranking_hash,
+        ):
+            return
+    else:
+        manifest_utils.clear_manifest_section(
+            save_directory_path, manifest_utils.MANIFEST_RANKING_KEY
+        )
+
+    with open(output_path, 'wb') as file:
+        write_students_with_avg_mark_xlsx(data_with_avg_marks, file, ranking_df)
+
+    if incremental:
+        manifest[manifest_utils.MANIFEST_RANKING_KEY] = {
+            AVG_MARKS_FILE_NAME: manifest_utils.make_manifest_entry(
+                save_directory_path, AVG_MARKS_FILE_NAME, ranking_hash
+            )
+        }
+        manifest_utils.save_manifest(save_directory_path, manifest)
+
+
+def write_students_with_avg_mark_xlsx(
+    data_with_avg_marks: STUDENTS_WITH_AVG_MARK_TYPE,
+    output: BinaryIO | None = None,
+    ranking_df: DataFrame | None = None,
+) -> bytes | None:
+    """
+    Builds the .xlsx workbook of students' full names and average marks in memory.
+
+    :param data_with_avg_marks: A sorted tuple of student names with their average marks, from highest to lowest.
+    :type data_with_avg_marks: STUDENTS_WITH_AVG_MARK_TYPE
+    :param output: The binary stream to write the workbook to, or None to return it (default is None).
+    :type output: BinaryIO | None
+    :param ranking_df: The ranking columns to write instead of data_with_avg_marks (default is None).
+    :type ranking_df: DataFrame | None
+    :return: The workbook bytes if no stream was given, otherwise None.
+    :rtype: bytes | None
     """
-    output_path = os.path.join(save_directory_path, "СРЕДНИЕ БАЛЛЫ.xlsx")
-    df = pandas.DataFrame(data_with_avg_marks, columns=["ФИО", "Средний балл"])
-    df.to_excel(output_path, index=False)
+    if ranking_df is None:
+        df = pandas.DataFrame(data_with_avg_marks, columns=["ФИО", "Средний балл"])
+    else:
+        df = ranking_df
+
+    return io_utils.write_or_return(
+        lambda stream: df.to_excel(stream, index=False, engine='openpyxl'), output
+    )
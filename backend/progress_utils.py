@@ -0,0 +1,140 @@
+"""
+Module for reporting the progress of a run and cancelling it between students.
+
+Progress is reported through a callback receiving ProgressEvent objects. The callback is called from
+the thread running the pipeline, so a graphical interface should only hand the events over to its own
+thread, for example through a queue. Cancellation is requested by setting a threading.Event, which
+is checked before every stage and before every student. Worker processes ignore Ctrl+C, so that only
+the parent process reacts to it and cancels the run cleanly.
+
+Classes:
+- RunCancelled: An exception interrupting a run whose cancellation was requested.
+
+Functions:
+- report_progress: Sends a progress event to a callback, if any.
+- raise_if_cancelled: Raises RunCancelled if cancellation was requested.
+- ignore_interrupts: Makes the current worker process ignore Ctrl+C.
+- iter_with_progress: Iterates over items, reporting progress and checking for cancellation.
+- estimate_remaining_time: Estimates the remaining time of a stage from its progress.
+
+Dependencies:
+- threading, signal: For the cancellation event and ignoring Ctrl+C in workers.
+- backend.classes.progress_event: The ProgressEvent class.
+"""
+
+import signal
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from backend.classes.progress_event import ProgressEvent
+
+PROGRESS_CALLBACK_TYPE = Callable[[ProgressEvent], None]
+
+
+class RunCancelled(BaseException):
+    """
+    An exception interrupting a run whose cancellation was requested.
+
+    Like KeyboardInterrupt it is not an Exception subclass, so that error handlers of the stages,
+    which catch Exception, let it through.
+    """
+
+
+def report_progress(
+    progress_callback: PROGRESS_CALLBACK_TYPE | None,
+    stage: str,
+    done: int = 0,
+    total: int | None = None,
+) -> None:
+    """
+    Sends a progress event to a callback, if any.
+
+    :param progress_callback: The callback receiving progress events, or None.
+    :type progress_callback: Callable[[ProgressEvent], None] | None
+    :param stage: The name of the current stage.
+    :type stage: str
+    :param done: The number of items processed in the stage so far (default is 0).
+    :type done: int
+    :param total: The number of items the stage will process, or None if unknown (default is None).
+    :type total: int | None
+    """
+    if progress_callback is not None:
+        progress_callback(ProgressEvent(stage, done, total))
+
+
+def raise_if_cancelled(cancel_event: threading.Event | None) -> None:
+    """
+    Raises RunCancelled if cancellation was requested.
+
+    :param cancel_event: The event set to request cancellation, or None.
+    :type cancel_event: threading.Event | None
+    :raises RunCancelled: If the event is set.
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise RunCancelled
+
+
+def ignore_interrupts() -> None:
+    """
+    Makes the current worker process ignore SIGINT, used as a process pool initializer.
+
+    Ctrl+C in a terminal interrupts every process of the group. Without this, a worker would raise
+    KeyboardInterrupt, which a pool hands over to the parent through the task's result and which
+    would then bypass the parent's clean cancellation.
+
+    :return: None
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def iter_with_progress(
+    items: Iterable[Any],
+    stage: str,
+    total: int | None = None,
+    progress_callback: PROGRESS_CALLBACK_TYPE | None = None,
+    cancel_event: threading.Event | None = None,
+) -> Iterator[Any]:
+    """
+    Iterates over items, checking for cancellation before and reporting progress after every item.
+
+    Progress is reported once an item has been handed over to the consumer, so for consumers which
+    process items ahead in batches it counts the items taken rather than the items finished.
+
+    :param items: The items.
+    :type items: Iterable[Any]
+    :param stage: The name of the stage consuming the items.
+    :type stage: str
+    :param total: The number of items, or None if unknown (default is None).
+    :type total: int | None
+    :param progress_callback: The callback receiving progress events, or None (default is None).
+    :type progress_callback: Callable[[ProgressEvent], None] | None
+    :param cancel_event: The event set to request cancellation, or None (default is None).
+    :type cancel_event: threading.Event | None
+    :raises RunCancelled: If cancellation was requested before an item.
+    :return: An iterator over the items.
+    :rtype: Iterator[Any]
+    """
+    for done, item in enumerate(items, 1):
+        raise_if_cancelled(cancel_event)
+        yield item
+        report_progress(progress_callback, stage, done, total)
+
+
+def estimate_remaining_time(elapsed_time: float, done: int, total: int | None) -> float | None:
+    """
+    Estimates the remaining time of a stage assuming that its items take equal time.
+
+    :param elapsed_time: The time since the stage started in seconds.
+    :type elapsed_time: float
+    :param done: The number of items processed so far.
+    :type done: int
+    :param total: The number of items the stage will process, or None if unknown.
+    :type total: int | None
+    :return: The estimated remaining time in seconds, or None if it cannot be estimated yet.
+    :rtype: float | None
+    """
+    if not total or done <= 0:
+        return None
+
+    return elapsed_time / done * max(total - done, 0)
@@ -0,0 +1,205 @@
+"""
+Module implementing the vectorized ranking of a cohort by its marks.
+
+The marks of the joined semester DataFrame are converted once into a numeric students × disciplines
+matrix, with NaN standing for marks which are not integers (credits, missing marks). Plain averages,
+averages weighted by credits numbers and per-semester averages are then computed for all students at
+once with matrix products, and students are ranked with ties sharing a rank. The plain averages are
+the same as the ones computed by backend.data_utils.
+
+Functions:
+- get_marks_matrix: Converts discipline mark columns into a float matrix of integer marks.
+- get_ranks: Ranks values in descending order, equal values sharing the best rank.
+- get_students_ranking: Computes the averages and ranks of every student of a cohort.
+- get_ranking_df: Builds a DataFrame with selected columns of a ranking.
+- get_students_with_avg_mark: Converts a ranking into pairs of student names and average marks.
+
+Dependencies:
+- numpy, pandas: For vectorized computations.
+- backend.data_utils: Cohort plan compilation.
+- backend.pandas_utils: Removal of duplicated students.
+- backend.classes.students_ranking: The StudentsRanking class.
+"""
+
+from collections.abc import Sequence
+
+import numpy
+import pandas
+from pandas import DataFrame
+
+from backend import data_utils, pandas_utils
+from backend.classes.students_ranking import StudentsRanking
+from backend.custom_typing import STUDENTS_WITH_AVG_MARK_TYPE
+
+FULL_NAME_RANKING_COLUMN = 'full_name'
+RANK_RANKING_COLUMN = 'rank'
+AVG_MARK_RANKING_COLUMN = 'avg_mark'
+WEIGHTED_AVG_MARK_RANKING_COLUMN = 'weighted_avg_mark'
+SEMESTERS_AVG_MARKS_RANKING_COLUMN = 'semesters_avg_marks'
+
+RANKING_COLUMNS_HEADERS = {
+    FULL_NAME_RANKING_COLUMN: 'ФИО',
+    RANK_RANKING_COLUMN: 'Место',
+    AVG_MARK_RANKING_COLUMN: 'Средний балл',
+    WEIGHTED_AVG_MARK_RANKING_COLUMN: 'Средневзвешенный балл',
+}
+SEMESTER_AVG_MARK_HEADER_TEMPLATE = 'Средний балл за {} семестр'
+RANKING_COLUMNS = (*RANKING_COLUMNS_HEADERS, SEMESTERS_AVG_MARKS_RANKING_COLUMN)
+RANKING_METRICS = (AVG_MARK_RANKING_COLUMN, WEIGHTED_AVG_MARK_RANKING_COLUMN)
+DEFAULT_RANKING_COLUMNS = (FULL_NAME_RANKING_COLUMN, AVG_MARK_RANKING_COLUMN)
+
+
+def get_marks_matrix(marks_df: DataFrame) -> numpy.ndarray:
+    """
+    Converts discipline mark columns into a float matrix holding only integer marks.
+
+    Any integral mark counts, including NumPy integers found in object columns, while floats,
+    strings and missing values become NaN, as they are not averaged.
+
+    :param marks_df: A DataFrame containing only discipline mark columns.
+    :type marks_df: DataFrame
+    :return: A float array of the same shape as the DataFrame.
+    :rtype: numpy.ndarray
+    """
+    marks = numpy.full(marks_df.shape, numpy.nan)
+    for i, (_, column) in enumerate(marks_df.items()):
+        if pandas.api.types.is_integer_dtype(column.dtype):
+            marks[:, i] = column.to_numpy(dtype=float, na_value=numpy.nan)
+        elif column.dtype == object:
+            marks[:, i] = [
+                float(mark) if isinstance(mark, int | numpy.integer) else numpy.nan
+                for mark in column.to_numpy()
+            ]
+
+    return marks
+
+
+def get_ranks(values: numpy.ndarray) -> numpy.ndarray:
+    """
+    Ranks values in descending order; equal values share the best of their ranks ("1224" ranking).
+
+    :param values: The values to rank.
+    :type values: numpy.ndarray
+    :return: The 1-based rank of every value, in the order of the values.
+    :rtype: numpy.ndarray
+    """
+    negated_sorted_values = numpy.sort(-values)
+    return numpy.searchsorted(negated_sorted_values, -values, side='left') + 1
+
+
+def _divide_or_zero(numerators: numpy.ndarray, denominators: numpy.ndarray) -> numpy.ndarray:
+    return numpy.divide(
+        numerators, denominators, out=numpy.zeros_like(numerators), where=denominators != 0
+    )
+
+
+def get_students_ranking(
+    joined_df: DataFrame,
+    key_column: str = "ФИО",
+    rank_by: str = AVG_MARK_RANKING_COLUMN,
+) -> StudentsRanking:
+    """
+    Computes the plain, credit-weighted and per-semester averages and ranks of a cohort in one pass.
+
+    Duplicated students are removed the same way the dictionary-based path does. Students are
+    ordered by the ranked average in descending order, keeping the input order of equal averages.
+
+    :param joined_df: The joined semester DataFrame with one row per student.
+    :type joined_df: DataFrame
+    :param key_column: The column containing students' full names (default is "ФИО").
+    :type key_column: str
+    :param rank_by: The average students are ranked by, "avg_mark" or "weighted_avg_mark"
+        (default is "avg_mark").
+    :type rank_by: str
+    :raises ValueError: If rank_by is not a known average.
+    :return: The ranking of the cohort.
+    :rtype: StudentsRanking
+    """
+    if rank_by not in RANKING_METRICS:
+        raise ValueError(f"Unknown ranking metric: {rank_by}")
+
+    df = pandas_utils.deduplicate_students(joined_df, key_column)
+    discipline_columns = [column for column in df.columns if column != key_column]
+    cohort_plan = data_utils.get_cohort_plan(discipline_columns)
+
+    marks = get_marks_matrix(df[discipline_columns])
+    has_marks = ~numpy.isnan(marks)
+    marks = numpy.where(has_marks, marks, 0.0)
+
+    semesters, semesters_indices = numpy.unique(
+        numpy.asarray(cohort_plan.semesters, dtype=numpy.int64), return_inverse=True
+    )
+    semesters_indicators = numpy.zeros((len(discipline_columns), len(semesters)))
+    semesters_indicators[numpy.arange(len(discipline_columns)), semesters_indices] = 1.0
+    credits_numbers = numpy.asarray(cohort_plan.credits_numbers, dtype=float)
+
+    semesters_marks_sums = marks @ semesters_indicators
+    semesters_marks_counts = has_marks @ semesters_indicators
+    with numpy.errstate(invalid='ignore', divide='ignore'):
+        semesters_avg_marks = semesters_marks_sums / semesters_marks_counts
+
+    avg_marks = _divide_or_zero(
+        semesters_marks_sums.sum(axis=1), semesters_marks_counts.sum(axis=1)
+    )
+    weighted_avg_marks = _divide_or_zero(marks @ credits_numbers, has_marks @ credits_numbers)
+
+    ranked_values = avg_marks if rank_by == AVG_MARK_RANKING_COLUMN else weighted_avg_marks
+    order = numpy.argsort(-ranked_values, kind='stable')
+
+    return StudentsRanking(
+        full_names=df[key_column].to_numpy(dtype=object)[order].tolist(),
+        ranks=get_ranks(ranked_values)[order],
+        avg_marks=avg_marks[order],
+        weighted_avg_marks=weighted_avg_marks[order],
+        semesters=tuple(semesters.tolist()),
+        semesters_avg_marks=semesters_avg_marks[order],
+    )
+
+
+def get_ranking_df(
+    ranking: StudentsRanking, columns: Sequence[str] = DEFAULT_RANKING_COLUMNS
+) -> DataFrame:
+    """
+    Builds a DataFrame with selected columns of a ranking, headed in Russian.
+
+    :param ranking: The ranking of a cohort.
+    :type ranking: StudentsRanking
+    :param columns: The columns to include in order: "full_name", "rank", "avg_mark",
+        "weighted_avg_mark" and "semesters_avg_marks", which expands into a column per semester
+        (default is the full name and the plain average).
+    :type columns: Sequence[str]
+    :raises ValueError: If a column is not a known ranking column.
+    :return: The DataFrame with a row per student in ranking order.
+    :rtype: DataFrame
+    """
+    ranking_columns_values = {
+        FULL_NAME_RANKING_COLUMN: ranking.full_names,
+        RANK_RANKING_COLUMN: ranking.ranks,
+        AVG_MARK_RANKING_COLUMN: ranking.avg_marks,
+        WEIGHTED_AVG_MARK_RANKING_COLUMN: ranking.weighted_avg_marks,
+    }
+    data = {}
+    for column in columns:
+        if column == SEMESTERS_AVG_MARKS_RANKING_COLUMN:
+            for i, semester in enumerate(ranking.semesters):
+                data[SEMESTER_AVG_MARK_HEADER_TEMPLATE.format(semester)] = (
+                    ranking.semesters_avg_marks[:, i]
+                )
+        elif column in ranking_columns_values:
+            data[RANKING_COLUMNS_HEADERS[column]] = ranking_columns_values[column]
+        else:
+            raise ValueError(f"Unknown ranking column: {column}")
+
+    return DataFrame(data)
+
+
+def get_students_with_avg_mark(ranking: StudentsRanking) -> STUDENTS_WITH_AVG_MARK_TYPE:
+    """
+    Converts a ranking into pairs of student names and plain average marks in ranking order.
+
+    :param ranking: The ranking of a cohort.
+    :type ranking: StudentsRanking
+    :return: A tuple of student names with their average marks.
+    :rtype: STUDENTS_WITH_AVG_MARK_TYPE
+    """
+    return tuple(zip(ranking.full_names, ranking.avg_marks.tolist(), strict=True))
@@ -0,0 +1,156 @@
+"""
+Module for instrumenting runs with per-stage timings, memory peaks and item counters.
+
+Every stage of a run is measured with a context manager which records its wall-clock time, its CPU
+time (including child processes that finished during the stage) and, optionally, the peak of memory
+traced by tracemalloc. The collected run report can be written as JSON next to the run's outputs.
+
+Functions:
+- is_enabled_by_environment: Checks whether an instrumentation switch is set in the environment.
+- get_cpu_time: Returns the CPU time of the process and its finished child processes.
+- describe_error: Returns a one-line description of an exception.
+- measure_stage: Context manager measuring a stage of a run.
+- save_report: Writes a run report as JSON.
+- format_report_summary: Formats a run report as a table of per-stage timings.
+
+Dependencies:
+- tracemalloc, os, json: For measuring memory and time and writing reports.
+- backend.classes.run_report, backend.classes.stage_report: Report classes.
+"""
+
+import dataclasses
+import json
+import os
+import time
+import traceback
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from backend.classes.run_report import RunReport
+from backend.classes.stage_report import StageReport
+
+REPORT_FILE_NAME = 'run_report.json'
+PROFILE_FILE_NAME = 'run_profile.prof'
+
+REPORT_ENVIRONMENT_VARIABLE = 'DIPLOMA_RUN_REPORT'
+PROFILE_ENVIRONMENT_VARIABLE = 'DIPLOMA_PROFILE'
+TRACE_MEMORY_ENVIRONMENT_VARIABLE = 'DIPLOMA_TRACE_MEMORY'
+
+
+def is_enabled_by_environment(variable_name: str) -> bool:
+    """
+    Checks whether an instrumentation switch is set in the environment.
+
+    :param variable_name: The name of the environment variable.
+    :type variable_name: str
+    :return: True if the variable is set to anything but an empty string, "0", "false" or "no".
+    :rtype: bool
+    """
+    return os.environ.get(variable_name, '').strip().lower() not in ('', '0', 'false', 'no')
+
+
+def get_cpu_time() -> float:
+    """
+    Returns the CPU time of the current process and its finished (waited for) child processes.
+
+    :return: The user and system CPU time in seconds.
+    :rtype: float
+    """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def describe_error(error: BaseException) -> str:
+    """
+    Returns a one-line description of an exception.
+
+    :param error: The exception.
+    :type error: BaseException
+    :return: The exception's type name and message.
+    :rtype: str
+    """
+    return ''.join(traceback.format_exception_only(error)).strip()
+
+
+@contextmanager
+def measure_stage(
+    report: RunReport, name: str, trace_memory: bool = False
+) -> Iterator[StageReport]:
+    """
+    Measures a stage of a run and appends its report to the run report.
+
+    Memory of child processes is not visible to tracemalloc, so the memory peak covers only work
+    done in the current process.
+
+    :param report: The run report to append the stage report to.
+    :type report: RunReport
+    :param name: The name of the stage.
+    :type name: str
+    :param trace_memory: Whether to trace the memory peak with tracemalloc (default is False).
+    :type trace_memory: bool
+    :return: The stage report, whose counters can be filled in by the stage.
+    :rtype: Iterator[StageReport]
+    """
+    stage_report = StageReport(name)
+    report.stages.append(stage_report)
+
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if trace_memory:
+        tracemalloc.reset_peak()
+
+    start_wall_time = time.perf_counter()
+    start_cpu_time = get_cpu_time()
+    try:
+        yield stage_report
+    finally:
+        stage_report.wall_time = time.perf_counter() - start_wall_time
+        stage_report.cpu_time = get_cpu_time() - start_cpu_time
+        if trace_memory:
+            stage_report.memory_peak = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def save_report(report: RunReport, save_directory_path: str) -> str:
+    """
+    Writes a run report as JSON into a directory.
+
+    :param report: The run report.
+    :type report: RunReport
+    :param save_directory_path: The directory path where the report will be saved.
+    :type save_directory_path: str
+    :return: The path to the written report.
+    :rtype: str
+    """
+    report_path = os.path.join(save_directory_path, REPORT_FILE_NAME)
+    with open(report_path, 'w', encoding='utf-8') as file:
+        json.dump(dataclasses.asdict(report), file, ensure_ascii=False, indent=2)
+    return report_path
+
+
+def format_report_summary(report: RunReport) -> str:
+    """
+    Formats a run report as a plain-text table with a row per stage and a total row.
+
+    :param report: The run report.
+    :type report: RunReport
+    :return: The table with wall-clock and CPU times, memory peaks and counters of the stages.
+    :rtype: str
+    """
+    lines = [f'{"stage":<20} {"wall, s":>10} {"cpu, s":>10} {"peak, MiB":>10}  counters']
+    for stage_report in report.stages:
+        memory_peak = (
+            f'{stage_report.memory_peak / 2**20:>10.1f}'
+            if stage_report.memory_peak is not None
+            else f'{"-":>10}'
+        )
+        counters = ', '.join(f'{name}={value}' for name, value in stage_report.counters.items())
+        lines.append(
+            f'{stage_report.name:<20} {stage_report.wall_time:>10.3f} '
+            f'{stage_report.cpu_time:>10.3f} {memory_peak}  {counters}'
+        )
+    lines.append(f'{"total":<20} {report.wall_time:>10.3f} {report.cpu_time:>10.3f}')
+    return '\n'.join(lines)
@@ -1,8 +1,50 @@
+import cProfile
 import datetime
+import os
+import time
+import zipfile
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from typing import Any
 
-from backend import data_utils, docx_utils, pandas_utils
+from docx.opc.exceptions import OpcError
+
+from backend import (
+    data_utils,
+    docx_utils,
+    long_format_utils,
+    pandas_utils,
+    progress_utils,
+    ranking_utils,
+    report_utils,
+    streaming_utils,
+    template_utils,
+)
 from backend.classes.common_config import CommonConfig
+from backend.classes.run_report import RunReport
+from backend.classes.stage_report import StageReport
+from backend.classes.student_config import StudentConfig
+
+DICT_DATA_ENGINE = 'dict'
+LONG_DATA_ENGINE = 'long'
+FUSED_DATA_ENGINE = 'fused'
+
+FULL_NAME_COLUMN = 'ФИО'
+
+PROCESS_INGEST_EXECUTOR = 'process'
+THREAD_INGEST_EXECUTOR = 'thread'
+
+INDEXED_JOIN_ENGINE = 'indexed'
+MERGE_JOIN_ENGINE = 'merge'
+
+CANCELLED_ERROR = 'Cancelled'
+
+# Failures of malformed inputs and unwritable outputs, reported through the return code; any other
+# exception is a bug and propagates out of runtime
+INPUT_ERRORS = (OSError, ValueError, LookupError, zipfile.BadZipFile)
+TEMPLATE_ERRORS = (*INPUT_ERRORS, OpcError, template_utils.TemplateError)
+OUTPUT_ERRORS = (OSError, ValueError, docx_utils.StatementsBuildError)
 
 
 def _make_date_string_representation(date: datetime.date) -> tuple[str, str, str]:
@@ -37,51 +79,34 @@ def _make_date_string_representation(date: datetime.date) -> tuple[str, str, str
     return day_repr, month_repr, year_repr
 
 
-def runtime(
-    state_holder: dict[str, Any],
-) -> int:
-    dfs = []
-    for path in state_holder['semester_files_paths']:
-        dfs.append(pandas_utils.read_xlsx(path))
-    try:
-        mapped_dfs = pandas_utils.map_dfs_columns(dfs)
-
-        joined_df = pandas_utils.join_dfs(mapped_dfs)
-
-        non_aggregated_data = pandas_utils.get_students_stats_raw(joined_df)
-
-        data_with_configs = data_utils.get_students_stats_with_discipline_configs(
-            non_aggregated_data
+def _make_ingest_executor(state_holder: dict[str, Any]) -> Executor:
+    ingest_workers = state_holder.get('ingest_workers') or min(
+        len(state_holder['semester_files_paths']) + 1, os.cpu_count() or 1
+    )
+    if state_holder.get('ingest_executor', THREAD_INGEST_EXECUTOR) == PROCESS_INGEST_EXECUTOR:
+        return ProcessPoolExecutor(
+            max_workers=ingest_workers, initializer=progress_utils.ignore_interrupts
         )
 
-        data_with_avg_marks = data_utils.get_students_with_avg_mark(data_with_configs)
+    return ThreadPoolExecutor(max_workers=ingest_workers)
 
-        data_with_grouped_configs = (
-            data_utils.get_students_stats_with_discipline_configs_grouped_by_category(
-                data_with_configs
-            )
-        )
 
-        data_summarized = (
-            data_utils.get_students_stats_with_discipline_configs_grouped_by_category_summarized(
-                data_with_grouped_configs
-            )
-        )
-    except Exception:
-        return 1
-
-    try:
-        data_ready = data_utils.get_students_configs(
-            data_summarized, pandas_utils.read_xlsx(state_holder['diploma_file_path'])
-        )
-    except Exception:
-        return 2
+def make_common_config(state_holder: dict[str, Any]) -> CommonConfig:
+    """
+    Builds the common configuration of a run from the dates and speciality details of a state holder.
 
+    :param state_holder: A dictionary with the "start_date", "end_date" and "statement_date" dates
+        and the "speciality_name", "speciality_code", "speciality_area_name" and
+        "speciality_area_code" strings.
+    :type state_holder: dict[str, Any]
+    :return: The common configuration with dates spelled out as in statements.
+    :rtype: CommonConfig
+    """
     start_date_repr = _make_date_string_representation(state_holder['start_date'])
     end_date_repr = _make_date_string_representation(state_holder['end_date'])
     statement_date_repr = _make_date_string_representation(state_holder['statement_date'])
 
-    common_config = CommonConfig(
+    return CommonConfig(
         start_date_day=start_date_repr[0],
         start_date_month=start_date_repr[1],
         start_date_year=start_date_repr[2][2:],
@@ -97,17 +122,360 @@ def runtime(
         statement_date_year=statement_date_repr[2],
     )
 
+
+@contextmanager
+def _measure_stage(
+    state_holder: dict[str, Any], report: RunReport, name: str, trace_memory: bool
+) -> Iterator[StageReport]:
+    progress_utils.raise_if_cancelled(state_holder.get('cancel_event'))
+    progress_utils.report_progress(state_holder.get('progress_callback'), name)
+    with report_utils.measure_stage(report, name, trace_memory) as stage_report:
+        yield stage_report
+
+
+def _build_statements(
+    state_holder: dict[str, Any],
+    students_configs: Iterable[StudentConfig],
+    common_config: CommonConfig,
+    stage: str,
+    students_count: int,
+) -> int:
+    return docx_utils.build_statements(
+        state_holder['template_file_path'],
+        state_holder['save_directory_path'],
+        progress_utils.iter_with_progress(
+            students_configs,
+            stage,
+            students_count,
+            state_holder.get('progress_callback'),
+            state_holder.get('cancel_event'),
+        ),
+        common_config,
+        workers=state_holder.get('statements_workers', 1),
+        chunk_size=state_holder.get('statements_chunk_size', docx_utils.DEFAULT_CHUNK_SIZE),
+        max_tasks_per_child=state_holder.get(
+            'statements_max_tasks_per_child', docx_utils.DEFAULT_MAX_TASKS_PER_CHILD
+        ),
+        single_document=state_holder.get('single_document', False),
+        incremental=state_holder.get('incremental', False),
+    )
+
+
+def _run(state_holder: dict[str, Any], report: RunReport, trace_memory: bool) -> int:
+    data_engine = state_holder.get('data_engine', FUSED_DATA_ENGINE)
+
     try:
-        docx_utils.build_statements(
-            state_holder['template_file_path'],
-            state_holder['save_directory_path'],
-            data_ready,
-            common_config,
-        )
-        pandas_utils.make_students_with_avg_mark_xlsx_file(
-            data_with_avg_marks, state_holder['save_directory_path']
-        )
-    except Exception:
+        docx_utils.get_statement_template(state_holder['template_file_path'])
+    except TEMPLATE_ERRORS as e:
+        report.error = report_utils.describe_error(e)
+        return 3
+
+    with _measure_stage(state_holder, report, 'read_workbooks', trace_memory) as stage_report:
+        with _make_ingest_executor(state_holder) as executor:
+            cache_directory_path = state_holder.get('cache_directory_path')
+            memory_cache = state_holder.get('memory_cache', False)
+            dfs_futures = [
+                executor.submit(
+                    pandas_utils.read_xlsx, path, cache_directory_path, memory_cache=memory_cache
+                )
+                for path in state_holder['semester_files_paths']
+            ]
+            diploma_themes_df_future = executor.submit(
+                pandas_utils.read_xlsx,
+                state_holder['diploma_file_path'],
+                cache_directory_path,
+                memory_cache=memory_cache,
+            )
+            try:
+                dfs = [df_future.result() for df_future in dfs_futures]
+            except INPUT_ERRORS as e:
+                report.error = report_utils.describe_error(e)
+                return 1
+
+            try:
+                diploma_themes_df = diploma_themes_df_future.result()
+            except INPUT_ERRORS as e:
+                report.error = report_utils.describe_error(e)
+                return 2
+
+        stage_report.counters['semester_files'] = len(dfs)
+        stage_report.counters['rows_read'] = sum(len(df) for df in dfs)
+
+    try:
+        with _measure_stage(state_holder, report, 'join_workbooks', trace_memory) as stage_report:
+            mapped_dfs = pandas_utils.map_dfs_columns(dfs)
+
+            if state_holder.get('join_engine', INDEXED_JOIN_ENGINE) == MERGE_JOIN_ENGINE:
+                joined_df = pandas_utils.join_dfs(mapped_dfs)
+            else:
+                joined_df = pandas_utils.join_dfs_indexed(mapped_dfs)
+
+            report.dropped_students = pandas_utils.get_students_dropped_by_join(
+                mapped_dfs, joined_df
+            )
+
+            stage_report.counters['students'] = len(joined_df)
+            stage_report.counters['disciplines_per_student'] = len(joined_df.columns) - 1
+            stage_report.counters['dropped_students'] = len(report.dropped_students)
+    except INPUT_ERRORS as e:
+        report.error = report_utils.describe_error(e)
+        return 1
+
+    if data_engine == FUSED_DATA_ENGINE:
+        try:
+            students_without_diploma_theme = data_utils.get_students_without_diploma_theme(
+                joined_df[FULL_NAME_COLUMN], diploma_themes_df
+            )
+        except INPUT_ERRORS as e:
+            report.error = report_utils.describe_error(e)
+            return 2
+
+        if students_without_diploma_theme:
+            report.error = 'Students without a diploma theme: ' + ', '.join(
+                students_without_diploma_theme
+            )
+            return 2
+
+    common_config = make_common_config(state_holder)
+
+    if data_engine == FUSED_DATA_ENGINE and state_holder.get('streaming', False):
+        students_with_avg_mark = []
+        deduplicated_df = pandas_utils.deduplicate_students(joined_df, FULL_NAME_COLUMN)
+
+        def iter_students_configs() -> Iterator[StudentConfig]:
+            for (
+                student_config,
+                student_with_avg_mark,
+            ) in data_utils.iter_students_configs_with_avg_mark(
+                pandas_utils.iter_students_stats_raw(deduplicated_df),
+                diploma_themes_df,
+                compact=state_holder.get('compact_configs', False),
+                debug_intermediates=state_holder.get('debug_intermediates'),
+            ):
+                students_with_avg_mark.append(student_with_avg_mark)
+                yield student_config
+
+        try:
+            with _measure_stage(
+                state_holder, report, 'stream_statements', trace_memory
+            ) as stage_report:
+                stage_report.counters['documents_written'] = _build_statements(
+                    state_holder,
+                    streaming_utils.iter_through_bounded_queue(
+                        iter_students_configs(),
+                        state_holder.get(
+                            'streaming_queue_size', streaming_utils.DEFAULT_QUEUE_SIZE
+                        ),
+                    ),
+                    common_config,
+                    'stream_statements',
+                    len(deduplicated_df),
+                )
+                stage_report.counters['students'] = len(students_with_avg_mark)
+        except streaming_utils.ProducerError as e:
+            if not isinstance(e.__cause__, INPUT_ERRORS):
+                raise
+            report.error = report_utils.describe_error(e.__cause__)
+            return 1
+        except OUTPUT_ERRORS as e:
+            report.error = report_utils.describe_error(e)
+            return 3
+
+        data_with_avg_marks = data_utils.get_students_sorted_by_avg_mark(students_with_avg_mark)
+    else:
+        try:
+            with _measure_stage(state_holder, report, 'transform', trace_memory) as stage_report:
+                if data_engine == FUSED_DATA_ENGINE:
+                    data_ready, data_with_avg_marks = (
+                        data_utils.get_students_configs_with_avg_marks(
+                            pandas_utils.iter_students_stats_raw(joined_df),
+                            diploma_themes_df,
+                            compact=state_holder.get('compact_configs', False),
+                            debug_intermediates=state_holder.get('debug_intermediates'),
+                        )
+                    )
+                elif data_engine == LONG_DATA_ENGINE:
+                    students_stats_long = long_format_utils.get_students_stats_long(joined_df)
+
+                    data_with_avg_marks = long_format_utils.get_students_with_avg_mark(
+                        students_stats_long
+                    )
+                else:
+                    non_aggregated_data = pandas_utils.get_students_stats_raw(joined_df)
+
+                    data_with_configs = data_utils.get_students_stats_with_discipline_configs(
+                        non_aggregated_data, compact=state_holder.get('compact_configs', False)
+                    )
+
+                    data_with_avg_marks = data_utils.get_students_with_avg_mark(data_with_configs)
+
+                    cohort_plan = data_utils.get_cohort_plan(
+                        column for column in joined_df.columns if column != FULL_NAME_COLUMN
+                    )
+                    data_with_grouped_configs = (
+                        data_utils.get_students_stats_with_discipline_configs_grouped_by_category(
+                            data_with_configs, cohort_plan
+                        )
+                    )
+
+                    data_summarized = data_utils.get_students_stats_with_discipline_configs_grouped_by_category_summarized(
+                        data_with_grouped_configs, cohort_plan
+                    )
+
+                stage_report.counters['students'] = len(data_with_avg_marks)
+        except INPUT_ERRORS as e:
+            report.error = report_utils.describe_error(e)
+            return 1
+
+        if data_engine != FUSED_DATA_ENGINE:
+            try:
+                with _measure_stage(
+                    state_holder, report, 'students_configs', trace_memory
+                ) as stage_report:
+                    if data_engine == LONG_DATA_ENGINE:
+                        data_ready = long_format_utils.get_students_configs(
+                            students_stats_long, diploma_themes_df
+                        )
+                    else:
+                        data_ready = data_utils.get_students_configs(
+                            data_summarized, diploma_themes_df
+                        )
+
+                    stage_report.counters['students'] = len(data_ready)
+            except INPUT_ERRORS as e:
+                report.error = report_utils.describe_error(e)
+                return 2
+
+        try:
+            with _measure_stage(
+                state_holder, report, 'build_statements', trace_memory
+            ) as stage_report:
+                stage_report.counters['documents_written'] = _build_statements(
+                    state_holder, data_ready, common_config, 'build_statements', len(data_ready)
+                )
+        except OUTPUT_ERRORS as e:
+            report.error = report_utils.describe_error(e)
+            return 3
+
+    ranking_df = None
+    if state_holder.get('ranking_columns'):
+        try:
+            with _measure_stage(state_holder, report, 'rank', trace_memory) as stage_report:
+                ranking = ranking_utils.get_students_ranking(
+                    joined_df,
+                    FULL_NAME_COLUMN,
+                    rank_by=state_holder.get(
+                        'ranking_metric', ranking_utils.AVG_MARK_RANKING_COLUMN
+                    ),
+                )
+                ranking_df = ranking_utils.get_ranking_df(ranking, state_holder['ranking_columns'])
+
+                stage_report.counters['students'] = len(ranking_df)
+        except INPUT_ERRORS as e:
+            report.error = report_utils.describe_error(e)
+            return 1
+
+    try:
+        with _measure_stage(state_holder, report, 'write_ranking', trace_memory) as stage_report:
+            pandas_utils.make_students_with_avg_mark_xlsx_file(
+                data_with_avg_marks,
+                state_holder['save_directory_path'],
+                incremental=state_holder.get('incremental', False),
+                ranking_df=ranking_df,
+            )
+
+            stage_report.counters['students'] = len(data_with_avg_marks)
+    except OUTPUT_ERRORS as e:
+        report.error = report_utils.describe_error(e)
         return 3
 
     return 4
+
+
+def runtime(
+    state_holder: dict[str, Any],
+    report: RunReport | None = None,
+) -> int:
+    """
+    Builds the statements and the average marks file of a cohort described by the state holder.
+
+    Every stage of the run is measured into a run report. The report is written as JSON next to
+    the outputs if the "write_report" key or the DIPLOMA_RUN_REPORT environment variable is set.
+    Memory peaks are traced with tracemalloc if the "trace_memory" key or DIPLOMA_TRACE_MEMORY is
+    set, and the whole run is profiled with cProfile into a dump next to the outputs if the "profile"
+    key or DIPLOMA_PROFILE is set.
+
+    With the default fused data engine and the "streaming" key set, students' configurations are
+    produced by a background thread and handed to the statements writer through a bounded queue, so
+    statements are written while the cohort is still being processed and memory stays flat.
+
+    Progress is reported to the "progress_callback" key, if set, with a ProgressEvent at the start
+    of every stage and after every student handed to the statements writer. Setting the threading
+    event under the "cancel_event" key stops the run before the next stage or student; statements
+    already written are kept.
+
+    The template is parsed and its anchors are validated before any workbook is read, so a malformed
+    template fails the run at once. The workbooks are then read concurrently by the number of
+    threads under the "ingest_workers" key, so the "memory_cache" key keeps them parsed in the
+    current process. Setting the "ingest_executor" key to PROCESS_INGEST_EXECUTOR reads them in
+    worker processes instead, at the cost of pickling every DataFrame back and of the memory cache,
+    which is then filled in the workers only.
+
+    Setting the "ranking_columns" key to columns of backend.ranking_utils computes the vectorized
+    ranking of the cohort, by the average under the "ranking_metric" key, and writes those columns
+    into the average marks file instead of the full names and plain averages.
+
+    Malformed inputs and unwritable outputs, the INPUT_ERRORS, TEMPLATE_ERRORS and OUTPUT_ERRORS,
+    are reported through the return code and the report's error; any other exception is a bug and
+    propagates.
+
+    :param state_holder: The input paths, dates, speciality details and optional run settings.
+    :type state_holder: dict[str, Any]
+    :param report: The run report to fill in, or None to use a new one (default is None).
+    :type report: RunReport | None
+    :return: 1 on a semester data error, 2 on a diploma themes error, 3 on an output error,
+        4 on success and 5 if the run was cancelled.
+    :rtype: int
+    """
+    if report is None:
+        report = RunReport()
+
+    trace_memory = state_holder.get('trace_memory') or report_utils.is_enabled_by_environment(
+        report_utils.TRACE_MEMORY_ENVIRONMENT_VARIABLE
+    )
+    profiler = (
+        cProfile.Profile()
+        if state_holder.get('profile')
+        or report_utils.is_enabled_by_environment(report_utils.PROFILE_ENVIRONMENT_VARIABLE)
+        else None
+    )
+
+    start_wall_time = time.perf_counter()
+    start_cpu_time = report_utils.get_cpu_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        report.return_code = _run(state_holder, report, trace_memory)
+    except progress_utils.RunCancelled:
+        report.error = CANCELLED_ERROR
+        report.return_code = 5
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        report.wall_time = time.perf_counter() - start_wall_time
+        report.cpu_time = report_utils.get_cpu_time() - start_cpu_time
+
+    save_directory_path = state_holder['save_directory_path']
+    if profiler is not None:
+        profile_path = os.path.join(save_directory_path, report_utils.PROFILE_FILE_NAME)
+        with suppress(OSError):
+            profiler.dump_stats(profile_path)
+            report.profile_path = profile_path
+
+    if state_holder.get('write_report') or report_utils.is_enabled_by_environment(
+        report_utils.REPORT_ENVIRONMENT_VARIABLE
+    ):
+        with suppress(OSError):
+            report_utils.save_report(report, save_directory_path)
+
+    return report.return_code
@@ -0,0 +1,607 @@
+"""
+Module implementing a local HTTP service building statements from uploaded workbooks.
+
+The service is a long-running process answering on the loopback interface only, so the import of
+pandas and python-docx, template parsing and workbook parsing are paid once rather than per cohort:
+templates are kept parsed per worker, and recently uploaded workbooks are kept parsed in the memory
+cache of every worker, keyed by their content digest.
+
+Endpoints:
+    POST /statements: A multipart/form-data request with "semester_file" files (repeated in
+        chronological order), a "themes_file" file, an optional "template_file" file, the
+        "speciality_name", "speciality_code", "speciality_area_name" and "speciality_area_code"
+        fields and the "start_date", "end_date" and optional "statement_date" fields formatted as
+        YYYY-MM-DD. Responds with a ZIP archive of the statements and the average marks workbook.
+    GET /health: Responds with the service's status, workers and queue size as JSON.
+
+Requests are built by a bounded pool of workers. At most workers + queue_size requests are accepted
+at once; any further request is answered with 503 Service Unavailable at once, before its upload is
+read, instead of piling up.
+
+Classes:
+- ServiceRequestError: An error answered to the client with an HTTP status.
+- StatementsService: Builds statements archives in a bounded pool of workers.
+- StatementsServer: The HTTP server of the service.
+
+Functions:
+- encode_multipart_form_data: Encodes fields and files as a multipart/form-data body.
+- parse_statements_request: Parses a multipart/form-data body into a StatementsRequest.
+- build_statements_archive: Builds the statements archive of a request.
+- make_statements_server: Creates a server with its worker pool, ready to serve.
+
+Dependencies:
+- http.server, email: For serving HTTP and parsing multipart bodies.
+- concurrent.futures: For the pool of workers.
+- backend.io_utils: For normalizing the default template.
+- backend.pandas_utils, backend.data_utils, backend.docx_utils: The statements pipeline.
+- backend.progress_utils: For leaving Ctrl+C to the server in worker processes.
+- backend.classes.statements_request: The StatementsRequest class.
+"""
+
+import datetime
+import email.parser
+import email.policy
+import json
+import threading
+import uuid
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+
+from backend import data_utils, docx_utils, io_utils, pandas_utils, progress_utils, report_utils
+from backend.classes.statements_request import StatementsRequest
+from backend.custom_typing import BINARY_SOURCE_TYPE
+from backend.runtime import FULL_NAME_COLUMN, OUTPUT_ERRORS, make_common_config
+
+SERVICE_HOST = '127.0.0.1'
+DEFAULT_SERVICE_PORT = 8765
+DEFAULT_QUEUE_SIZE = 8
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+STATEMENTS_PATH = '/statements'
+HEALTH_PATH = '/health'
+ARCHIVE_FILE_NAME = 'statements.zip'
+
+PROCESS_SERVICE_EXECUTOR = 'process'
+THREAD_SERVICE_EXECUTOR = 'thread'
+
+SEMESTER_FILE_FIELD = 'semester_file'
+THEMES_FILE_FIELD = 'themes_file'
+TEMPLATE_FILE_FIELD = 'template_file'
+TEXT_FIELDS = ('speciality_name', 'speciality_code', 'speciality_area_name', 'speciality_area_code')
+DATE_FIELDS = ('start_date', 'end_date')
+STATEMENT_DATE_FIELD = 'statement_date'
+
+
+class ServiceRequestError(Exception):
+    """
+    An error raised when a request cannot be served, answered to the client with an HTTP status.
+
+    Attributes:
+        status: The HTTP status of the response.
+        message: The description of the error sent to the client.
+    """
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(status, message)
+        self.status = status
+        self.message = message
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def encode_multipart_form_data(
+    fields: list[tuple[str, str]], files: list[tuple[str, str, bytes]]
+) -> tuple[str, bytes]:
+    """
+    Encodes fields and files as a multipart/form-data body, for clients of the service.
+
+    :param fields: Pairs of field names and values.
+    :type fields: list[tuple[str, str]]
+    :param files: Field names, file names and contents of the files.
+    :type files: list[tuple[str, str, bytes]]
+    :return: The Content-Type header value and the body.
+    :rtype: tuple[str, bytes]
+    """
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+            + value.encode()
+            + b'\r\n'
+        )
+    for name, file_name, content in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; '
+            f'filename="{file_name}"\r\nContent-Type: application/octet-stream\r\n\r\n'.encode()
+            + content
+            + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return f'multipart/form-data; boundary={boundary}', b''.join(parts)
+
+
+def _parse_date(name: str, value: str) -> datetime.date:
+    try:
+        return datetime.date.fromisoformat(value)
+    except ValueError as e:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST, f'The "{name}" field is not a YYYY-MM-DD date: {value}'
+        ) from e
+
+
+def parse_statements_request(content_type: str, body: bytes) -> StatementsRequest:
+    """
+    Parses a multipart/form-data body of a POST /statements request.
+
+    :param content_type: The Content-Type header of the request.
+    :type content_type: str
+    :param body: The body of the request.
+    :type body: bytes
+    :raises ServiceRequestError: If the body is not multipart/form-data, or a field is missing,
+        unknown, repeated or malformed.
+    :return: The parsed request.
+    :rtype: StatementsRequest
+    """
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f'Content-Type: {content_type}\r\n\r\n'.encode('latin-1') + body
+    )
+    if message.get_content_type() != 'multipart/form-data' or not message.is_multipart():
+        raise ServiceRequestError(
+            HTTPStatus.UNSUPPORTED_MEDIA_TYPE, 'The request must be multipart/form-data'
+        )
+
+    values: dict[str, list[bytes]] = {}
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        values.setdefault(name, []).append(part.get_payload(decode=True) or b'')
+
+    known_fields = {
+        SEMESTER_FILE_FIELD,
+        THEMES_FILE_FIELD,
+        TEMPLATE_FILE_FIELD,
+        *TEXT_FIELDS,
+        *DATE_FIELDS,
+        STATEMENT_DATE_FIELD,
+    }
+    unknown_fields = [str(name) for name in values if name not in known_fields]
+    if unknown_fields:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST, 'Unknown fields: ' + ', '.join(unknown_fields)
+        )
+
+    missing_fields = [
+        name
+        for name in (SEMESTER_FILE_FIELD, THEMES_FILE_FIELD, *TEXT_FIELDS, *DATE_FIELDS)
+        if name not in values
+    ]
+    if missing_fields:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST, 'Missing fields: ' + ', '.join(missing_fields)
+        )
+
+    repeated_fields = [
+        name
+        for name, name_values in values.items()
+        if name != SEMESTER_FILE_FIELD and len(name_values) > 1
+    ]
+    if repeated_fields:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST, 'Repeated fields: ' + ', '.join(repeated_fields)
+        )
+
+    text_values = {
+        name: values[name][0].decode('utf-8').strip()
+        for name in (*TEXT_FIELDS, *DATE_FIELDS, STATEMENT_DATE_FIELD)
+        if name in values
+    }
+    state_holder: dict[str, Any] = {name: text_values[name] for name in TEXT_FIELDS}
+    for name in DATE_FIELDS:
+        state_holder[name] = _parse_date(name, text_values[name])
+    state_holder[STATEMENT_DATE_FIELD] = (
+        _parse_date(STATEMENT_DATE_FIELD, text_values[STATEMENT_DATE_FIELD])
+        if text_values.get(STATEMENT_DATE_FIELD)
+        else datetime.date.today()
+    )
+
+    return StatementsRequest(
+        semester_files=values[SEMESTER_FILE_FIELD],
+        themes_file=values[THEMES_FILE_FIELD][0],
+        template_file=values[TEMPLATE_FILE_FIELD][0] if TEMPLATE_FILE_FIELD in values else None,
+        common_config=make_common_config(state_holder),
+    )
+
+
+def build_statements_archive(
+    statements_request: StatementsRequest, default_template: str | bytes | None
+) -> bytes:
+    """
+    Builds the ZIP archive of a request's statements and average marks workbook in memory.
+
+    Workbooks are parsed through the in-memory cache of the process, and templates through the
+    template cache of the current thread, so both stay warm across requests.
+
+    :param statements_request: The parsed request.
+    :type statements_request: StatementsRequest
+    :param default_template: The template used when the request has none, or None.
+    :type default_template: str | bytes | None
+    :raises ServiceRequestError: If an uploaded file is malformed or there is no template.
+    :return: The archive bytes.
+    :rtype: bytes
+    """
+    template = statements_request.template_file or default_template
+    if template is None:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST, f'The "{TEMPLATE_FILE_FIELD}" file is required'
+        )
+
+    try:
+        docx_utils.get_statement_template(template)
+    except Exception as e:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST, 'Malformed template: ' + report_utils.describe_error(e)
+        ) from e
+
+    try:
+        dfs = [
+            pandas_utils.read_xlsx(semester_file, memory_cache=True)
+            for semester_file in statements_request.semester_files
+        ]
+        joined_df = pandas_utils.join_dfs_indexed(pandas_utils.map_dfs_columns(dfs))
+    except Exception as e:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST, 'Malformed semester files: ' + report_utils.describe_error(e)
+        ) from e
+
+    try:
+        diploma_themes_df = pandas_utils.read_xlsx(
+            statements_request.themes_file, memory_cache=True
+        )
+        students_without_diploma_theme = data_utils.get_students_without_diploma_theme(
+            joined_df[FULL_NAME_COLUMN], diploma_themes_df
+        )
+    except Exception as e:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST, 'Malformed themes file: ' + report_utils.describe_error(e)
+        ) from e
+    if students_without_diploma_theme:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST,
+            'Students without a diploma theme: ' + ', '.join(students_without_diploma_theme),
+        )
+
+    try:
+        students_configs, data_with_avg_marks = data_utils.get_students_configs_with_avg_marks(
+            pandas_utils.iter_students_stats_raw(joined_df), diploma_themes_df
+        )
+    except Exception as e:
+        raise ServiceRequestError(
+            HTTPStatus.BAD_REQUEST, 'Malformed semester files: ' + report_utils.describe_error(e)
+        ) from e
+
+    return docx_utils.build_statements_zip(
+        template,
+        students_configs,
+        statements_request.common_config,
+        extra_files={
+            pandas_utils.AVG_MARKS_FILE_NAME: pandas_utils.write_students_with_avg_mark_xlsx(
+                data_with_avg_marks
+            )
+        },
+    )
+
+
+def _init_service_worker(default_template: str | bytes | None, ignore_interrupts: bool) -> None:
+    """
+    Parses the default template once per worker, so the first request does not pay for it.
+
+    :param default_template: The path to the default template or its content, or None.
+    :type default_template: str | bytes | None
+    :param ignore_interrupts: Whether the worker is a process that should leave Ctrl+C to the server.
+    :type ignore_interrupts: bool
+    :return: None
+    """
+    if ignore_interrupts:
+        progress_utils.ignore_interrupts()
+    if default_template is not None:
+        docx_utils.get_statement_template(default_template)
+
+
+class StatementsService:
+    """
+    Builds statements archives in a bounded pool of long-lived workers.
+
+    Every worker keeps its parsed templates and recently parsed workbooks between requests. At most
+    workers + queue_size requests are accepted at once, the rest are rejected as busy.
+
+    Attributes:
+        default_template: The path to the template used for requests without one, its content, or None.
+        workers: The number of workers building archives.
+        queue_size: The number of accepted requests waiting for a free worker.
+        executor: The kind of workers, PROCESS_SERVICE_EXECUTOR or THREAD_SERVICE_EXECUTOR.
+    """
+
+    def __init__(
+        self,
+        default_template: BINARY_SOURCE_TYPE | None = None,
+        workers: int = 1,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        executor: str = PROCESS_SERVICE_EXECUTOR,
+    ) -> None:
+        """
+        Validates the default template and starts the workers.
+
+        :param default_template: The default template's path, content or binary stream, or None to
+            require a template in every request (default is None).
+        :type default_template: BINARY_SOURCE_TYPE | None
+        :param workers: The number of workers building archives (default is 1).
+        :type workers: int
+        :param queue_size: The number of accepted requests waiting for a free worker.
+        :type queue_size: int
+        :param executor: The kind of workers (default is PROCESS_SERVICE_EXECUTOR).
+        :type executor: str
+        :raises template_utils.TemplateError: If the default template's anchors are malformed.
+        """
+        if default_template is not None:
+            default_template = io_utils.normalize_source(default_template)
+            docx_utils.get_statement_template(default_template)
+
+        self.default_template = default_template
+        self.workers = workers
+        self.queue_size = queue_size
+        self.executor = executor
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor_lock = threading.Lock()
+        self._executor = self._make_executor()
+
+    def _make_executor(self) -> Executor:
+        if self.executor == THREAD_SERVICE_EXECUTOR:
+            return ThreadPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_service_worker,
+                initargs=(self.default_template, False),
+            )
+
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_service_worker,
+            initargs=(self.default_template, True),
+        )
+
+    def _replace_broken_executor(self, broken_executor: Executor) -> None:
+        with self._executor_lock:
+            # Concurrent requests of the broken pool all fail, only the first one replaces it
+            if self._executor is broken_executor:
+                broken_executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._make_executor()
+
+    @contextmanager
+    def reserve_slot(self) -> Iterator[None]:
+        """
+        Reserves one of the workers + queue_size slots of accepted requests while one is served.
+
+        The slot is reserved before the request's body is read, so the uploads of rejected requests
+        are never buffered.
+
+        :raises ServiceRequestError: If every slot is taken.
+        :return: A context manager holding the slot.
+        :rtype: Iterator[None]
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ServiceRequestError(
+                HTTPStatus.SERVICE_UNAVAILABLE, 'The service is busy, retry later'
+            )
+
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def build_archive(self, statements_request: StatementsRequest) -> bytes:
+        """
+        Builds the statements archive of a request in a worker, waiting for its result.
+
+        The caller is expected to hold a slot reserved with reserve_slot. If a worker process dies,
+        the pool is replaced so that later requests are served, and the request is rejected as
+        unavailable rather than retried, since it may be the one that crashed the worker.
+
+        :param statements_request: The parsed request.
+        :type statements_request: StatementsRequest
+        :raises ServiceRequestError: If an uploaded file is malformed or a worker crashed.
+        :return: The archive bytes.
+        :rtype: bytes
+        """
+        executor = self._executor
+        try:
+            return executor.submit(
+                build_statements_archive, statements_request, self.default_template
+            ).result()
+        except BrokenProcessPool as e:
+            self._replace_broken_executor(executor)
+            raise ServiceRequestError(
+                HTTPStatus.SERVICE_UNAVAILABLE, 'A worker crashed, retry later'
+            ) from e
+
+    def get_health(self) -> dict[str, Any]:
+        """
+        Returns the status of the service as reported by GET /health.
+
+        :return: The status, the kind and number of workers and the queue size.
+        :rtype: dict[str, Any]
+        """
+        return {
+            'status': 'ok',
+            'executor': self.executor,
+            'workers': self.workers,
+            'queue_size': self.queue_size,
+            'default_template': self.default_template is not None,
+        }
+
+    def close(self) -> None:
+        """
+        Stops the workers, cancelling the requests waiting for one.
+
+        :return: None
+        """
+        with self._executor_lock:
+            self._executor.shutdown(cancel_futures=True)
+
+
+class _StatementsRequestHandler(BaseHTTPRequestHandler):
+    server: 'StatementsServer'
+
+    def _send(
+        self, status: int, content_type: str, body: bytes, headers: dict[str, str] | None = None
+    ) -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: dict[str, Any]) -> None:
+        self._send(status, 'application/json', json.dumps(data, ensure_ascii=False).encode())
+
+    def _send_error(self, error: ServiceRequestError) -> None:
+        self._send_json(error.status, {'error': error.message})
+
+    def _read_body(self) -> bytes:
+        content_length = self.headers.get('Content-Length')
+        if content_length is None:
+            raise ServiceRequestError(HTTPStatus.LENGTH_REQUIRED, 'Content-Length is required')
+        if not content_length.isdigit():
+            raise ServiceRequestError(HTTPStatus.BAD_REQUEST, 'Malformed Content-Length')
+        if int(content_length) > MAX_REQUEST_BYTES:
+            raise ServiceRequestError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f'The request must not exceed {MAX_REQUEST_BYTES} bytes',
+            )
+
+        return self.rfile.read(int(content_length))
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != HEALTH_PATH:
+            self._send_error(ServiceRequestError(HTTPStatus.NOT_FOUND, 'Not found'))
+            return
+
+        self._send_json(HTTPStatus.OK, self.server.service.get_health())
+
+    def do_POST(self) -> None:
+        if urlsplit(self.path).path != STATEMENTS_PATH:
+            self.close_connection = True
+            self._send_error(ServiceRequestError(HTTPStatus.NOT_FOUND, 'Not found'))
+            return
+
+        try:
+            with self.server.service.reserve_slot():
+                body = self._read_body()
+                statements_request = parse_statements_request(
+                    self.headers.get('Content-Type', ''), body
+                )
+                archive = self.server.service.build_archive(statements_request)
+        except ServiceRequestError as e:
+            self.close_connection = True
+            self._send_error(e)
+            return
+        except OUTPUT_ERRORS as e:
+            self._send_error(
+                ServiceRequestError(
+                    HTTPStatus.INTERNAL_SERVER_ERROR, report_utils.describe_error(e)
+                )
+            )
+            return
+
+        self._send(
+            HTTPStatus.OK,
+            'application/zip',
+            archive,
+            {'Content-Disposition': f'attachment; filename="{ARCHIVE_FILE_NAME}"'},
+        )
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class StatementsServer(ThreadingHTTPServer):
+    """
+    The HTTP server of the statements service, listening on the loopback interface only.
+
+    Every connection is handled in its own thread, which waits for a worker of the service.
+
+    Attributes:
+        service: The service building the archives.
+        quiet: Whether to log requests to stderr.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, service: StatementsService, port: int, quiet: bool = False) -> None:
+        """
+        Binds the server to a port of the loopback interface.
+
+        :param service: The service building the archives; it is closed with the server.
+        :type service: StatementsService
+        :param port: The port to listen on, or 0 for any free port.
+        :type port: int
+        :param quiet: Whether to log requests to stderr (default is False).
+        :type quiet: bool
+        """
+        self.service = service
+        self.quiet = quiet
+        super().__init__((SERVICE_HOST, port), _StatementsRequestHandler)
+
+    def server_close(self) -> None:
+        """
+        Closes the socket and stops the service's workers.
+
+        :return: None
+        """
+        super().server_close()
+        self.service.close()
+
+
+def make_statements_server(
+    port: int = DEFAULT_SERVICE_PORT,
+    default_template: BINARY_SOURCE_TYPE | None = None,
+    workers: int = 1,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    executor: str = PROCESS_SERVICE_EXECUTOR,
+    quiet: bool = False,
+) -> StatementsServer:
+    """
+    Creates a statements server with its workers, ready to serve_forever.
+
+    :param port: The port to listen on, or 0 for any free port (default is DEFAULT_SERVICE_PORT).
+    :type port: int
+    :param default_template: The default template's path, content or binary stream, or None to
+        require a template in every request (default is None).
+    :type default_template: BINARY_SOURCE_TYPE | None
+    :param workers: The number of workers building archives (default is 1).
+    :type workers: int
+    :param queue_size: The number of accepted requests waiting for a free worker.
+    :type queue_size: int
+    :param executor: The kind of workers (default is PROCESS_SERVICE_EXECUTOR).
+    :type executor: str
+    :param quiet: Whether to log requests to stderr (default is False).
+    :type quiet: bool
+    :raises template_utils.TemplateError: If the default template's anchors are malformed.
+    :raises OSError: If the port cannot be bound.
+    :return: The server; server_close stops its workers.
+    :rtype: StatementsServer
+    """
+    service = StatementsService(default_template, workers, queue_size, executor)
+    try:
+        return StatementsServer(service, port, quiet)
+    except BaseException:
+        service.close()
+        raise
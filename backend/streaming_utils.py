@@ -0,0 +1,95 @@
+"""
+Module for streaming items from a producer to a consumer through a bounded queue.
+
+The producer iterable runs in a background thread and puts its items into a queue of limited size,
+while the consumer takes them out as a regular iterator. The producer therefore never gets more than
+a queue's worth of items ahead of the consumer, which keeps memory flat however many items there are.
+
+Classes:
+- ProducerError: An error raised in the consumer when the producer failed.
+
+Functions:
+- iter_through_bounded_queue: Iterates over items produced in a background thread.
+
+Dependencies:
+- queue, threading: For the bounded queue and stopping the producer.
+- concurrent.futures: For running the producer and capturing its failure.
+"""
+
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+DEFAULT_QUEUE_SIZE = 64
+QUEUE_POLL_INTERVAL = 0.1
+
+_END_OF_STREAM = object()
+
+
+class ProducerError(Exception):
+    """
+    An error raised in the consumer when producing an item failed.
+
+    The original error of the producer is available as __cause__.
+    """
+
+
+class _ProducerFailure:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def iter_through_bounded_queue(
+    items: Iterable[Any],
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> Iterator[Any]:
+    """
+    Iterates over items produced by an iterable running in a background thread.
+
+    If the consumer stops early, the producer is stopped as soon as it tries to put its next item.
+    Errors that are not exceptions, such as SystemExit, are raised in the consumer as they are.
+
+    :param items: The producer iterable.
+    :type items: Iterable[Any]
+    :param queue_size: The maximum number of produced items waiting for the consumer.
+    :type queue_size: int
+    :raises ProducerError: If the producer iterable raised an exception.
+    :return: An iterator over the produced items in order.
+    :rtype: Iterator[Any]
+    """
+    items_queue = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                items_queue.put(item, timeout=QUEUE_POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def produce() -> None:
+        for item in items:
+            if not put(item):
+                return
+        put(_END_OF_STREAM)
+
+    def hand_over_failure(producer_future: Future) -> None:
+        # The future captures any BaseException of the producer, which the consumer waits for
+        if (error := producer_future.exception()) is not None:
+            put(_ProducerFailure(error))
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='streaming-producer') as executor:
+        executor.submit(produce).add_done_callback(hand_over_failure)
+        try:
+            while (item := items_queue.get()) is not _END_OF_STREAM:
+                if isinstance(item, _ProducerFailure):
+                    if not isinstance(item.error, Exception):
+                        raise item.error
+                    raise ProducerError(str(item.error)) from item.error
+                yield item
+        finally:
+            stopped.set()
@@ -0,0 +1,176 @@
+"""
+Module compiling statement templates into anchors of the paragraphs and tables to fill.
+
+A template marks the elements to fill either with "{{field}}" markers in their text or with Word
+bookmarks named by the field, e.g. "{{full_name}}" in the paragraph receiving the student's name or
+a "regular_disciplines" bookmark in the regular disciplines table. Templates without any anchors
+are compiled with the fixed paragraph and table positions of the original statement template.
+Templates are compiled and validated once, so a malformed template fails before any statement is
+rendered.
+
+Functions:
+- get_element_text: Returns the text of all runs inside an element.
+- compile_template: Finds and validates the anchors of a template body.
+
+Dependencies:
+- python-docx: For the WordprocessingML namespace.
+- re: For finding markers.
+- backend.classes.template_anchors: The TemplateAnchors class.
+"""
+
+import dataclasses
+import re
+from collections import Counter
+from typing import Any
+
+from docx.oxml.ns import qn
+
+from backend.classes.template_anchors import TemplateAnchors
+
+PARAGRAPH_ANCHORS = (
+    'full_name',
+    'study_period',
+    'speciality',
+    'speciality_area',
+    'diploma_theme',
+    'statement_date',
+)
+TABLE_ANCHORS = ('regular_disciplines', 'course_disciplines', 'practice_disciplines')
+LEGACY_PARAGRAPH_INDICES = {
+    'full_name': 5,
+    'study_period': 10,
+    'speciality': 11,
+    'speciality_area': 12,
+    'diploma_theme': 19,
+    'statement_date': 31,
+}
+LEGACY_TABLE_INDICES = {
+    'regular_disciplines': 0,
+    'course_disciplines': 1,
+    'practice_disciplines': 2,
+}
+TABLE_COLUMNS_COUNT = 3
+MARKER_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+
+class TemplateError(Exception):
+    """
+    An error raised when a statement template lacks, duplicates or misplaces an anchor.
+    """
+
+
+def get_element_text(element: Any) -> str:
+    """
+    Returns the text of all runs inside an element, ignoring how it is split into runs.
+
+    :param element: A paragraph, a table or any other WordprocessingML element.
+    :type element: Any
+    :return: The concatenated text.
+    :rtype: str
+    """
+    return ''.join(text_element.text or '' for text_element in element.iter(qn('w:t')))
+
+
+def _get_anchors_names(element: Any) -> list[str]:
+    marker_names = MARKER_PATTERN.findall(get_element_text(element))
+    bookmark_names = [
+        bookmark.get(qn('w:name'))
+        for bookmark in element.iter(qn('w:bookmarkStart'))
+        if bookmark.get(qn('w:name')) in (*PARAGRAPH_ANCHORS, *TABLE_ANCHORS)
+    ]
+    return marker_names + bookmark_names
+
+
+def _strip_markers(table: Any) -> None:
+    """
+    Removes markers from the cells of a table, keeping the rest of their text.
+
+    A paragraph whose marker is split across runs gets its whole text in its first run.
+    """
+    for paragraph in table.iter(qn('w:p')):
+        text_elements = list(paragraph.iter(qn('w:t')))
+        text = ''.join(text_element.text or '' for text_element in text_elements)
+        if MARKER_PATTERN.search(text) is None:
+            continue
+
+        text_elements[0].text = MARKER_PATTERN.sub('', text)
+        for text_element in text_elements[1:]:
+            text_element.text = ''
+
+
+def _get_legacy_anchors(body_elements: list[Any]) -> dict[str, int]:
+    paragraphs_indices = [i for i, element in enumerate(body_elements) if element.tag == qn('w:p')]
+    tables_indices = [i for i, element in enumerate(body_elements) if element.tag == qn('w:tbl')]
+    has_legacy_paragraphs = len(paragraphs_indices) > max(LEGACY_PARAGRAPH_INDICES.values())
+    has_legacy_tables = len(tables_indices) > max(LEGACY_TABLE_INDICES.values())
+    if not has_legacy_paragraphs or not has_legacy_tables:
+        raise TemplateError(
+            'The template has no {{field}} anchors and does not have the paragraphs and tables '
+            f'of the standard statement template: {len(paragraphs_indices)} paragraphs and '
+            f'{len(tables_indices)} tables found'
+        )
+
+    return {
+        **{name: paragraphs_indices[index] for name, index in LEGACY_PARAGRAPH_INDICES.items()},
+        **{name: tables_indices[index] for name, index in LEGACY_TABLE_INDICES.items()},
+    }
+
+
+def compile_template(body: Any) -> TemplateAnchors:
+    """
+    Finds and validates the anchors of a template body, removing markers from anchored tables.
+
+    Anchored paragraphs are cleared when they are filled, so their markers are left in place.
+
+    :param body: The body element of the template document; markers in tables are removed from it.
+    :type body: Any
+    :raises TemplateError: If an anchor is unknown, missing, duplicated or placed in the wrong kind
+        of element, if the template has no anchors and does not match the standard template, or if
+        an anchored table does not have exactly three columns.
+    :return: The compiled anchors.
+    :rtype: TemplateAnchors
+    """
+    body_elements = list(body)
+    anchors: dict[str, int] = {}
+    anchors_counts: Counter[str] = Counter()
+    for i, element in enumerate(body_elements):
+        if element.tag not in (qn('w:p'), qn('w:tbl')):
+            continue
+
+        names = dict.fromkeys(_get_anchors_names(element))
+        for name in names:
+            if name not in PARAGRAPH_ANCHORS and name not in TABLE_ANCHORS:
+                raise TemplateError(f'Unknown template anchor: {{{{{name}}}}}')
+            if element.tag == qn('w:p') and name not in PARAGRAPH_ANCHORS:
+                raise TemplateError(f'The anchor "{name}" must be placed inside a table')
+            if element.tag == qn('w:tbl') and name not in TABLE_ANCHORS:
+                raise TemplateError(f'The anchor "{name}" must be placed outside tables')
+
+            anchors_counts[name] += 1
+            anchors[name] = i
+
+        if element.tag == qn('w:tbl') and names:
+            _strip_markers(element)
+
+    duplicated_anchors = [name for name, count in anchors_counts.items() if count > 1]
+    if duplicated_anchors:
+        raise TemplateError('Duplicated template anchors: ' + ', '.join(duplicated_anchors))
+
+    if not anchors:
+        anchors = _get_legacy_anchors(body_elements)
+
+    missing_anchors = [
+        field.name for field in dataclasses.fields(TemplateAnchors) if field.name not in anchors
+    ]
+    if missing_anchors:
+        raise TemplateError('Missing template anchors: ' + ', '.join(missing_anchors))
+
+    for name in TABLE_ANCHORS:
+        columns_count = len(body_elements[anchors[name]].tblGrid.gridCol_lst)
+        if columns_count != TABLE_COLUMNS_COUNT:
+            raise TemplateError(
+                f'The table "{name}" must have {TABLE_COLUMNS_COUNT} columns, '
+                f'{columns_count} found'
+            )
+
+    return TemplateAnchors(**anchors)
@@ -0,0 +1,66 @@
+"""
+Benchmark comparing the memory held by DisciplineConfig and CompactDisciplineConfig objects.
+
+The raw statistics of a synthetic cohort are transformed into discipline configurations with both
+variants, and the memory retained by the result is measured with tracemalloc.
+
+Usage:
+    python -m benchmarks.bench_compact_configs [students_count] [semesters_count] [disciplines_count]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from backend.data_utils import get_students_stats_with_discipline_configs
+from backend.pandas_utils import get_students_stats_raw, join_dfs, map_dfs_columns
+from benchmarks.synthetic import make_semester_df
+
+DEFAULT_STUDENTS_COUNT = 10_000
+DEFAULT_SEMESTERS_COUNT = 8
+DEFAULT_DISCIPLINES_COUNT = 12
+
+
+def measure(students_stats_raw: list, compact: bool) -> tuple[int, float]:
+    """
+    Returns the memory retained by the discipline configurations in bytes and the build time.
+    """
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    result = get_students_stats_with_discipline_configs(students_stats_raw, compact=compact)
+    elapsed_time = time.perf_counter() - start_time
+    retained_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return retained_memory, elapsed_time
+
+
+def main() -> None:
+    students_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS_COUNT
+    semesters_count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SEMESTERS_COUNT
+    disciplines_count = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_DISCIPLINES_COUNT
+
+    rng = random.Random(0)
+    students_full_names = [f'Студент {i + 1}' for i in range(students_count)]
+    semester_dfs = [
+        make_semester_df(rng, students_full_names, semester, disciplines_count, 0.05, 0.1, 0.3)
+        for semester in range(1, semesters_count + 1)
+    ]
+    students_stats_raw = get_students_stats_raw(join_dfs(map_dfs_columns(semester_dfs)))
+
+    regular_memory, regular_time = measure(students_stats_raw, compact=False)
+    compact_memory, compact_time = measure(students_stats_raw, compact=True)
+
+    print(f"students: {students_count}, disciplines: {semesters_count * disciplines_count}")
+    print(f"DisciplineConfig:        {regular_memory / 2**20:8.1f} MiB {regular_time:8.3f} s")
+    print(f"CompactDisciplineConfig: {compact_memory / 2**20:8.1f} MiB {compact_time:8.3f} s")
+    print(
+        f"memory per 10k students: {regular_memory / students_count * 10_000 / 2**20:.1f} MiB"
+        f" -> {compact_memory / students_count * 10_000 / 2**20:.1f} MiB"
+    )
+    print(f"reduction: {1 - compact_memory / regular_memory:.0%}")
+
+
+if __name__ == '__main__':
+    main()
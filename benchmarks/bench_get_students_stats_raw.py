@@ -0,0 +1,66 @@
+"""
+Benchmark comparing the row-by-row and the bulk implementations of get_students_stats_raw.
+
+Usage:
+    python -m benchmarks.bench_get_students_stats_raw [students_count] [disciplines_count]
+"""
+
+import random
+import sys
+import timeit
+
+import pandas
+from pandas import DataFrame
+
+from backend.custom_typing import STUDENTS_STATS_RAW_TYPE
+from backend.pandas_utils import get_students_stats_raw
+
+DEFAULT_STUDENTS_COUNT = 10_000
+DEFAULT_DISCIPLINES_COUNT = 300
+REPEATS = 3
+
+
+def get_students_stats_raw_iterrows(
+    df: DataFrame, set_index: str = "ФИО"
+) -> STUDENTS_STATS_RAW_TYPE:
+    """
+    The previous row-by-row implementation of get_students_stats_raw, kept as a reference.
+    """
+    dfs_divided_by_full_name = [row.to_frame().T.reset_index(drop=True) for _, row in df.iterrows()]
+    return [df.set_index(set_index).to_dict(orient='index') for df in dfs_divided_by_full_name]
+
+
+def make_joined_df(students_count: int, disciplines_count: int) -> DataFrame:
+    """
+    Builds a joined semester DataFrame with random marks.
+    """
+    rng = random.Random(0)
+    data = {"ФИО": [f"Студент {i}" for i in range(students_count)]}
+    for i in range(disciplines_count):
+        semester = i % 8 + 1
+        data[f"{semester}.Дисциплина {i}/120:4:ЭК"] = [
+            rng.randint(4, 10) for _ in range(students_count)
+        ]
+    return pandas.DataFrame(data)
+
+
+def main() -> None:
+    students_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS_COUNT
+    disciplines_count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_DISCIPLINES_COUNT
+    df = make_joined_df(students_count, disciplines_count)
+
+    assert get_students_stats_raw(df) == get_students_stats_raw_iterrows(df)
+
+    iterrows_time = min(
+        timeit.repeat(lambda: get_students_stats_raw_iterrows(df), number=1, repeat=REPEATS)
+    )
+    bulk_time = min(timeit.repeat(lambda: get_students_stats_raw(df), number=1, repeat=REPEATS))
+
+    print(f"students: {students_count}, disciplines: {disciplines_count}")
+    print(f"iterrows: {iterrows_time:.3f} s")
+    print(f"bulk:     {bulk_time:.3f} s")
+    print(f"speedup:  {iterrows_time / bulk_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark comparing the pairwise merge join of semester files with the indexed k-way join.
+
+Semester DataFrames of a synthetic cohort are generated in memory, with a few students missing from
+every semester and rows in a different order in every file, and both joins (including the renaming
+of columns) are timed. The results are checked to be equal.
+
+Usage:
+    python -m benchmarks.bench_join [students_count] [semesters_count] [disciplines_count]
+"""
+
+import random
+import sys
+import time
+
+from backend.pandas_utils import (
+    get_students_dropped_by_join,
+    join_dfs,
+    join_dfs_indexed,
+    map_dfs_columns,
+)
+from benchmarks.synthetic import make_semester_df
+
+DEFAULT_STUDENTS_COUNT = 2_000
+DEFAULT_SEMESTERS_COUNT = 10
+DEFAULT_DISCIPLINES_COUNT = 12
+DROPPED_SHARE = 0.005
+REPEAT = 5
+
+
+def measure(function, repeat: int = REPEAT):
+    """
+    Returns the best time of a function in seconds and its result.
+    """
+    best_time = float('inf')
+    result = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = function()
+        best_time = min(best_time, time.perf_counter() - start_time)
+    return best_time, result
+
+
+def main() -> None:
+    students_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS_COUNT
+    semesters_count = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SEMESTERS_COUNT
+    disciplines_count = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_DISCIPLINES_COUNT
+
+    rng = random.Random(0)
+    students_full_names = [f'Студент {i + 1}' for i in range(students_count)]
+    semester_dfs = [
+        make_semester_df(rng, students_full_names, semester, disciplines_count, 0.05, 0.1, 0.3)
+        .sample(frac=1 - DROPPED_SHARE, random_state=semester)
+        .reset_index(drop=True)
+        for semester in range(1, semesters_count + 1)
+    ]
+
+    merge_time, merged_df = measure(lambda: join_dfs(map_dfs_columns(semester_dfs)))
+    indexed_time, indexed_df = measure(lambda: join_dfs_indexed(map_dfs_columns(semester_dfs)))
+    assert indexed_df.equals(merged_df)
+
+    dropped_students = get_students_dropped_by_join(semester_dfs, indexed_df)
+    print(f"students: {students_count}, semesters: {semesters_count}")
+    print(f"joined: {len(indexed_df)}, dropped: {len(dropped_students)}")
+    print(f"pairwise merge: {merge_time * 1000:8.1f} ms")
+    print(f"indexed join:   {indexed_time * 1000:8.1f} ms")
+    print(f"speedup: {merge_time / indexed_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Load test of the statements service uploading a synthetic cohort many times concurrently.
+
+Unless a URL is given, a service is started in the same process on a free port with the cohort's
+template as its default one. The cohort is uploaded the given number of times by the given number of
+concurrent clients, and the throughput, the latency percentiles and the counts of response statuses
+are reported. The first request is sent alone beforehand and reported separately, so the warm
+latency is not mixed with the cold one.
+
+Usage:
+    python -m benchmarks.load_test [--url URL] [--requests N] [--concurrency N] [--workers N]
+        [--queue-size N] [--executor process|thread] [--students N] [--semesters N]
+        [--disciplines N]
+"""
+
+import argparse
+import http.client
+import statistics
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from backend import service_utils
+from benchmarks.synthetic import write_synthetic_cohort
+
+DEFAULT_REQUESTS = 20
+DEFAULT_CONCURRENCY = 4
+REQUEST_TIMEOUT = 600
+
+REQUEST_FIELDS = [
+    ('speciality_name', 'Программное обеспечение информационных технологий'),
+    ('speciality_code', '1-40 01 01'),
+    ('speciality_area_name', 'Программирование'),
+    ('speciality_area_code', '1-40 01 01 01'),
+    ('start_date', '2020-09-01'),
+    ('end_date', '2024-06-30'),
+    ('statement_date', '2024-07-01'),
+]
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def send_request(url: str, content_type: str, body: bytes) -> tuple[int, float]:
+    """
+    Sends a POST /statements request and reads the whole response.
+
+    :param url: The http or https URL of the statements endpoint.
+    :param content_type: The Content-Type header of the request.
+    :param body: The multipart/form-data body.
+    :raises ValueError: If the URL is not an http or https one.
+    :return: The response status and the latency in seconds.
+    """
+    split_url = urllib.parse.urlsplit(url)
+    if split_url.scheme == 'http':
+        connection_class = http.client.HTTPConnection
+    elif split_url.scheme == 'https':
+        connection_class = http.client.HTTPSConnection
+    else:
+        raise ValueError(f'Not an http or https URL: {url}')
+
+    path = urllib.parse.urlunsplit(('', '', split_url.path or '/', split_url.query, ''))
+    connection = connection_class(split_url.netloc, timeout=REQUEST_TIMEOUT)
+    start = time.perf_counter()
+    try:
+        connection.request('POST', path, body=body, headers={'Content-Type': content_type})
+        response = connection.getresponse()
+        response.read()
+        status = response.status
+    finally:
+        connection.close()
+
+    return status, time.perf_counter() - start
+
+
+def _get_percentile(values: list[float], percentile: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+
+    return statistics.quantiles(values, n=100, method='inclusive')[percentile - 1]
+
+
+def run_load_test(
+    url: str, content_type: str, body: bytes, requests_count: int, concurrency: int
+) -> dict[str, float | dict[int, int]]:
+    """
+    Sends one cold request, then the given number of requests from concurrent clients.
+
+    :param url: The URL of the statements endpoint.
+    :param content_type: The Content-Type header of the requests.
+    :param body: The multipart/form-data body uploaded by every request.
+    :param requests_count: The number of concurrent requests.
+    :param concurrency: The number of concurrent clients.
+    :return: The cold latency, the throughput, the latency percentiles of successful requests and
+        the counts of response statuses.
+    """
+    cold_status, cold_latency = send_request(url, content_type, body)
+    if cold_status != 200:
+        raise RuntimeError(f'The first request failed with status {cold_status}')
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(
+            executor.map(lambda _: send_request(url, content_type, body), range(requests_count))
+        )
+    wall_time = time.perf_counter() - start
+
+    latencies = sorted(latency for status, latency in results if status == 200)
+    return {
+        'cold_latency': cold_latency,
+        'requests_per_second': len(latencies) / wall_time,
+        'p50_latency': _get_percentile(latencies, 50),
+        'p95_latency': _get_percentile(latencies, 95),
+        'statuses': dict(Counter(status for status, _ in results)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Load tests the statements service.')
+    parser.add_argument('--url', help='The statements endpoint (default is an in-process service).')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--queue-size', type=int, default=service_utils.DEFAULT_QUEUE_SIZE)
+    parser.add_argument(
+        '--executor',
+        choices=[service_utils.PROCESS_SERVICE_EXECUTOR, service_utils.THREAD_SERVICE_EXECUTOR],
+        default=service_utils.PROCESS_SERVICE_EXECUTOR,
+    )
+    parser.add_argument('--students', type=int, default=30)
+    parser.add_argument('--semesters', type=int, default=8)
+    parser.add_argument('--disciplines', type=int, default=12)
+    args = parser.parse_args()
+    if args.url is not None and urllib.parse.urlsplit(args.url).scheme not in ('http', 'https'):
+        parser.error('--url must be an http or https URL')
+
+    with tempfile.TemporaryDirectory() as directory_path:
+        cohort = write_synthetic_cohort(
+            directory_path, args.students, args.semesters, args.disciplines
+        )
+        content_type, body = service_utils.encode_multipart_form_data(
+            REQUEST_FIELDS,
+            [
+                (service_utils.SEMESTER_FILE_FIELD, f'semester_{i + 1}.xlsx', _read_file(path))
+                for i, path in enumerate(cohort.semester_files_paths)
+            ]
+            + [
+                (
+                    service_utils.THEMES_FILE_FIELD,
+                    'themes.xlsx',
+                    _read_file(cohort.diploma_file_path),
+                )
+            ],
+        )
+
+        server = None
+        url = args.url
+        if url is None:
+            server = service_utils.make_statements_server(
+                0,
+                _read_file(cohort.template_file_path),
+                args.workers,
+                args.queue_size,
+                args.executor,
+                quiet=True,
+            )
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            host, port = server.server_address[:2]
+            url = f'http://{host}:{port}{service_utils.STATEMENTS_PATH}'
+
+        try:
+            results = run_load_test(url, content_type, body, args.requests, args.concurrency)
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+    print(f'students per request: {cohort.students_count}')
+    print(f'cold request: {results["cold_latency"]:.3f} s')
+    print(f'throughput: {results["requests_per_second"]:.2f} requests/s')
+    print(f'p50 latency: {results["p50_latency"]:.3f} s')
+    print(f'p95 latency: {results["p95_latency"]:.3f} s')
+    print('statuses: ' + ', '.join(f'{s}: {n}' for s, n in sorted(results['statuses'].items())))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+"""
+Benchmark suite timing every stage of the statements pipeline on a synthetic cohort.
+
+A synthetic cohort is generated with benchmarks.synthetic, then every stage (reading workbooks,
+mapping and joining them, each data_utils transformation, building statements and writing the
+average marks workbook) is run several times and the best time is reported. Results can be saved as
+a baseline JSON file and later runs compared against it, so a regression in any stage is visible.
+
+Usage:
+    python -m benchmarks.run_benchmarks [--students N] [--semesters N] [--disciplines N]
+        [--repeat N] [--save-baseline [PATH]] [--compare [PATH]] [--threshold RATIO]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from typing import Any
+
+from backend import data_utils, docx_utils, pandas_utils, ranking_utils
+from backend.classes.common_config import CommonConfig
+from backend.runtime import FULL_NAME_COLUMN
+from benchmarks.synthetic import write_synthetic_cohort
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'results', 'baseline.json')
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 1.25
+
+COMMON_CONFIG = CommonConfig(
+    start_date_day='01',
+    start_date_month='сентября',
+    start_date_year='20',
+    end_date_day='30',
+    end_date_month='июня',
+    end_date_year='24',
+    speciality_code='1-40 01 01',
+    speciality_name='Программное обеспечение информационных технологий',
+    speciality_area_code='1-40 01 01 01',
+    speciality_area_name='Программирование',
+    statement_date_day='01',
+    statement_date_month='июля',
+    statement_date_year='2024',
+)
+
+
+def _time_stage(function: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    best_time = float('inf')
+    result = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = function()
+        best_time = min(best_time, time.perf_counter() - start_time)
+    return best_time, result
+
+
+def run_benchmarks(
+    students_count: int,
+    semesters_count: int,
+    disciplines_per_semester: int,
+    repeat: int = DEFAULT_REPEAT,
+    statements_workers: int = 1,
+) -> dict[str, float]:
+    """
+    Generates a synthetic cohort and times every stage of the pipeline.
+
+    :return: The best time in seconds of every stage, in pipeline order.
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory_path:
+        cohort = write_synthetic_cohort(
+            os.path.join(directory_path, 'input'),
+            students_count=students_count,
+            semesters_count=semesters_count,
+            disciplines_per_semester=disciplines_per_semester,
+        )
+        save_directory_path = os.path.join(directory_path, 'output')
+        os.makedirs(save_directory_path)
+
+        def stage(name: str, function: Callable[[], Any]) -> Any:
+            results[name], result = _time_stage(function, repeat)
+            print(f'{name:<48} {results[name]:>10.3f} s', flush=True)
+            return result
+
+        dfs = stage(
+            'read_xlsx',
+            lambda: [pandas_utils.read_xlsx(path) for path in cohort.semester_files_paths],
+        )
+        diploma_themes_df = stage(
+            'read_xlsx (diploma themes)',
+            lambda: pandas_utils.read_xlsx(cohort.diploma_file_path),
+        )
+        mapped_dfs = stage('map_dfs_columns', lambda: pandas_utils.map_dfs_columns(dfs))
+        stage('join_dfs', lambda: pandas_utils.join_dfs(mapped_dfs))
+        joined_df = stage('join_dfs_indexed', lambda: pandas_utils.join_dfs_indexed(mapped_dfs))
+        non_aggregated_data = stage(
+            'get_students_stats_raw', lambda: pandas_utils.get_students_stats_raw(joined_df)
+        )
+        data_with_configs = stage(
+            'get_students_stats_with_discipline_configs',
+            lambda: data_utils.get_students_stats_with_discipline_configs(non_aggregated_data),
+        )
+        data_with_avg_marks = stage(
+            'get_students_with_avg_mark',
+            lambda: data_utils.get_students_with_avg_mark(data_with_configs),
+        )
+        stage('get_students_ranking', lambda: ranking_utils.get_students_ranking(joined_df))
+        cohort_plan = data_utils.get_cohort_plan(
+            column for column in joined_df.columns if column != FULL_NAME_COLUMN
+        )
+        data_with_grouped_configs = stage(
+            'grouped_by_category',
+            lambda: data_utils.get_students_stats_with_discipline_configs_grouped_by_category(
+                data_with_configs, cohort_plan
+            ),
+        )
+        data_summarized = stage(
+            'grouped_by_category_summarized',
+            lambda: (
+                data_utils.get_students_stats_with_discipline_configs_grouped_by_category_summarized(
+                    data_with_grouped_configs, cohort_plan
+                )
+            ),
+        )
+        data_ready = stage(
+            'get_students_configs',
+            lambda: data_utils.get_students_configs(data_summarized, diploma_themes_df),
+        )
+        stage(
+            'get_students_configs_with_avg_marks (fused)',
+            lambda: data_utils.get_students_configs_with_avg_marks(
+                pandas_utils.iter_students_stats_raw(joined_df), diploma_themes_df
+            ),
+        )
+        stage(
+            'build_statements',
+            lambda: docx_utils.build_statements(
+                cohort.template_file_path,
+                save_directory_path,
+                data_ready,
+                COMMON_CONFIG,
+                workers=statements_workers,
+            ),
+        )
+        stage(
+            'make_students_with_avg_mark_xlsx_file',
+            lambda: pandas_utils.make_students_with_avg_mark_xlsx_file(
+                data_with_avg_marks, save_directory_path
+            ),
+        )
+
+    results['total'] = sum(results.values())
+    print(f'{"total":<48} {results["total"]:>10.3f} s')
+    return results
+
+
+def save_baseline(baseline_path: str, parameters: dict[str, Any], results: dict[str, float]):
+    """
+    Saves benchmark results together with the parameters and the environment they were taken in.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+    with open(baseline_path, 'w', encoding='utf-8') as file:
+        json.dump(
+            {
+                'parameters': parameters,
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'results': results,
+            },
+            file,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def compare_with_baseline(
+    baseline_path: str,
+    parameters: dict[str, Any],
+    results: dict[str, float],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> bool:
+    """
+    Prints the ratio of every stage's time to the baseline and reports regressions.
+
+    :return: True if no stage is slower than the baseline by more than the threshold ratio.
+    """
+    with open(baseline_path, encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    if baseline['parameters'] != parameters:
+        print(f'warning: baseline parameters differ: {baseline["parameters"]}')
+
+    passed = True
+    print(f'\n{"stage":<48} {"baseline":>10} {"current":>10} {"ratio":>8}')
+    for name, current_time in results.items():
+        baseline_time = baseline['results'].get(name)
+        if baseline_time is None:
+            print(f'{name:<48} {"-":>10} {current_time:>10.3f} {"-":>8}')
+            continue
+
+        ratio = current_time / baseline_time if baseline_time else float('inf')
+        regressed = ratio > threshold
+        passed = passed and not regressed
+        print(
+            f'{name:<48} {baseline_time:>10.3f} {current_time:>10.3f} {ratio:>7.2f}x'
+            + (' REGRESSION' if regressed else '')
+        )
+
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Times every stage of the statements pipeline.')
+    parser.add_argument('--students', type=int, default=300)
+    parser.add_argument('--semesters', type=int, default=8)
+    parser.add_argument('--disciplines', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--statements-workers', type=int, default=1)
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE_PATH)
+    parser.add_argument('--compare', nargs='?', const=DEFAULT_BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    parameters = {
+        'students': args.students,
+        'semesters': args.semesters,
+        'disciplines': args.disciplines,
+        'statements_workers': args.statements_workers,
+    }
+    results = run_benchmarks(
+        args.students,
+        args.semesters,
+        args.disciplines,
+        repeat=args.repeat,
+        statements_workers=args.statements_workers,
+    )
+
+    if args.save_baseline:
+        save_baseline(args.save_baseline, parameters, results)
+
+    if args.compare and not compare_with_baseline(
+        args.compare, parameters, results, args.threshold
+    ):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
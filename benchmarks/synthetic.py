@@ -0,0 +1,213 @@
+"""
+Synthetic cohort generator for benchmarking the statements pipeline at production scale.
+
+It writes realistic semester workbooks (with a configurable mix of exams, credits, practices, course
+works and course projects, and disciplines repeated across semesters), a diploma themes workbook and
+a statement template with the layout expected by backend.docx_utils.
+
+Usage:
+    python -m benchmarks.synthetic <directory> [--students N] [--semesters N] [--disciplines N]
+"""
+
+import argparse
+import os
+import random
+from dataclasses import dataclass
+
+import pandas
+from docx import Document
+
+EXAM_CONTROL_FORM = 'ЭК'
+CREDIT_CONTROL_FORM = 'ЗЧ'
+PRACTICE_CONTROL_FORM = 'ПР'
+COURSE_PROJECT_CONTROL_FORM = 'КП'
+COURSE_WORK_CONTROL_FORM = 'КР'
+
+REPEATED_DISCIPLINES_NAMES = (
+    'Высшая математика',
+    'Физика',
+    'Иностранный язык',
+    'Физическая культура',
+    'Программирование',
+    'Философия',
+)
+
+TEMPLATE_PARAGRAPHS_TEXTS = {
+    0: 'МИНИСТЕРСТВО ОБРАЗОВАНИЯ РЕСПУБЛИКИ БЕЛАРУСЬ',
+    2: 'ВЫПИСКА',
+    3: 'из зачётно-экзаменационной ведомости',
+}
+TEMPLATE_PARAGRAPHS_COUNT = 33
+TEMPLATE_TABLES_AFTER_PARAGRAPHS = {
+    20: ('Наименование дисциплины', 'Количество часов (зачётных единиц)', 'Отметка'),
+    22: ('Курсовая работа (проект)', 'Количество часов (зачётных единиц)', 'Отметка'),
+    24: ('Вид практики', 'Количество часов (зачётных единиц)', 'Отметка'),
+}
+
+
+@dataclass
+class SyntheticCohort:
+    """
+    A class representing the files of a generated cohort.
+
+    Attributes:
+        semester_files_paths: Paths to the semester workbooks in chronological order.
+        diploma_file_path: Path to the diploma themes workbook.
+        template_file_path: Path to the statement template.
+        students_count: The number of students in the cohort.
+    """
+
+    semester_files_paths: list[str]
+    diploma_file_path: str
+    template_file_path: str
+    students_count: int
+
+
+def _get_control_form(rng: random.Random, practice_share: float, course_share: float) -> str:
+    value = rng.random()
+    if value < practice_share:
+        return PRACTICE_CONTROL_FORM
+    if value < practice_share + course_share / 2:
+        return COURSE_WORK_CONTROL_FORM
+    if value < practice_share + course_share:
+        return COURSE_PROJECT_CONTROL_FORM
+    return EXAM_CONTROL_FORM if rng.random() < 0.6 else CREDIT_CONTROL_FORM
+
+
+def make_semester_df(
+    rng: random.Random,
+    students_full_names: list[str],
+    semester: int,
+    disciplines_count: int,
+    practice_share: float,
+    course_share: float,
+    repeated_share: float,
+) -> pandas.DataFrame:
+    """
+    Builds a single semester's DataFrame with encoded discipline headers and random marks.
+    """
+    data = {'ФИО': students_full_names}
+    for i in range(disciplines_count):
+        control_form = _get_control_form(rng, practice_share, course_share)
+        if control_form == PRACTICE_CONTROL_FORM:
+            name = f'Практика {semester}.{i + 1}'
+        elif control_form == COURSE_WORK_CONTROL_FORM:
+            name = f'Курсовая работа {semester}.{i + 1}'
+        elif control_form == COURSE_PROJECT_CONTROL_FORM:
+            name = f'Курсовой проект {semester}.{i + 1}'
+        elif rng.random() < repeated_share:
+            name = REPEATED_DISCIPLINES_NAMES[i % len(REPEATED_DISCIPLINES_NAMES)]
+        else:
+            name = f'Дисциплина {semester}.{i + 1}'
+
+        study_hours = rng.choice((36, 54, 72, 90, 108, 120, 144))
+        credits_number = rng.choice((0, 1, 1.5, 2, 2.5, 3, 3.5, 4))
+        header = f'{name}/{study_hours}:{credits_number}:{control_form}'
+        if header in data:
+            header = f'{name} ({i + 1})/{study_hours}:{credits_number}:{control_form}'
+
+        if control_form == CREDIT_CONTROL_FORM:
+            data[header] = ['зч'] * len(students_full_names)
+        else:
+            data[header] = [rng.randint(4, 10) for _ in students_full_names]
+
+    return pandas.DataFrame(data)
+
+
+def write_template(template_file_path: str) -> None:
+    """
+    Writes a statement template with the paragraphs and tables layout expected by build_docx.
+    """
+    document = Document()
+    for i in range(TEMPLATE_PARAGRAPHS_COUNT):
+        document.add_paragraph(TEMPLATE_PARAGRAPHS_TEXTS.get(i, ''))
+        if i in TEMPLATE_TABLES_AFTER_PARAGRAPHS:
+            table = document.add_table(rows=1, cols=3)
+            for cell, header in zip(
+                table.rows[0].cells, TEMPLATE_TABLES_AFTER_PARAGRAPHS[i], strict=True
+            ):
+                cell.text = header
+
+    document.save(template_file_path)
+
+
+def write_synthetic_cohort(
+    directory_path: str,
+    students_count: int = 300,
+    semesters_count: int = 8,
+    disciplines_per_semester: int = 12,
+    practice_share: float = 0.05,
+    course_share: float = 0.1,
+    repeated_share: float = 0.3,
+    seed: int = 0,
+) -> SyntheticCohort:
+    """
+    Writes semester workbooks, a diploma themes workbook and a template into a directory.
+
+    :param directory_path: The directory to write the files to, created if missing.
+    :param students_count: The number of students.
+    :param semesters_count: The number of semester workbooks.
+    :param disciplines_per_semester: The number of discipline columns per semester.
+    :param practice_share: The share of practices among disciplines.
+    :param course_share: The share of course works and course projects among disciplines.
+    :param repeated_share: The share of regular disciplines named the same in several semesters.
+    :param seed: The seed of the random generator.
+    :return: The paths of the written files.
+    """
+    os.makedirs(directory_path, exist_ok=True)
+    rng = random.Random(seed)
+    students_full_names = [f'Студент {i + 1} Синтетический' for i in range(students_count)]
+
+    semester_files_paths = []
+    for semester in range(1, semesters_count + 1):
+        semester_df = make_semester_df(
+            rng,
+            students_full_names,
+            semester,
+            disciplines_per_semester,
+            practice_share,
+            course_share,
+            repeated_share,
+        )
+        semester_file_path = os.path.join(directory_path, f'semester_{semester}.xlsx')
+        semester_df.to_excel(semester_file_path, index=False)
+        semester_files_paths.append(semester_file_path)
+
+    diploma_file_path = os.path.join(directory_path, 'themes.xlsx')
+    pandas.DataFrame(
+        {
+            'ФИО': students_full_names,
+            'Тема дипломного проекта': [
+                f'Программное средство № {i + 1}' for i in range(students_count)
+            ],
+        }
+    ).to_excel(diploma_file_path, index=False)
+
+    template_file_path = os.path.join(directory_path, 'template.docx')
+    write_template(template_file_path)
+
+    return SyntheticCohort(
+        semester_files_paths, diploma_file_path, template_file_path, students_count
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Writes a synthetic cohort for benchmarking.')
+    parser.add_argument('directory')
+    parser.add_argument('--students', type=int, default=300)
+    parser.add_argument('--semesters', type=int, default=8)
+    parser.add_argument('--disciplines', type=int, default=12)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    write_synthetic_cohort(
+        args.directory,
+        students_count=args.students,
+        semesters_count=args.semesters,
+        disciplines_per_semester=args.disciplines,
+        seed=args.seed,
+    )
+
+
+if __name__ == '__main__':
+    main()
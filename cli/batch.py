@@ -0,0 +1,94 @@
+"""
+Command-line entry point building the statements of many cohorts described by a batch manifest.
+
+The manifest is a JSON or TOML file listing the cohorts (see backend.batch_utils). Cohorts are run
+across a pool of worker processes; a line is printed as every cohort finishes, followed by
+a consolidated table of statuses and timings, which is also written as JSON next to the manifest.
+
+Exit codes:
+    0: every cohort succeeded;
+    1: at least one cohort failed;
+    2: invalid command-line usage or an invalid manifest.
+
+Usage:
+    python -m cli.batch MANIFEST [--workers N] [--cache-directory DIR] [--report-file PATH]
+"""
+
+import multiprocessing
+import os
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from backend import batch_utils
+from backend.classes.cohort_report import CohortReport
+
+app = typer.Typer(add_completion=False)
+
+
+@app.command()
+def main(
+    manifest_file: Annotated[
+        Path, typer.Argument(exists=True, dir_okay=False, readable=True, resolve_path=True)
+    ],
+    workers: Annotated[
+        int | None,
+        typer.Option(min=1, help='Processes running cohorts (default is one per CPU core).'),
+    ] = None,
+    cache_directory: Annotated[
+        Path | None,
+        typer.Option(
+            file_okay=False,
+            help='Directory caching parsed workbooks (default is a temporary directory).',
+        ),
+    ] = None,
+    report_file: Annotated[
+        Path | None,
+        typer.Option(
+            dir_okay=False,
+            help=f'Path of the JSON batch report (default is {batch_utils.BATCH_REPORT_FILE_NAME} '
+            'next to the manifest).',
+        ),
+    ] = None,
+    quiet: Annotated[bool, typer.Option(help='Print only the consolidated table.')] = False,
+) -> None:
+    """
+    Builds the statements and the average marks files of every cohort of a batch manifest.
+    """
+    try:
+        cohorts = batch_utils.load_batch_manifest(str(manifest_file))
+    except batch_utils.BatchManifestError as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(2) from e
+
+    def on_cohort_done(cohort_report: CohortReport) -> None:
+        if not quiet:
+            typer.echo(
+                f'{cohort_report.name}: {batch_utils.get_cohort_status(cohort_report)} '
+                f'in {cohort_report.run_report.wall_time:.3f} s'
+            )
+
+    batch_report = batch_utils.run_batch(
+        cohorts,
+        workers=workers or os.cpu_count() or 1,
+        cache_directory_path=str(cache_directory) if cache_directory is not None else None,
+        on_cohort_done=on_cohort_done,
+    )
+
+    typer.echo(batch_utils.format_batch_summary(batch_report))
+    batch_utils.save_batch_report(
+        batch_report,
+        str(report_file or manifest_file.parent / batch_utils.BATCH_REPORT_FILE_NAME),
+    )
+
+    all_succeeded = all(
+        batch_utils.get_cohort_status(cohort_report) == batch_utils.RETURN_CODES_STATUSES[4]
+        for cohort_report in batch_report.cohorts
+    )
+    raise typer.Exit(0 if all_succeeded else 1)
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    app()
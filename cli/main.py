@@ -0,0 +1,224 @@
+"""
+Command-line entry point building the statements and the average marks file without the GUI.
+
+The run is described by options instead of the form fields, and its outcome is reported through
+the exit code, so the pipeline can be scripted and run headless on a server. After the run a table
+with the timings of every stage is printed. Pressing Ctrl+C stops the run cleanly after the current
+student.
+
+Exit codes:
+    0: the statements were built;
+    2: invalid command-line usage, including an input file that does not exist;
+    3: a semester file is malformed;
+    4: the diploma themes file is malformed;
+    5: the template is malformed or an output file could not be written;
+    130: the run was interrupted.
+
+Usage:
+    python -m cli.main --semester-file semester_1.xlsx --semester-file semester_2.xlsx \\
+        --themes-file themes.xlsx --template-file template.docx --output-directory output \\
+        --speciality-name NAME --speciality-code CODE \\
+        --speciality-area-name NAME --speciality-area-code CODE \\
+        --start-date 2020-09-01 --end-date 2024-06-30 [--statement-date 2024-07-05] \\
+        [--ingest-workers N] [--ingest-processes] [--statements-workers N] [--streaming] [--report] \\
+        [--ranking-column rank --ranking-column full_name --ranking-column weighted_avg_mark]
+"""
+
+import datetime
+import multiprocessing
+import signal
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Annotated, Any
+
+import typer
+
+from backend import docx_utils, ranking_utils, report_utils
+from backend.classes.run_report import RunReport
+from backend.runtime import (
+    DICT_DATA_ENGINE,
+    FUSED_DATA_ENGINE,
+    LONG_DATA_ENGINE,
+    PROCESS_INGEST_EXECUTOR,
+    THREAD_INGEST_EXECUTOR,
+    runtime,
+)
+
+RUNTIME_EXIT_CODES = {
+    1: 3,
+    2: 4,
+    3: 5,
+    4: 0,
+    5: 130,
+}
+RUNTIME_MESSAGES = {
+    1: 'Semester files are missing or malformed',
+    2: 'The diploma themes file is missing or malformed',
+    3: 'The template is malformed or an output file could not be written',
+    4: 'Statements were built',
+    5: 'The run was interrupted',
+}
+DATE_FORMATS = ['%Y-%m-%d', '%d.%m.%Y', '%d-%m-%Y']
+
+
+class DataEngine(str, Enum):
+    FUSED = FUSED_DATA_ENGINE
+    DICT = DICT_DATA_ENGINE
+    LONG = LONG_DATA_ENGINE
+
+
+RankingColumn = Enum(
+    'RankingColumn', {column.upper(): column for column in ranking_utils.RANKING_COLUMNS}, type=str
+)
+RankingMetric = Enum(
+    'RankingMetric', {metric.upper(): metric for metric in ranking_utils.RANKING_METRICS}, type=str
+)
+
+
+app = typer.Typer(add_completion=False)
+
+ExistingFile = Annotated[Path, typer.Option(exists=True, dir_okay=False, readable=True)]
+
+
+@app.command()
+def main(
+    semester_files: Annotated[
+        list[Path],
+        typer.Option(
+            '--semester-file',
+            exists=True,
+            dir_okay=False,
+            readable=True,
+            help='A semester file; repeat the option for every semester in chronological order.',
+        ),
+    ],
+    themes_file: ExistingFile,
+    template_file: ExistingFile,
+    output_directory: Annotated[
+        Path, typer.Option(exists=True, file_okay=False, writable=True, resolve_path=True)
+    ],
+    speciality_name: Annotated[str, typer.Option()],
+    speciality_code: Annotated[str, typer.Option()],
+    speciality_area_name: Annotated[str, typer.Option()],
+    speciality_area_code: Annotated[str, typer.Option()],
+    start_date: Annotated[datetime.datetime, typer.Option(formats=DATE_FORMATS)],
+    end_date: Annotated[datetime.datetime, typer.Option(formats=DATE_FORMATS)],
+    statement_date: Annotated[
+        datetime.datetime | None,
+        typer.Option(formats=DATE_FORMATS, help='The statement date (default is today).'),
+    ] = None,
+    ingest_workers: Annotated[
+        int | None,
+        typer.Option(min=1, help='Workers reading the workbooks (default is one per file).'),
+    ] = None,
+    ingest_processes: Annotated[
+        bool, typer.Option(help='Read the workbooks in worker processes instead of threads.')
+    ] = False,
+    statements_workers: Annotated[
+        int,
+        typer.Option(
+            min=1, help='Processes rendering the statements; ignored with --single-document.'
+        ),
+    ] = 1,
+    statements_chunk_size: Annotated[
+        int, typer.Option(min=1, help='Students handed to a statements process at once.')
+    ] = docx_utils.DEFAULT_CHUNK_SIZE,
+    data_engine: Annotated[DataEngine, typer.Option()] = DataEngine.FUSED,
+    streaming: Annotated[
+        bool, typer.Option(help='Write statements while the cohort is still being processed.')
+    ] = False,
+    single_document: Annotated[
+        bool, typer.Option(help='Write all statements into a single document.')
+    ] = False,
+    incremental: Annotated[
+        bool, typer.Option(help='Rebuild only statements whose data changed.')
+    ] = False,
+    ranking_columns: Annotated[
+        list[RankingColumn] | None,
+        typer.Option(
+            '--ranking-column',
+            help='A column of the average marks file; repeat the option for every column in order '
+            '(default is the full name and the average mark).',
+        ),
+    ] = None,
+    ranking_metric: Annotated[
+        RankingMetric, typer.Option(help='The average students are ranked by.')
+    ] = RankingMetric.AVG_MARK,
+    cache_directory: Annotated[
+        Path | None, typer.Option(file_okay=False, help='Directory caching parsed workbooks.')
+    ] = None,
+    report: Annotated[
+        bool, typer.Option(help='Write the run report as JSON into the output directory.')
+    ] = False,
+    trace_memory: Annotated[bool, typer.Option(help='Trace memory peaks of the stages.')] = False,
+    profile: Annotated[
+        bool, typer.Option(help='Write a cProfile dump into the output directory.')
+    ] = False,
+    quiet: Annotated[bool, typer.Option(help='Do not print the timing summary.')] = False,
+) -> None:
+    """
+    Builds the statements and the average marks file of a cohort.
+    """
+    cancel_event = threading.Event()
+    state_holder: dict[str, Any] = {
+        'semester_files_count': len(semester_files),
+        'semester_files_paths': [str(path) for path in semester_files],
+        'diploma_file_path': str(themes_file),
+        'template_file_path': str(template_file),
+        'save_directory_path': str(output_directory),
+        'speciality_name': speciality_name,
+        'speciality_code': speciality_code,
+        'speciality_area_name': speciality_area_name,
+        'speciality_area_code': speciality_area_code,
+        'start_date': start_date.date(),
+        'end_date': end_date.date(),
+        'statement_date': (statement_date or datetime.datetime.now()).date(),
+        'ingest_workers': ingest_workers,
+        'ingest_executor': PROCESS_INGEST_EXECUTOR if ingest_processes else THREAD_INGEST_EXECUTOR,
+        'statements_workers': statements_workers,
+        'statements_chunk_size': statements_chunk_size,
+        'data_engine': data_engine.value,
+        'streaming': streaming,
+        'single_document': single_document,
+        'incremental': incremental,
+        'ranking_columns': [column.value for column in ranking_columns or []],
+        'ranking_metric': ranking_metric.value,
+        'cache_directory_path': str(cache_directory) if cache_directory is not None else None,
+        'write_report': report,
+        'trace_memory': trace_memory,
+        'profile': profile,
+        'cancel_event': cancel_event,
+    }
+    run_report = RunReport()
+
+    previous_sigint_handler = signal.signal(signal.SIGINT, lambda *_: cancel_event.set())
+    try:
+        ret_code = runtime(state_holder, run_report)
+    finally:
+        signal.signal(signal.SIGINT, previous_sigint_handler)
+
+    if not quiet:
+        typer.echo(report_utils.format_report_summary(run_report))
+
+    if run_report.dropped_students:
+        typer.echo(
+            'Students missing from some semester files were left out: '
+            + ', '.join(run_report.dropped_students),
+            err=True,
+        )
+
+    message = RUNTIME_MESSAGES[ret_code]
+    if ret_code == 4:
+        typer.echo(message)
+    else:
+        typer.echo(
+            message + (f': {run_report.error}' if run_report.error is not None else ''), err=True
+        )
+
+    raise typer.Exit(RUNTIME_EXIT_CODES[ret_code])
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    app()
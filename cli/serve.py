@@ -0,0 +1,86 @@
+"""
+Command-line entry point running the statements service on the loopback interface.
+
+The service keeps parsed templates and recently uploaded workbooks warm between requests (see
+backend.service_utils), so repeated runs skip the start-up and parsing costs of cli.main. It runs
+until interrupted with Ctrl+C.
+
+Exit codes:
+    0: the service was stopped;
+    2: invalid command-line usage, a malformed default template or a port already in use.
+
+Usage:
+    python -m cli.serve [--port N] [--template-file template.docx] [--workers N] [--queue-size N]
+        [--executor process|thread] [--quiet]
+"""
+
+import multiprocessing
+from enum import Enum
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from backend import report_utils, service_utils
+
+
+class ServiceExecutor(str, Enum):
+    PROCESS = service_utils.PROCESS_SERVICE_EXECUTOR
+    THREAD = service_utils.THREAD_SERVICE_EXECUTOR
+
+
+app = typer.Typer(add_completion=False)
+
+
+@app.command()
+def main(
+    port: Annotated[
+        int, typer.Option(min=0, max=65535, help='The port to listen on; 0 picks a free one.')
+    ] = service_utils.DEFAULT_SERVICE_PORT,
+    template_file: Annotated[
+        Path | None,
+        typer.Option(
+            exists=True,
+            dir_okay=False,
+            readable=True,
+            resolve_path=True,
+            help='The template used for requests without one (default is to require one).',
+        ),
+    ] = None,
+    workers: Annotated[int, typer.Option(min=1, help='Workers building statements.')] = 1,
+    queue_size: Annotated[
+        int,
+        typer.Option(min=0, help='Requests waiting for a free worker before the rest are refused.'),
+    ] = service_utils.DEFAULT_QUEUE_SIZE,
+    executor: Annotated[ServiceExecutor, typer.Option()] = ServiceExecutor.PROCESS,
+    quiet: Annotated[bool, typer.Option(help='Do not log requests.')] = False,
+) -> None:
+    """
+    Serves statements built from uploaded workbooks until interrupted.
+    """
+    try:
+        server = service_utils.make_statements_server(
+            port,
+            str(template_file) if template_file is not None else None,
+            workers,
+            queue_size,
+            executor.value,
+            quiet,
+        )
+    except Exception as e:
+        typer.echo(report_utils.describe_error(e), err=True)
+        raise typer.Exit(2) from e
+
+    host, bound_port = server.server_address[:2]
+    typer.echo(f'Serving statements on http://{host}:{bound_port}{service_utils.STATEMENTS_PATH}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    app()
@@ -1,4 +1,7 @@
 import os
+import queue
+import threading
+import time
 import tkinter as tk
 from datetime import date
 from tkinter import filedialog, messagebox, ttk
@@ -6,6 +9,8 @@ from typing import Any
 
 from tkcalendar import DateEntry
 
+from backend.classes.progress_event import ProgressEvent
+from backend.progress_utils import estimate_remaining_time
 from backend.runtime import runtime
 
 state_holder: dict[str, Any] = {
@@ -30,6 +35,26 @@ RUNTIME_RET_CODES = {
     2: 'Некорректный формат файла с темами дипломных проектов!',
     3: 'Некорректный формат файла шаблона выписки или перезаписываемый файл открыт!',
     4: 'Выписки успешно сформированы!',
+    5: 'Формирование выписок отменено. Уже сформированные выписки сохранены.',
+}
+UNEXPECTED_ERROR_MESSAGE = 'Непредвиденная ошибка при формировании выписок!'
+STAGE_NAMES = {
+    'read_workbooks': 'Чтение файлов',
+    'join_workbooks': 'Объединение ведомостей',
+    'transform': 'Обработка отметок',
+    'students_configs': 'Подготовка данных студентов',
+    'build_statements': 'Формирование выписок',
+    'stream_statements': 'Формирование выписок',
+    'rank': 'Ранжирование студентов',
+    'write_ranking': 'Запись средних баллов',
+}
+PROGRESS_POLL_INTERVAL_MS = 100
+
+progress_queue: queue.Queue = queue.Queue()
+run_state: dict[str, Any] = {
+    'cancel_event': None,
+    'stage': None,
+    'stage_start_time': None,
 }
 
 
@@ -204,8 +229,14 @@ def on_date_entry_selected(
         state_holder[related_key] = dateentry.get_date()
 
 
-def push_make_statements_button() -> None:
-    global state_holder, RUNTIME_RET_CODES
+def push_make_statements_button(
+    root: tk.Frame,
+    make_statements_button: tk.Button,
+    cancel_button: tk.Button,
+    progress_bar: ttk.Progressbar,
+    progress_label: tk.Label,
+) -> None:
+    global state_holder
 
     if any(state is None for state in state_holder.values()):
         messagebox.showerror(title='Ошибка', message='Одно или несколько полей не заполнены!')
@@ -248,12 +279,135 @@ def push_make_statements_button() -> None:
         )
         return
 
-    ret_code = runtime(state_holder)
+    cancel_event = threading.Event()
+    run_state['cancel_event'] = cancel_event
+    run_state['stage'] = None
+    make_statements_button.config(state=tk.DISABLED)
+    cancel_button.config(state=tk.NORMAL)
+    progress_label.config(text='Подготовка...')
+
+    run_state_holder = {
+        **state_holder,
+        'progress_callback': progress_queue.put,
+        'cancel_event': cancel_event,
+    }
+    threading.Thread(
+        target=run_runtime_in_background, args=(run_state_holder,), name='runtime'
+    ).start()
+    root.after(
+        PROGRESS_POLL_INTERVAL_MS,
+        lambda: poll_progress_queue(
+            root, make_statements_button, cancel_button, progress_bar, progress_label
+        ),
+    )
+
+
+def run_runtime_in_background(
+    run_state_holder: dict[str, Any],
+) -> None:
+    ret_code = None
+    try:
+        ret_code = runtime(run_state_holder)
+    finally:
+        # A bug's traceback is printed by the thread itself, the window only needs to be unlocked
+        progress_queue.put(ret_code)
+
+
+def _format_remaining_time(
+    remaining_time: float | None,
+) -> str:
+    if remaining_time is None:
+        return ''
+    minutes, seconds = divmod(round(remaining_time), 60)
+    return f', осталось примерно {minutes:02d}:{seconds:02d}'
+
+
+def show_progress_event(
+    event: ProgressEvent,
+    progress_bar: ttk.Progressbar,
+    progress_label: tk.Label,
+) -> None:
+    if event.stage != run_state['stage']:
+        run_state['stage'] = event.stage
+        run_state['stage_start_time'] = time.perf_counter()
+
+    stage_name = STAGE_NAMES.get(event.stage, event.stage)
+    if event.total is None:
+        if str(progress_bar.cget('mode')) != 'indeterminate':
+            progress_bar.config(mode='indeterminate')
+            progress_bar.start()
+        progress_label.config(text=f'{stage_name}...')
+        return
+
+    progress_bar.stop()
+    progress_bar.config(mode='determinate', maximum=max(event.total, 1), value=event.done)
+    remaining_time = estimate_remaining_time(
+        time.perf_counter() - run_state['stage_start_time'], event.done, event.total
+    )
+    progress_label.config(
+        text=f'{stage_name}: {event.done} из {event.total}'
+        + _format_remaining_time(remaining_time)
+    )
 
-    if ret_code in [1, 2, 3]:
-        messagebox.showerror(title='Ошибка', message=RUNTIME_RET_CODES[ret_code])
-    else:
-        messagebox.showinfo(title='Успех', message=RUNTIME_RET_CODES[ret_code])
+
+def poll_progress_queue(
+    root: tk.Frame,
+    make_statements_button: tk.Button,
+    cancel_button: tk.Button,
+    progress_bar: ttk.Progressbar,
+    progress_label: tk.Label,
+) -> None:
+    global RUNTIME_RET_CODES
+    while True:
+        try:
+            item = progress_queue.get_nowait()
+        except queue.Empty:
+            break
+
+        if isinstance(item, ProgressEvent):
+            show_progress_event(item, progress_bar, progress_label)
+            continue
+
+        run_state['cancel_event'] = None
+        progress_bar.stop()
+        progress_bar.config(mode='determinate', value=0)
+        progress_label.config(text='')
+        make_statements_button.config(state=tk.NORMAL)
+        cancel_button.config(state=tk.DISABLED)
+        if item == 4:
+            messagebox.showinfo(title='Успех', message=RUNTIME_RET_CODES[item])
+        elif item == 5:
+            messagebox.showwarning(title='Отменено', message=RUNTIME_RET_CODES[item])
+        elif item is None:
+            messagebox.showerror(title='Ошибка', message=UNEXPECTED_ERROR_MESSAGE)
+        else:
+            messagebox.showerror(title='Ошибка', message=RUNTIME_RET_CODES[item])
+        return
+
+    root.after(
+        PROGRESS_POLL_INTERVAL_MS,
+        lambda: poll_progress_queue(
+            root, make_statements_button, cancel_button, progress_bar, progress_label
+        ),
+    )
+
+
+def push_cancel_button(
+    cancel_button: tk.Button,
+    progress_label: tk.Label,
+) -> None:
+    if run_state['cancel_event'] is not None:
+        run_state['cancel_event'].set()
+        cancel_button.config(state=tk.DISABLED)
+        progress_label.config(text='Отмена после текущего студента...')
+
+
+def on_main_window_close(
+    main_window: tk.Tk,
+) -> None:
+    if run_state['cancel_event'] is not None:
+        run_state['cancel_event'].set()
+    main_window.destroy()
 
 
 def get_new_separator(
@@ -567,9 +721,28 @@ def main() -> None:
         root,
         text='Выполнить формирование выписок',
         font=("Arial", 12),
-        command=lambda: push_make_statements_button(),
+        command=lambda: push_make_statements_button(
+            root, make_statements_button, cancel_button, progress_bar, progress_label
+        ),
     )
     make_statements_button.grid(column=0, row=34, columnspan=4, padx=5, pady=5, sticky=tk.EW)
+
+    progress_bar = ttk.Progressbar(root, orient=tk.HORIZONTAL, mode='determinate')
+    progress_bar.grid(column=0, row=35, columnspan=3, padx=5, pady=5, sticky=tk.EW)
+
+    cancel_button = tk.Button(
+        root,
+        text='Отмена',
+        font=("Arial", 10),
+        state=tk.DISABLED,
+        command=lambda: push_cancel_button(cancel_button, progress_label),
+    )
+    cancel_button.grid(column=3, row=35, padx=5, pady=5, sticky=tk.EW)
+
+    progress_label = tk.Label(root, text='', font=("Arial", 10))
+    progress_label.grid(column=0, row=36, columnspan=4, padx=5, pady=5, sticky=tk.W)
+
+    main_window.protocol('WM_DELETE_WINDOW', lambda: on_main_window_close(main_window))
     root.mainloop()
 
 
@@ -0,0 +1,70 @@
+import pytest
+from docx import Document
+
+from backend.classes.common_config import CommonConfig
+from backend.classes.student_config import StudentConfig
+
+TEMPLATE_PARAGRAPHS_COUNT = 33
+TEMPLATE_TABLES_HEADERS = (
+    ("Наименование дисциплины", "Количество часов", "Отметка"),
+    ("Курсовая работа (проект)", "Количество часов", "Отметка"),
+    ("Вид практики", "Количество часов", "Отметка"),
+)
+
+
+@pytest.fixture
+def template_path(tmp_path):
+    document = Document()
+    for i in range(TEMPLATE_PARAGRAPHS_COUNT):
+        document.add_paragraph(f"Абзац {i}")
+        if i in (20, 22, 24):
+            table = document.add_table(rows=1, cols=3)
+            for cell, header in zip(
+                table.rows[0].cells, TEMPLATE_TABLES_HEADERS[(i - 20) // 2], strict=True
+            ):
+                cell.text = header
+
+    path = tmp_path / "template.docx"
+    document.save(path)
+    return str(path)
+
+
+@pytest.fixture
+def common_config():
+    return CommonConfig(
+        start_date_day="01",
+        start_date_month="сентября",
+        start_date_year="20",
+        end_date_day="30",
+        end_date_month="июня",
+        end_date_year="24",
+        speciality_code="1-40 01 01",
+        speciality_name="Программное обеспечение информационных технологий",
+        speciality_area_code="1-40 01 01-01",
+        speciality_area_name="Программирование",
+        statement_date_day="05",
+        statement_date_month="июля",
+        statement_date_year="2024",
+    )
+
+
+@pytest.fixture
+def students_configs():
+    return [
+        StudentConfig(
+            "Иванов Иван",
+            [("Математика", "220 (8,5 з.е.)", "пять, шесть"), ("Физика", "80 (4 з.е.)", "семь")],
+            [("Курсовая работа", "40 (1 з.е.)", "девять")],
+            [("Курсовой проект", "40", "восемь")],
+            [("Практика", "60 (2 з.е.)", "десять")],
+            "Тема 1",
+        ),
+        StudentConfig(
+            "Петров Петр",
+            [("Математика", "220 (8,5 з.е.)", "зачтено")],
+            [],
+            [],
+            [("Практика", "60 (2 з.е.)", "девять")],
+            "Тема 2",
+        ),
+    ]
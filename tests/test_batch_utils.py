@@ -0,0 +1,146 @@
+import json
+
+import pandas as pd
+import pytest
+
+from backend.batch_utils import (
+    BatchManifestError,
+    format_batch_summary,
+    get_cohort_status,
+    load_batch_manifest,
+    run_batch,
+    save_batch_report,
+)
+
+
+@pytest.fixture
+def manifest_path(tmp_path, template_path):
+    pd.DataFrame(
+        {
+            "ФИО": ["Иванов Иван", "Петров Петр", "Сидоров Сидор"],
+            "Математика/120:3.5:ЭК": [5, 4, 6],
+        }
+    ).to_excel(tmp_path / "semester_1.xlsx", index=False)
+    for group in ("a", "b"):
+        pd.DataFrame(
+            {
+                "ФИО": ["Иванов Иван", "Петров Петр", "Сидоров Сидор"],
+                "Практика/60:2:ПР": [8, 9, 7],
+            }
+        ).to_excel(tmp_path / f"semester_2_{group}.xlsx", index=False)
+    pd.DataFrame(
+        {
+            "ФИО": ["Иванов Иван", "Петров Петр", "Сидоров Сидор"],
+            "Тема дипломного проекта": ["Тема 1", "Тема 2", "Тема 3"],
+        }
+    ).to_excel(tmp_path / "themes.xlsx", index=False)
+
+    path = tmp_path / "batch.toml"
+    path.write_text(
+        f"""
+[defaults]
+template_file = "{template_path}"
+themes_file = "themes.xlsx"
+speciality_name = "Программное обеспечение информационных технологий"
+speciality_code = "1-40 01 01"
+speciality_area_name = "Программирование"
+speciality_area_code = "1-40 01 01-01"
+start_date = 2020-09-01
+end_date = 2024-06-30
+statement_date = "2024-07-05"
+
+[[cohorts]]
+name = "group-a"
+semester_files = ["semester_1.xlsx", "semester_2_a.xlsx"]
+output_directory = "output/group-a"
+
+[[cohorts]]
+name = "group-b"
+semester_files = ["semester_1.xlsx", "semester_2_b.xlsx"]
+output_directory = "output/group-b"
+streaming = true
+""",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def test_load_batch_manifest(manifest_path, tmp_path):
+    cohorts = load_batch_manifest(manifest_path)
+
+    assert list(cohorts) == ["group-a", "group-b"]
+    assert cohorts["group-a"]["semester_files_paths"] == [
+        str(tmp_path / "semester_1.xlsx"),
+        str(tmp_path / "semester_2_a.xlsx"),
+    ]
+    assert cohorts["group-b"]["diploma_file_path"] == str(tmp_path / "themes.xlsx")
+    assert cohorts["group-b"]["statement_date"].isoformat() == "2024-07-05"
+    assert cohorts["group-b"]["streaming"] is True
+    assert "streaming" not in cohorts["group-a"]
+
+
+@pytest.mark.parametrize(
+    ("manifest", "message"),
+    [
+        ({"cohorts": []}, "non-empty cohorts"),
+        ({"cohorts": [{"name": "a"}]}, "missing keys semester_files"),
+        ({"cohorts": [{"name": "a", "workers": 2}]}, "unknown keys workers"),
+    ],
+)
+def test_load_batch_manifest_errors(tmp_path, manifest, message):
+    path = tmp_path / "batch.json"
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+
+    with pytest.raises(BatchManifestError, match=message):
+        load_batch_manifest(str(path))
+
+
+def test_load_batch_manifest_shared_output_directory(manifest_path):
+    with open(manifest_path, encoding="utf-8") as file:
+        manifest = file.read()
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        file.write(manifest.replace('"output/group-b"', '"output/../output/group-a/"'))
+
+    with pytest.raises(BatchManifestError, match="group-a and group-b write to the same"):
+        load_batch_manifest(manifest_path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch(manifest_path, tmp_path, workers):
+    cohorts = load_batch_manifest(manifest_path)
+    cohorts["group-c"] = {
+        **cohorts["group-a"],
+        "diploma_file_path": str(tmp_path / "missing.xlsx"),
+        "save_directory_path": str(tmp_path / "output" / "group-c"),
+    }
+    done_cohorts_names = []
+
+    batch_report = run_batch(
+        cohorts,
+        workers=workers,
+        cache_directory_path=str(tmp_path / "cache"),
+        on_cohort_done=lambda cohort_report: done_cohorts_names.append(cohort_report.name),
+    )
+
+    assert sorted(done_cohorts_names) == ["group-a", "group-b", "group-c"]
+    assert [cohort_report.name for cohort_report in batch_report.cohorts] == [
+        "group-a",
+        "group-b",
+        "group-c",
+    ]
+    assert [get_cohort_status(cohort_report) for cohort_report in batch_report.cohorts] == [
+        "ok",
+        "ok",
+        "diploma themes error",
+    ]
+    for group in ("a", "b"):
+        assert (tmp_path / "output" / f"group-{group}" / "Выписка_Сидоров Сидор.docx").exists()
+
+    summary = format_batch_summary(batch_report)
+    assert "2 of 3 cohorts succeeded" in summary
+    assert "FileNotFoundError" in summary
+
+    report_path = tmp_path / "batch_report.json"
+    save_batch_report(batch_report, str(report_path))
+    saved_report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert saved_report["cohorts"][2]["run_report"]["return_code"] == 2
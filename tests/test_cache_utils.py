@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+
+from backend import cache_utils
+from backend.cache_utils import (
+    get_file_digest,
+    invalidate_cache,
+    load_cached_dataframe,
+    store_cached_dataframe,
+)
+
+
+def test_get_file_digest(tmp_path):
+    file_path = tmp_path / "semester.xlsx"
+    file_path.write_bytes(b"workbook")
+    same_content_path = tmp_path / "copy.xlsx"
+    same_content_path.write_bytes(b"workbook")
+
+    assert get_file_digest(str(file_path)) == get_file_digest(str(same_content_path))
+
+    file_path.write_bytes(b"corrected workbook")
+
+    assert get_file_digest(str(file_path)) != get_file_digest(str(same_content_path))
+
+
+def test_get_file_digest_memo_is_bounded(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache_utils, "FILE_DIGESTS_MAX_ENTRIES", 2)
+    monkeypatch.setattr(cache_utils, "_file_digests", cache_utils.OrderedDict())
+    files_paths = []
+    for i in range(3):
+        file_path = tmp_path / f"semester_{i}.xlsx"
+        file_path.write_bytes(b"workbook %d" % i)
+        files_paths.append(str(file_path))
+
+    get_file_digest(files_paths[0])
+    get_file_digest(files_paths[1])
+    get_file_digest(files_paths[0])
+    get_file_digest(files_paths[2])
+
+    assert [key[0] for key in cache_utils._file_digests] == [
+        os.path.abspath(files_paths[0]),
+        os.path.abspath(files_paths[2]),
+    ]
+
+
+def test_store_cached_dataframe_evicts_least_recently_used(tmp_path):
+    df = pd.DataFrame({"ФИО": ["Иванов Иван"] * 100, "Математика": range(100)})
+    cache_directory_path = str(tmp_path)
+    store_cached_dataframe(cache_directory_path, "first", df)
+    store_cached_dataframe(cache_directory_path, "second", df)
+    os.utime(tmp_path / "first.pkl", ns=(1, 1))
+    os.utime(tmp_path / "second.pkl", ns=(2, 2))
+    entry_size = os.path.getsize(tmp_path / "first.pkl")
+
+    store_cached_dataframe(cache_directory_path, "third", df, cache_max_bytes=2 * entry_size)
+
+    assert load_cached_dataframe(cache_directory_path, "first") is None
+    pd.testing.assert_frame_equal(load_cached_dataframe(cache_directory_path, "second"), df)
+    pd.testing.assert_frame_equal(load_cached_dataframe(cache_directory_path, "third"), df)
+
+
+def test_invalidate_cache(tmp_path):
+    file_path = tmp_path / "semester.xlsx"
+    file_path.write_bytes(b"workbook")
+    cache_directory_path = str(tmp_path / "cache")
+    df = pd.DataFrame({"ФИО": ["Иванов Иван"]})
+    store_cached_dataframe(cache_directory_path, f"{get_file_digest(str(file_path))}-pandas", df)
+    store_cached_dataframe(cache_directory_path, "other", df)
+
+    invalidate_cache(cache_directory_path, str(file_path))
+
+    assert os.listdir(cache_directory_path) == ["other.pkl"]
+
+    invalidate_cache(cache_directory_path)
+
+    assert os.listdir(cache_directory_path) == []
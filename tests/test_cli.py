@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from cli import batch
+from cli.main import app
+
+
+@pytest.fixture
+def cli_args(tmp_path, template_path):
+    semester_file_path = tmp_path / "semester_1.xlsx"
+    pd.DataFrame(
+        {
+            "ФИО": ["Иванов Иван", "Петров Петр"],
+            "Математика/120:3.5:ЭК": [5, 4],
+            "Практика/60:2:ПР": [8, 9],
+        }
+    ).to_excel(semester_file_path, index=False)
+    diploma_file_path = tmp_path / "themes.xlsx"
+    pd.DataFrame(
+        {"ФИО": ["Иванов Иван", "Петров Петр"], "Тема дипломного проекта": ["Тема 1", "Тема 2"]}
+    ).to_excel(diploma_file_path, index=False)
+    save_directory_path = tmp_path / "output"
+    save_directory_path.mkdir()
+
+    return [
+        "--semester-file",
+        str(semester_file_path),
+        "--themes-file",
+        str(diploma_file_path),
+        "--template-file",
+        template_path,
+        "--output-directory",
+        str(save_directory_path),
+        "--speciality-name",
+        "Программное обеспечение информационных технологий",
+        "--speciality-code",
+        "1-40 01 01",
+        "--speciality-area-name",
+        "Программирование",
+        "--speciality-area-code",
+        "1-40 01 01-01",
+        "--start-date",
+        "2020-09-01",
+        "--end-date",
+        "30.06.2024",
+        "--statement-date",
+        "2024-07-05",
+        "--ingest-workers",
+        "1",
+    ]
+
+
+def test_cli(cli_args, tmp_path):
+    result = CliRunner().invoke(app, [*cli_args, "--statements-workers", "2"])
+
+    assert result.exit_code == 0, result.output
+    assert "build_statements" in result.output
+    assert "documents_written=2" in result.output
+    assert (tmp_path / "output" / "Выписка_Иванов Иван.docx").exists()
+    assert (tmp_path / "output" / "СРЕДНИЕ БАЛЛЫ.xlsx").exists()
+
+
+def test_cli_ingest_processes(cli_args, tmp_path):
+    result = CliRunner().invoke(app, [*cli_args, "--ingest-processes", "--quiet"])
+
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "output" / "Выписка_Иванов Иван.docx").exists()
+
+
+def test_cli_malformed_template(cli_args, tmp_path):
+    template_path = tmp_path / "malformed.docx"
+    template_path.write_text("not a document")
+    template_index = cli_args.index("--template-file") + 1
+    cli_args[template_index] = str(template_path)
+
+    result = CliRunner().invoke(app, [*cli_args, "--quiet"])
+
+    assert result.exit_code == 5
+    assert "build_statements" not in result.output
+
+
+def test_cli_missing_semester_file(cli_args, tmp_path):
+    result = CliRunner().invoke(app, [*cli_args, "--semester-file", str(tmp_path / "missing.xlsx")])
+
+    assert result.exit_code == 2
+
+
+def test_cli_batch_invalid_manifest(tmp_path):
+    manifest_path = tmp_path / "batch.json"
+    manifest_path.write_text('{"cohorts": [{"name": "group-a"}]}', encoding="utf-8")
+
+    result = CliRunner().invoke(batch.app, [str(manifest_path)])
+
+    assert result.exit_code == 2
+    assert "missing keys" in result.output
@@ -1,15 +1,23 @@
+from copy import deepcopy
+
 import pytest
 from pandas import DataFrame
 
+from backend.classes.compact_discipline_config import CompactDisciplineConfig
+from backend.classes.control_form import ControlForm
+from backend.classes.discipline_category import DisciplineCategory
 from backend.classes.discipline_config import DisciplineConfig
 from backend.classes.student_config import StudentConfig
 from backend.data_utils import (
+    get_cohort_plan,
     get_disciplines_for_student_config,
     get_students_configs,
+    get_students_configs_with_avg_marks,
     get_students_stats_with_discipline_configs,
     get_students_stats_with_discipline_configs_grouped_by_category,
     get_students_stats_with_discipline_configs_grouped_by_category_summarized,
-    get_students_with_avg_mark
+    get_students_with_avg_mark,
+    get_students_without_diploma_theme,
 )
 
 PRACTICE_CATEGORY = 'practice'
@@ -43,6 +51,152 @@ def sample_diploma_themes_df():
     )
 
 
+def test_get_cohort_plan():
+    result = get_cohort_plan(
+        [
+            "2.Математика/120:5:ЭК",
+            "1.Практика/60:2.5:ПР",
+            "1.Математика/100:4:ЗЧ",
+            "1.Физика/80:4:ЭК",
+            "2.Курсовой проект/40:0:КП",
+        ]
+    )
+
+    assert result.names == ("Математика", "Практика", "Математика", "Физика", "Курсовой проект")
+    assert result.semesters == (2, 1, 1, 1, 2)
+    assert result.study_hours == (120, 60, 100, 80, 40)
+    assert result.credits_numbers == (5.0, 2.5, 4.0, 4.0, 0.0)
+    assert result.categories == (
+        REGULAR_CATEGORY,
+        PRACTICE_CATEGORY,
+        REGULAR_CATEGORY,
+        REGULAR_CATEGORY,
+        COURSE_PROJECT_CATEGORY,
+    )
+    category_orders = dict(result.category_orders)
+    assert list(category_orders) == [
+        REGULAR_CATEGORY,
+        COURSE_WORK_CATEGORY,
+        COURSE_PROJECT_CATEGORY,
+        PRACTICE_CATEGORY,
+    ]
+    assert category_orders[REGULAR_CATEGORY] == (2, 3, 0)
+    assert category_orders[COURSE_WORK_CATEGORY] == ()
+    assert result.summarization_groups == ((2, 0), (3,))
+    assert result.regular_summarization_groups == ((0, 2), (1,))
+    assert hash(result) == hash(get_cohort_plan(result.discipline_infos))
+
+
+def test_get_students_stats_with_discipline_configs_reuses_cohort_plan(sample_students_stats_raw):
+    result = get_students_stats_with_discipline_configs(sample_students_stats_raw)
+
+    assert result["Иванов Иван"][0] == DisciplineConfig(
+        "ЭК", "1.Математика", 1, 5, 120, 5.0, REGULAR_CATEGORY
+    )
+    assert result["Петров Петр"][2] == DisciplineConfig(
+        "ЭК", "2.Информатика", 2, 5, 90, 5.0, REGULAR_CATEGORY
+    )
+
+
+def test_get_students_stats_with_discipline_configs_compact(sample_diploma_themes_df):
+    students_stats_raw = [
+        {
+            "Иванов Иван": {
+                "1.Математика/120:5:ЭК": 5,
+                "1.Практика/60:2.5:ПР": 8,
+                "2.Математика/100:4:ЗЧ": "зч",
+                "2.Курсовая работа/40:0:КР": 9,
+                "2.Логика/30:1:ДЗ": 7,
+            },
+            "Петров Петр": {
+                "1.Математика/120:5:ЭК": 4,
+                "1.Практика/60:2.5:ПР": 6,
+                "2.Математика/100:4:ЗЧ": "зч",
+                "2.Курсовая работа/40:0:КР": 7,
+                "2.Логика/30:1:ДЗ": 9,
+            },
+        }
+    ]
+
+    result = get_students_stats_with_discipline_configs(students_stats_raw, compact=True)
+
+    discipline_config = result["Иванов Иван"][1]
+    assert discipline_config == CompactDisciplineConfig(
+        ControlForm.PRACTICE, "Практика", 1, 8, 60, 2.5, DisciplineCategory.PRACTICE
+    )
+    assert (discipline_config.contol_form, discipline_config.categoty) == ("ПР", PRACTICE_CATEGORY)
+    assert result["Иванов Иван"][4].control_form == "ДЗ"
+    assert result["Иванов Иван"][4].contol_form == "ДЗ"
+    assert result["Иванов Иван"][4].categoty == REGULAR_CATEGORY
+    assert not hasattr(discipline_config, "__dict__")
+    assert result["Иванов Иван"][0].name is result["Петров Петр"][0].name
+
+    def get_configs(students_stats_with_discipline_configs):
+        return get_students_configs(
+            get_students_stats_with_discipline_configs_grouped_by_category_summarized(
+                get_students_stats_with_discipline_configs_grouped_by_category(
+                    students_stats_with_discipline_configs
+                )
+            ),
+            sample_diploma_themes_df,
+        )
+
+    assert get_configs(result) == get_configs(
+        get_students_stats_with_discipline_configs(students_stats_raw)
+    )
+
+    summarized = get_students_stats_with_discipline_configs_grouped_by_category_summarized(
+        get_students_stats_with_discipline_configs_grouped_by_category(result)
+    )
+    regular_configs = summarized["Иванов Иван"][REGULAR_CATEGORY]
+    assert all(isinstance(config, CompactDisciplineConfig) for config in regular_configs)
+    assert regular_configs[0] == CompactDisciplineConfig(
+        ControlForm.SUMMARIZED, "Математика", 1, (5, "зч"), 220, 9.0, DisciplineCategory.REGULAR
+    )
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_grouped_by_category_with_cohort_plan(compact):
+    students_stats_raw = [
+        {
+            "Иванов Иван": {
+                "3.Математика/120:5:ЭК": 5,
+                "1.Практика/60:2.5:ПР": 8,
+                "2.Физика/80:3:ЭК": 6,
+                "1.Математика/100:4:ЗЧ": "зч",
+                "2.Курсовая работа/40:0:КР": 9,
+                "2.Математика/90:3:ЭК": 7,
+                "1.Курсовой проект/40:0:КП": 10,
+            },
+            "Петров Петр": {
+                "3.Математика/120:5:ЭК": 4,
+                "1.Практика/60:2.5:ПР": 6,
+                "2.Физика/80:3:ЭК": 9,
+                "1.Математика/100:4:ЗЧ": "зч",
+                "2.Курсовая работа/40:0:КР": 7,
+                "2.Математика/90:3:ЭК": 8,
+                "1.Курсовой проект/40:0:КП": 5,
+            },
+        }
+    ]
+    cohort_plan = get_cohort_plan(students_stats_raw[0]["Иванов Иван"])
+    students_stats = get_students_stats_with_discipline_configs(students_stats_raw, compact)
+
+    grouped_by_category = get_students_stats_with_discipline_configs_grouped_by_category(
+        students_stats
+    )
+    gathered_by_category = get_students_stats_with_discipline_configs_grouped_by_category(
+        students_stats, cohort_plan
+    )
+
+    assert gathered_by_category == grouped_by_category
+    assert get_students_stats_with_discipline_configs_grouped_by_category_summarized(
+        gathered_by_category, cohort_plan
+    ) == get_students_stats_with_discipline_configs_grouped_by_category_summarized(
+        grouped_by_category
+    )
+
+
 def test_get_students_stats_with_discipline_configs(sample_students_stats_raw):
     result = get_students_stats_with_discipline_configs(sample_students_stats_raw)
 
@@ -71,11 +225,44 @@ def test_get_students_stats_with_discipline_configs_grouped_by_category_summariz
     )
 
     assert len(result) > 0
-    for student_name, categories in result.items():
+    for categories in result.values():
         assert REGULAR_CATEGORY in categories
         assert len(categories[REGULAR_CATEGORY]) > 0
 
 
+def test_get_students_stats_with_discipline_configs_grouped_by_category_summarized_does_not_mutate_input():
+    grouped_by_category = {
+        "Иванов Иван": {
+            REGULAR_CATEGORY: [
+                DisciplineConfig("ЭК", "Математика", 1, 5, 120, 3.5, REGULAR_CATEGORY),
+                DisciplineConfig("ЗЧ", "Физика", 1, "зч", 80, 0.0, REGULAR_CATEGORY),
+                DisciplineConfig("ЭК", "Математика", 2, 6, 100, 3.0, REGULAR_CATEGORY),
+            ],
+            COURSE_WORK_CATEGORY: [
+                DisciplineConfig("КР", "Курсовая работа", 2, 9, 40, 1.0, COURSE_WORK_CATEGORY)
+            ],
+            COURSE_PROJECT_CATEGORY: [],
+            PRACTICE_CATEGORY: [
+                DisciplineConfig("ПР", "Практика", 2, 8, 60, 2.0, PRACTICE_CATEGORY)
+            ],
+        }
+    }
+    expected_input = deepcopy(grouped_by_category)
+
+    result = get_students_stats_with_discipline_configs_grouped_by_category_summarized(
+        grouped_by_category
+    )
+
+    assert grouped_by_category == expected_input
+    assert result["Иванов Иван"] is not grouped_by_category["Иванов Иван"]
+    assert result["Иванов Иван"][REGULAR_CATEGORY] == [
+        DisciplineConfig("СФ", "Математика", 1, [5, 6], 220, 6.5, REGULAR_CATEGORY),
+        DisciplineConfig("СФ", "Физика", 1, ["зч"], 80, 0.0, REGULAR_CATEGORY),
+    ]
+    for category in (COURSE_WORK_CATEGORY, COURSE_PROJECT_CATEGORY, PRACTICE_CATEGORY):
+        assert result["Иванов Иван"][category] is grouped_by_category["Иванов Иван"][category]
+
+
 def test_get_disciplines_for_student_config(sample_students_stats_raw):
     students_stats = get_students_stats_with_discipline_configs(sample_students_stats_raw)
     student_discipline_configs = students_stats["Иванов Иван"]
@@ -107,16 +294,44 @@ def test_get_students_configs(sample_students_stats_raw, sample_diploma_themes_d
 def test_get_students_with_avg_mark():
     students_stats = {
         "Иванов Иван": [
-            DisciplineConfig(contol_form="exam", name="Математика", semester=1,
-                             mark=5, study_hours=60, credits_number=3, categoty="regular"),
-            DisciplineConfig(contol_form="test", name="Физика", semester=1,
-                             mark=4, study_hours=45, credits_number=3, categoty="regular"),
+            DisciplineConfig(
+                contol_form="exam",
+                name="Математика",
+                semester=1,
+                mark=5,
+                study_hours=60,
+                credits_number=3,
+                categoty="regular",
+            ),
+            DisciplineConfig(
+                contol_form="test",
+                name="Физика",
+                semester=1,
+                mark=4,
+                study_hours=45,
+                credits_number=3,
+                categoty="regular",
+            ),
         ],
         "Петров Петр": [
-            DisciplineConfig(contol_form="exam", name="Математика", semester=1,
-                             mark=3, study_hours=60, credits_number=3, categoty="regular"),
-            DisciplineConfig(contol_form="test", name="Физика", semester=1,
-                             mark=2, study_hours=45, credits_number=3, categoty="regular"),
+            DisciplineConfig(
+                contol_form="exam",
+                name="Математика",
+                semester=1,
+                mark=3,
+                study_hours=60,
+                credits_number=3,
+                categoty="regular",
+            ),
+            DisciplineConfig(
+                contol_form="test",
+                name="Физика",
+                semester=1,
+                mark=2,
+                study_hours=45,
+                credits_number=3,
+                categoty="regular",
+            ),
         ],
     }
 
@@ -133,3 +348,67 @@ def test_get_students_with_avg_mark():
 
 if __name__ == "__main__":
     pytest.main()
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_get_students_configs_with_avg_marks(sample_diploma_themes_df, compact):
+    students_stats_raw = [
+        {
+            "Петров Петр": {
+                "1.Математика/120:5:ЭК": 6,
+                "1.Практика/60:2:ПР": 8,
+                "2.Математика/100:4:ЗЧ": "зч",
+            }
+        },
+        {
+            "Иванов Иван": {
+                "1.Математика/120:5:ЭК": 9,
+                "1.Практика/60:2:ПР": 7,
+                "2.Математика/100:4:ЗЧ": "зч",
+            }
+        },
+        {
+            "Петров Петр": {
+                "1.Математика/120:5:ЭК": 10,
+                "1.Практика/60:2:ПР": 10,
+                "2.Математика/100:4:ЗЧ": "зч",
+            }
+        },
+    ]
+    debug_intermediates = {}
+
+    students_configs, students_with_avg_mark = get_students_configs_with_avg_marks(
+        iter(students_stats_raw),
+        sample_diploma_themes_df,
+        compact=compact,
+        debug_intermediates=debug_intermediates,
+    )
+
+    students_stats = get_students_stats_with_discipline_configs(students_stats_raw, compact=compact)
+    grouped_by_category = get_students_stats_with_discipline_configs_grouped_by_category(
+        students_stats
+    )
+    summarized = get_students_stats_with_discipline_configs_grouped_by_category_summarized(
+        grouped_by_category
+    )
+    assert students_configs == get_students_configs(summarized, sample_diploma_themes_df)
+    assert students_with_avg_mark == get_students_with_avg_mark(students_stats)
+    assert [student_config.full_name for student_config in students_configs] == [
+        "Петров Петр",
+        "Иванов Иван",
+    ]
+    assert students_with_avg_mark == (("Петров Петр", 10.0), ("Иванов Иван", 8.0))
+    assert debug_intermediates == {
+        "configs": students_stats,
+        "grouped": grouped_by_category,
+        "summarized": summarized,
+    }
+
+
+def test_get_students_without_diploma_theme(sample_diploma_themes_df):
+    result = get_students_without_diploma_theme(
+        ["Сидоров Сидор", "Иванов Иван", "Сидоров Сидор", "Кузнецов Кузьма"],
+        sample_diploma_themes_df,
+    )
+
+    assert result == ["Сидоров Сидор", "Кузнецов Кузьма"]
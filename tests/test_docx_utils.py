@@ -0,0 +1,429 @@
+import io
+import os
+import zipfile
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Pt
+
+from backend.docx_utils import (
+    StatementsBuildError,
+    StatementTemplate,
+    TableRowsBuilder,
+    _fill_common_config,
+    _fill_student_config,
+    build_docx,
+    build_statements,
+    build_statements_zip,
+    get_statement_template,
+    render_docx,
+)
+from backend.template_utils import TemplateError
+
+
+def get_tables_rows(document):
+    return [
+        [tuple(cell.text for cell in row.cells) for row in table.rows[1:]]
+        for table in document.tables
+    ]
+
+
+def test_build_docx(template_path, tmp_path, students_configs, common_config):
+    build_docx(template_path, str(tmp_path), students_configs[0], common_config)
+
+    document = Document(tmp_path / "Выписка_Иванов Иван.docx")
+    assert document.paragraphs[5].text == "Иванов Иван"
+    assert document.paragraphs[19].text == "Выполнил(а) дипломный проект на тему: «Тема 1»"
+    assert get_tables_rows(document) == [
+        [("Математика", "220 (8,5 з.е.)", "пять, шесть"), ("Физика", "80 (4 з.е.)", "семь")],
+        [("Курсовая работа", "40 (1 з.е.)", "девять"), ("Курсовой проект", "40", "восемь")],
+        [("Практика", "60 (2 з.е.)", "десять")],
+    ]
+
+
+def test_build_docx_anchored_template(tmp_path, students_configs, common_config):
+    template = Document()
+    for field in ("full_name", "study_period", "speciality", "speciality_area", "diploma_theme"):
+        template.add_paragraph(f"{{{{{field}}}}}")
+    for field in ("regular_disciplines", "course_disciplines", "practice_disciplines"):
+        template.add_table(rows=1, cols=3).rows[0].cells[0].text = f"Дисциплина{{{{{field}}}}}"
+    template.add_paragraph("{{statement_date}}")
+    template_path = tmp_path / "anchored_template.docx"
+    template.save(template_path)
+
+    build_docx(str(template_path), str(tmp_path), students_configs[0], common_config)
+
+    document = Document(tmp_path / "Выписка_Иванов Иван.docx")
+    assert document.paragraphs[0].text == "Иванов Иван"
+    assert document.paragraphs[5].text.startswith("г. Могилев «05» июля 2024")
+    assert document.tables[0].rows[0].cells[0].text == "Дисциплина"
+    assert get_tables_rows(document)[2] == [("Практика", "60 (2 з.е.)", "десять")]
+
+
+def test_build_statements_malformed_template(tmp_path, students_configs, common_config):
+    template_path = tmp_path / "malformed_template.docx"
+    template = Document()
+    template.add_paragraph("{{full_name}}")
+    template.save(template_path)
+
+    with pytest.raises(TemplateError, match="Missing template anchors"):
+        build_statements(str(template_path), str(tmp_path), students_configs, common_config)
+
+    assert not list(tmp_path.glob("Выписка_*.docx"))
+
+
+def test_build_statements_clones_pristine_template(
+    template_path, tmp_path, students_configs, common_config
+):
+    build_statements(template_path, str(tmp_path), students_configs, common_config)
+
+    document = Document(tmp_path / "Выписка_Петров Петр.docx")
+    assert document.paragraphs[5].text == "Петров Петр"
+    assert get_tables_rows(document) == [
+        [("Математика", "220 (8,5 з.е.)", "зачтено")],
+        [],
+        [("Практика", "60 (2 з.е.)", "девять")],
+    ]
+
+
+@pytest.mark.parametrize("student_index", [0, 1])
+def test_build_statements_matches_build_docx(
+    template_path, tmp_path, students_configs, common_config, student_index
+):
+    single_directory = tmp_path / "single"
+    single_directory.mkdir()
+    build_docx(template_path, str(single_directory), students_configs[student_index], common_config)
+    build_statements(template_path, str(tmp_path), students_configs, common_config)
+
+    file_name = f"Выписка_{students_configs[student_index].full_name}.docx"
+    assert (
+        Document(tmp_path / file_name).element.xml
+        == Document(single_directory / file_name).element.xml
+    )
+
+
+def test_statement_template_render_restores_body(template_path, students_configs, common_config):
+    statement_template = StatementTemplate(template_path)
+    expected_xml = statement_template.render(students_configs[0], common_config).element.xml
+
+    document = statement_template.render(students_configs[0], common_config)
+    document.tables[0].add_row()
+    document.paragraphs[0].text = "Изменено"
+    document = statement_template.render(students_configs[0], common_config)
+
+    assert document.element.xml == expected_xml
+
+
+def test_statement_template_render_bakes_common_config(
+    template_path, students_configs, common_config
+):
+    statement_template = StatementTemplate(template_path)
+    other_common_config = replace(common_config, statement_date_day="06")
+    expected_xmls = []
+    for student_config, student_common_config in zip(
+        students_configs, [common_config, other_common_config], strict=True
+    ):
+        document = Document(template_path)
+        body_elements = list(document.element.body)
+        _fill_common_config(
+            body_elements, document._body, student_common_config, statement_template.anchors
+        )
+        _fill_student_config(
+            body_elements, document._body, student_config, statement_template.anchors
+        )
+        expected_xmls.append(document.element.xml)
+
+    xmls = [
+        statement_template.render(students_configs[0], common_config).element.xml,
+        statement_template.render(students_configs[1], other_common_config).element.xml,
+        statement_template.render(students_configs[0], common_config).element.xml,
+    ]
+
+    assert xmls == [*expected_xmls, expected_xmls[0]]
+    assert len(statement_template._baked_bodies_elements) == 2
+
+
+def test_get_statement_template(template_path, tmp_path):
+    statement_template = get_statement_template(template_path)
+
+    assert get_statement_template(template_path) is statement_template
+
+    edited_template = Document(template_path)
+    edited_template.add_paragraph("Подпись")
+    edited_template.save(template_path)
+    os.utime(template_path, ns=(1, 1))
+
+    assert get_statement_template(template_path) is not statement_template
+
+
+def test_build_statements_parallel(template_path, tmp_path, students_configs, common_config):
+    sequential_directory = tmp_path / "sequential"
+    sequential_directory.mkdir()
+    build_statements(template_path, str(sequential_directory), students_configs, common_config)
+
+    documents_count = build_statements(
+        template_path,
+        str(tmp_path),
+        iter(students_configs * 3),
+        common_config,
+        workers=2,
+        chunk_size=1,
+        max_tasks_per_child=2,
+    )
+
+    assert documents_count == 6
+    for student_config in students_configs:
+        file_name = f"Выписка_{student_config.full_name}.docx"
+        assert (
+            Document(tmp_path / file_name).element.xml
+            == Document(sequential_directory / file_name).element.xml
+        )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_statements_reports_errors_in_order(
+    template_path, tmp_path, students_configs, common_config, workers
+):
+    broken_students_configs = [
+        replace(students_configs[1], full_name="Нет/Такого/Каталога"),
+        students_configs[0],
+        replace(students_configs[0], full_name="Другого/Нет"),
+    ]
+
+    with pytest.raises(StatementsBuildError) as exc_info:
+        build_statements(
+            template_path, str(tmp_path), broken_students_configs, common_config, workers=workers
+        )
+
+    assert [(index, full_name) for index, full_name, _ in exc_info.value.errors] == [
+        (0, "Нет/Такого/Каталога"),
+        (2, "Другого/Нет"),
+    ]
+    assert (tmp_path / "Выписка_Иванов Иван.docx").exists()
+
+
+def test_build_statements_single_document(template_path, tmp_path, students_configs, common_config):
+    documents_count = build_statements(
+        template_path, str(tmp_path), students_configs, common_config, single_document=True
+    )
+
+    assert documents_count == 1
+
+    assert {path.name for path in tmp_path.glob("*.docx")} == {"template.docx", "Выписки.docx"}
+    document = Document(tmp_path / "Выписки.docx")
+    page_breaks = document.element.body.xpath('./w:p/w:r/w:br[@w:type="page"]')
+    assert len(page_breaks) == 1
+    assert len(document.tables) == 6
+    assert document.paragraphs[5].text == "Иванов Иван"
+    assert document.paragraphs[33 + 1 + 5].text == "Петров Петр"
+    assert len(document.element.body.xpath('./w:sectPr')) == 1
+
+
+def test_build_statements_single_document_bookmarks(
+    template_path, tmp_path, students_configs, common_config
+):
+    template = Document(template_path)
+    paragraph = template.paragraphs[0]._p
+    paragraph.insert(0, parse_xml(f'<w:bookmarkStart {nsdecls("w")} w:id="0" w:name="start"/>'))
+    paragraph.append(parse_xml(f'<w:bookmarkEnd {nsdecls("w")} w:id="0"/>'))
+    bookmarked_template_path = tmp_path / "bookmarked_template.docx"
+    template.save(bookmarked_template_path)
+
+    build_statements(
+        str(bookmarked_template_path),
+        str(tmp_path),
+        students_configs,
+        common_config,
+        workers=2,
+        single_document=True,
+    )
+
+    body = Document(tmp_path / "Выписки.docx").element.body
+    starts_ids = body.xpath('.//w:bookmarkStart/@w:id')
+    assert len(starts_ids) == len(set(starts_ids)) == len(students_configs)
+    assert sorted(body.xpath('.//w:bookmarkEnd/@w:id')) == sorted(starts_ids)
+
+
+def test_build_statements_incremental(template_path, tmp_path, students_configs, common_config):
+    build_statements(
+        template_path, str(tmp_path), students_configs, common_config, incremental=True
+    )
+    ivanov_path = tmp_path / "Выписка_Иванов Иван.docx"
+    petrov_path = tmp_path / "Выписка_Петров Петр.docx"
+
+    corrected_students_configs = [
+        replace(students_configs[0], diploma_theme="Исправленная тема"),
+        replace(students_configs[1], full_name="Сидоров Сидор"),
+    ]
+    documents_count = build_statements(
+        template_path, str(tmp_path), corrected_students_configs, common_config, incremental=True
+    )
+
+    assert documents_count == 2
+    assert Document(ivanov_path).paragraphs[19].text.endswith("«Исправленная тема»")
+    assert not petrov_path.exists()
+    sidorov_path = tmp_path / "Выписка_Сидоров Сидор.docx"
+    assert Document(sidorov_path).paragraphs[5].text == "Сидоров Сидор"
+
+    mtimes_ns = [os.stat(path).st_mtime_ns for path in (ivanov_path, sidorov_path)]
+    documents_count = build_statements(
+        template_path, str(tmp_path), corrected_students_configs, common_config, incremental=True
+    )
+
+    assert documents_count == 0
+    assert [os.stat(path).st_mtime_ns for path in (ivanov_path, sidorov_path)] == mtimes_ns
+
+    documents_count = build_statements(
+        template_path,
+        str(tmp_path),
+        corrected_students_configs,
+        replace(common_config, statement_date_day="06"),
+        incremental=True,
+    )
+
+    assert documents_count == 2
+
+
+def test_build_statements_incremental_after_other_writes(
+    template_path, tmp_path, students_configs, common_config
+):
+    ivanov_path = tmp_path / "Выписка_Иванов Иван.docx"
+    corrected_students_configs = [
+        replace(students_configs[0], diploma_theme="Исправленная тема"),
+        students_configs[1],
+    ]
+    build_statements(
+        template_path, str(tmp_path), students_configs, common_config, incremental=True
+    )
+    build_statements(template_path, str(tmp_path), corrected_students_configs, common_config)
+
+    documents_count = build_statements(
+        template_path, str(tmp_path), students_configs, common_config, incremental=True
+    )
+
+    assert documents_count == 2
+    assert Document(ivanov_path).paragraphs[19].text.endswith("«Тема 1»")
+
+    # A run stopped without updating the manifest leaves a rewritten file with a different stamp.
+    build_docx(template_path, str(tmp_path), corrected_students_configs[0], common_config)
+    with open(ivanov_path, "ab") as file:
+        file.write(b"\0")
+
+    documents_count = build_statements(
+        template_path, str(tmp_path), students_configs, common_config, incremental=True
+    )
+
+    assert documents_count == 1
+    assert Document(ivanov_path).paragraphs[19].text.endswith("«Тема 1»")
+
+
+def add_rows_run_by_run(table, rows):
+    for row in rows:
+        new_row = table.add_row()
+        for i, (cell, text) in enumerate(zip(new_row.cells, row, strict=True)):
+            cell_paragraph = cell.paragraphs[0]
+            cell_paragraph.add_run(text).font.size = Pt(10)
+            if i > 0:
+                cell_paragraph.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+
+
+def test_table_rows_builder_matches_rows_built_run_by_run(template_path, students_configs):
+    rows = [*students_configs[0].regular_disciplines, *students_configs[1].regular_disciplines]
+    expected_document = Document(template_path)
+    add_rows_run_by_run(expected_document.tables[0], rows)
+    table_rows_builder = TableRowsBuilder()
+
+    document = Document(template_path)
+    table_rows_builder.add_rows(document.tables[0], rows)
+    table_rows_builder.add_rows(document.tables[1], [])
+
+    assert document.element.xml == expected_document.element.xml
+
+
+def test_table_rows_builder_reuses_cached_cells(template_path):
+    table_rows_builder = TableRowsBuilder(max_cached_cells=3)
+    rows = [("Математика", "120 (3,5 з.е.)", "пять"), ("Математика", "120 (3,5 з.е.)", "шесть")]
+
+    first_document = Document(template_path)
+    table_rows_builder.add_rows(first_document.tables[0], rows[:1])
+    second_document = Document(template_path)
+    table_rows_builder.add_rows(second_document.tables[0], rows)
+    second_document.tables[0].rows[1].cells[0].text = "Физика"
+
+    assert get_tables_rows(first_document)[0] == rows[:1]
+    assert get_tables_rows(second_document)[0] == [("Физика", *rows[0][1:]), rows[1]]
+
+
+def test_table_rows_builder_evicts_least_recently_used_cell(template_path):
+    table_rows_builder = TableRowsBuilder(max_cached_cells=3)
+    document = Document(template_path)
+    table_rows_builder.add_rows(document.tables[0], [("Математика", "120", "пять")])
+    table_rows_builder.add_rows(document.tables[0], [("Математика", "120", "шесть")])
+
+    assert [key[1] for key in table_rows_builder._cells] == ["Математика", "120", "шесть"]
+
+
+def test_render_docx(template_path, tmp_path, students_configs, common_config):
+    build_docx(template_path, str(tmp_path), students_configs[0], common_config)
+    expected_xml = Document(tmp_path / "Выписка_Иванов Иван.docx").element.xml
+    template_content = Path(template_path).read_bytes()
+    stream = io.BytesIO()
+
+    content = render_docx(template_content, students_configs[0], common_config)
+    assert (
+        render_docx(io.BytesIO(template_content), students_configs[0], common_config, stream)
+        is None
+    )
+
+    assert Document(io.BytesIO(content)).element.xml == expected_xml
+    assert Document(io.BytesIO(stream.getvalue())).element.xml == expected_xml
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_build_statements_from_template_bytes(
+    template_path, tmp_path, students_configs, common_config, workers
+):
+    expected_directory = tmp_path / "expected"
+    expected_directory.mkdir()
+    build_statements(template_path, str(expected_directory), students_configs, common_config)
+
+    documents_count = build_statements(
+        io.BytesIO(Path(template_path).read_bytes()),
+        str(tmp_path),
+        students_configs,
+        common_config,
+        workers=workers,
+        incremental=True,
+    )
+
+    assert documents_count == 2
+    for student_config in students_configs:
+        file_name = f"Выписка_{student_config.full_name}.docx"
+        assert (
+            Document(tmp_path / file_name).element.xml
+            == Document(expected_directory / file_name).element.xml
+        )
+
+
+def test_build_statements_zip(template_path, tmp_path, students_configs, common_config):
+    build_statements(template_path, str(tmp_path), students_configs, common_config)
+    stream = io.BytesIO()
+
+    content = build_statements_zip(template_path, students_configs, common_config)
+    assert (
+        build_statements_zip(template_path, iter(students_configs), common_config, stream) is None
+    )
+
+    for archive_content in (content, stream.getvalue()):
+        with zipfile.ZipFile(io.BytesIO(archive_content)) as archive:
+            assert archive.namelist() == ["Выписка_Иванов Иван.docx", "Выписка_Петров Петр.docx"]
+            for name in archive.namelist():
+                assert (
+                    Document(io.BytesIO(archive.read(name))).element.xml
+                    == Document(tmp_path / name).element.xml
+                )
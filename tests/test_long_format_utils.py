@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+
+from backend import data_utils
+from backend.long_format_utils import (
+    get_students_configs,
+    get_students_stats_long,
+    get_students_with_avg_mark,
+)
+from backend.pandas_utils import get_students_stats_raw
+
+
+@pytest.fixture
+def sample_joined_df():
+    return pd.DataFrame(
+        {
+            "ФИО": ["Иванов Иван", "Петров Петр", "Сидоров Сидор"],
+            "1.Математика/120:3.5:ЭК": [5, 4, 10],
+            "1.Физика/80:0:ЗЧ": ["зч", "зч", "зч"],
+            "1.Практика/60:2:ПР": [8, 9, 7],
+            "2.Математика/100:3:ЭК": [6, 7, "зч"],
+            "2.Курсовая работа/40:1:КР": [9, 9, 9],
+            "2.Физика/70:2:ЗЧ": ["зч", "зч", "зч"],
+            "3.Курсовой проект/40:1.5:КП": [10, 8, 6],
+            "3.Химия/90:2.5:ЭК": [4, 5, 6],
+        }
+    )
+
+
+@pytest.fixture
+def sample_diploma_themes_df():
+    return pd.DataFrame(
+        {
+            "ФИО": ["Иванов Иван", "Петров Петр", "Сидоров Сидор"],
+            "Тема дипломного проекта": ["Тема 1", "Тема 2", "Тема 3"],
+        }
+    )
+
+
+def get_dict_path_results(joined_df, diploma_themes_df):
+    data_with_configs = data_utils.get_students_stats_with_discipline_configs(
+        get_students_stats_raw(joined_df)
+    )
+    data_summarized = (
+        data_utils.get_students_stats_with_discipline_configs_grouped_by_category_summarized(
+            data_utils.get_students_stats_with_discipline_configs_grouped_by_category(
+                data_with_configs
+            )
+        )
+    )
+    return (
+        data_utils.get_students_configs(data_summarized, diploma_themes_df),
+        data_utils.get_students_with_avg_mark(data_with_configs),
+    )
+
+
+def test_get_students_stats_long(sample_joined_df):
+    result = get_students_stats_long(sample_joined_df)
+
+    assert len(result) == 3 * 8
+    first_student = result[result["student"] == "Иванов Иван"]
+    assert first_student["discipline"].tolist() == [
+        "Математика",
+        "Физика",
+        "Математика",
+        "Физика",
+        "Химия",
+        "Курсовая работа",
+        "Курсовой проект",
+        "Практика",
+    ]
+    assert first_student["category"].tolist()[-1] == "practice"
+
+
+def test_long_format_engine_matches_dict_path(sample_joined_df, sample_diploma_themes_df):
+    expected_configs, expected_avg_marks = get_dict_path_results(
+        sample_joined_df, sample_diploma_themes_df
+    )
+
+    students_stats_long = get_students_stats_long(sample_joined_df)
+
+    assert get_students_configs(students_stats_long, sample_diploma_themes_df) == expected_configs
+    assert get_students_with_avg_mark(students_stats_long) == expected_avg_marks
+
+
+def test_long_format_engine_matches_dict_path_with_duplicated_students(
+    sample_joined_df, sample_diploma_themes_df
+):
+    joined_df = pd.concat([sample_joined_df, sample_joined_df.iloc[[0]]], ignore_index=True)
+    joined_df.loc[3, "3.Химия/90:2.5:ЭК"] = 9
+    expected_configs, expected_avg_marks = get_dict_path_results(
+        joined_df, sample_diploma_themes_df
+    )
+
+    students_stats_long = get_students_stats_long(joined_df)
+
+    assert get_students_configs(students_stats_long, sample_diploma_themes_df) == expected_configs
+    assert get_students_with_avg_mark(students_stats_long) == expected_avg_marks
+
+
+def test_get_students_configs_unknown_mark(sample_joined_df, sample_diploma_themes_df):
+    sample_joined_df.loc[1, "3.Химия/90:2.5:ЭК"] = 3
+
+    with pytest.raises(KeyError):
+        get_students_configs(get_students_stats_long(sample_joined_df), sample_diploma_themes_df)
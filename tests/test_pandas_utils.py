@@ -1,7 +1,19 @@
+import io
+
 import pandas as pd
 import pytest
 
-from backend.pandas_utils import get_students_stats_raw, join_dfs, map_dfs_columns, read_xlsx
+from backend.pandas_utils import (
+    get_students_dropped_by_join,
+    get_students_stats_raw,
+    iter_students_stats_raw,
+    join_dfs,
+    join_dfs_indexed,
+    make_students_with_avg_mark_xlsx_file,
+    map_dfs_columns,
+    read_xlsx,
+    write_students_with_avg_mark_xlsx,
+)
 
 
 @pytest.fixture
@@ -62,3 +74,119 @@ def test_get_students_stats_raw(sample_dataframe_1):
 
     assert isinstance(result, list)
     assert result == expected_output
+
+
+def test_iter_students_stats_raw(sample_dataframe_1):
+    df = pd.concat([sample_dataframe_1] * 3, ignore_index=True)
+
+    result = iter_students_stats_raw(df, chunk_size=2)
+
+    assert not isinstance(result, list)
+    assert list(result) == get_students_stats_raw(df)
+
+
+def test_read_xlsx_cache(monkeypatch, tmp_path):
+    file_path = tmp_path / "semester.xlsx"
+    file_path.write_bytes(b"workbook")
+    cache_directory_path = str(tmp_path / "cache")
+    expected_df = pd.DataFrame({"ФИО": ["Иванов Иван"], "Математика": [5]})
+    read_paths = []
+
+    def mock_read_excel(path):
+        read_paths.append(path)
+        return expected_df
+
+    monkeypatch.setattr(pd, "read_excel", mock_read_excel)
+
+    first_df = read_xlsx(str(file_path), cache_directory_path=cache_directory_path)
+    second_df = read_xlsx(str(file_path), cache_directory_path=cache_directory_path)
+
+    assert read_paths == [str(file_path)]
+    pd.testing.assert_frame_equal(first_df, expected_df)
+    pd.testing.assert_frame_equal(second_df, expected_df)
+
+    file_path.write_bytes(b"corrected workbook")
+    read_xlsx(str(file_path), cache_directory_path=cache_directory_path)
+
+    assert read_paths == [str(file_path), str(file_path)]
+
+
+def test_read_xlsx_memory_cache(monkeypatch, tmp_path):
+    file_path = tmp_path / "semester.xlsx"
+    file_path.write_bytes(b"shared workbook")
+    expected_df = pd.DataFrame({"ФИО": ["Иванов Иван"], "Математика": [5]})
+    read_paths = []
+
+    def mock_read_excel(path):
+        read_paths.append(path)
+        return expected_df
+
+    monkeypatch.setattr(pd, "read_excel", mock_read_excel)
+
+    first_df = read_xlsx(str(file_path), memory_cache=True)
+    second_df = read_xlsx(str(file_path), memory_cache=True)
+
+    assert read_paths == [str(file_path)]
+    assert second_df is first_df
+
+
+def test_map_dfs_columns_does_not_modify_input(sample_dataframe_1):
+    mapped_df = map_dfs_columns([sample_dataframe_1])[0]
+
+    assert sample_dataframe_1.columns.tolist() == ["ФИО", "Математика", "Физика"]
+    assert mapped_df.columns.tolist() == ["ФИО", "1.Математика", "1.Физика"]
+
+
+@pytest.mark.parametrize(
+    "third_df",
+    [
+        pd.DataFrame({"ФИО": ["Петров Петр", "Сидоров Сидор", "Иванов Иван"], "Химия": [5, 4, 3]}),
+        pd.DataFrame({"Химия": [5, 4], "ФИО": ["Петров Петр", "Иванов Иван"]}),
+        pd.DataFrame({"ФИО": ["Иванов Иван", "Иванов Иван"], "Химия": [5, 4]}),
+        pd.DataFrame({"ФИО": ["Иванов Иван", "Петров Петр"], "Физика": [5, 4]}),
+    ],
+)
+def test_join_dfs_indexed(sample_dataframe_1, sample_dataframe_2, third_df):
+    dfs = [sample_dataframe_2.iloc[::-1], sample_dataframe_1, third_df]
+
+    pd.testing.assert_frame_equal(join_dfs_indexed(dfs), join_dfs(dfs))
+
+
+def test_get_students_dropped_by_join(sample_dataframe_1):
+    other_df = pd.DataFrame(
+        {"ФИО": ["Сидоров Сидор", "Петров Петр", "Козлов Козёл"], "Химия": [5, 4, 3]}
+    )
+    dfs = [sample_dataframe_1, other_df]
+
+    assert get_students_dropped_by_join(dfs, join_dfs_indexed(dfs)) == [
+        "Иванов Иван",
+        "Сидоров Сидор",
+        "Козлов Козёл",
+    ]
+
+
+@pytest.mark.parametrize("as_stream", [False, True])
+def test_read_xlsx_from_bytes(tmp_path, sample_dataframe_1, as_stream):
+    file_path = tmp_path / "semester.xlsx"
+    sample_dataframe_1.to_excel(file_path, index=False)
+    content = file_path.read_bytes()
+
+    result_df = read_xlsx(io.BytesIO(content) if as_stream else content)
+    cached_df = read_xlsx(content, cache_directory_path=str(tmp_path / "cache"))
+
+    pd.testing.assert_frame_equal(result_df, sample_dataframe_1)
+    pd.testing.assert_frame_equal(cached_df, sample_dataframe_1)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+def test_write_students_with_avg_mark_xlsx(tmp_path):
+    data_with_avg_marks = (("Иванов Иван", 7.5), ("Петров Петр", 7.0))
+    stream = io.BytesIO()
+
+    content = write_students_with_avg_mark_xlsx(data_with_avg_marks)
+    assert write_students_with_avg_mark_xlsx(data_with_avg_marks, stream) is None
+
+    make_students_with_avg_mark_xlsx_file(data_with_avg_marks, str(tmp_path))
+    expected_df = pd.read_excel(tmp_path / "СРЕДНИЕ БАЛЛЫ.xlsx")
+    pd.testing.assert_frame_equal(pd.read_excel(io.BytesIO(content)), expected_df)
+    pd.testing.assert_frame_equal(pd.read_excel(io.BytesIO(stream.getvalue())), expected_df)
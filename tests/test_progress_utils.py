@@ -0,0 +1,47 @@
+import signal
+import threading
+
+import pytest
+
+from backend.classes.progress_event import ProgressEvent
+from backend.progress_utils import (
+    RunCancelled,
+    estimate_remaining_time,
+    ignore_interrupts,
+    iter_with_progress,
+)
+
+
+def test_iter_with_progress():
+    events = []
+
+    assert list(iter_with_progress("абв", "stage", 3, events.append)) == ["а", "б", "в"]
+    assert events == [ProgressEvent("stage", done, 3) for done in (1, 2, 3)]
+
+
+def test_iter_with_progress_cancelled():
+    cancel_event = threading.Event()
+    items = iter_with_progress(range(10), "stage", cancel_event=cancel_event)
+
+    assert next(items) == 0
+    cancel_event.set()
+    with pytest.raises(RunCancelled):
+        next(items)
+
+
+@pytest.mark.parametrize(
+    ("elapsed_time", "done", "total", "expected"),
+    [(10.0, 2, 6, 20.0), (10.0, 0, 6, None), (10.0, 2, None, None), (10.0, 7, 6, 0.0)],
+)
+def test_estimate_remaining_time(elapsed_time, done, total, expected):
+    assert estimate_remaining_time(elapsed_time, done, total) == expected
+
+
+def test_ignore_interrupts():
+    previous_sigint_handler = signal.getsignal(signal.SIGINT)
+    try:
+        ignore_interrupts()
+
+        assert signal.getsignal(signal.SIGINT) is signal.SIG_IGN
+    finally:
+        signal.signal(signal.SIGINT, previous_sigint_handler)
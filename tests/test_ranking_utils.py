@@ -0,0 +1,121 @@
+import numpy
+import pandas as pd
+import pytest
+
+from backend import data_utils
+from backend.pandas_utils import get_students_stats_raw
+from backend.ranking_utils import (
+    get_marks_matrix,
+    get_ranking_df,
+    get_ranks,
+    get_students_ranking,
+    get_students_with_avg_mark,
+)
+
+
+@pytest.fixture
+def sample_joined_df():
+    return pd.DataFrame(
+        {
+            "ФИО": ["Иванов Иван", "Петров Петр", "Сидоров Сидор"],
+            "1.Математика/120:3.5:ЭК": [5, 4, 10],
+            "1.Физика/80:0:ЗЧ": ["зч", "зч", "зч"],
+            "1.Практика/60:2:ПР": [8, 9, 7],
+            "2.Математика/100:3:ЭК": [6, 7, "зч"],
+            "2.Курсовая работа/40:1:КР": [9, 9, 9],
+            "2.Физика/70:2:ЗЧ": ["зч", "зч", "зч"],
+            "3.Курсовой проект/40:1.5:КП": [10, 8, 6],
+            "3.Химия/90:2.5:ЭК": [4, 5, 6],
+        }
+    )
+
+
+def get_dict_path_avg_marks(joined_df):
+    return data_utils.get_students_with_avg_mark(
+        data_utils.get_students_stats_with_discipline_configs(get_students_stats_raw(joined_df))
+    )
+
+
+def test_get_marks_matrix_numpy_integers():
+    marks_df = pd.DataFrame(
+        {
+            "a": pd.Series([numpy.int64(5), "зч", None], dtype=object),
+            "b": [1.5, 2.0, 3.0],
+            "c": pd.array([7, None, 9], dtype="Int64"),
+        }
+    )
+
+    result = get_marks_matrix(marks_df)
+
+    expected = numpy.array([[5.0, numpy.nan, 7.0], [numpy.nan] * 3, [numpy.nan, numpy.nan, 9.0]])
+    numpy.testing.assert_array_equal(result, expected)
+
+
+def test_get_ranks_ties():
+    assert get_ranks(numpy.array([7.0, 9.0, 7.0, 5.0])).tolist() == [2, 1, 2, 4]
+
+
+def test_get_students_ranking(sample_joined_df):
+    ranking = get_students_ranking(sample_joined_df)
+
+    assert ranking.full_names == ["Сидоров Сидор", "Иванов Иван", "Петров Петр"]
+    assert ranking.ranks.tolist() == [1, 2, 2]
+    assert ranking.avg_marks.tolist() == pytest.approx([7.6, 7, 7])
+    assert ranking.weighted_avg_marks[1] == pytest.approx(85.5 / 13.5)
+    assert ranking.semesters == (1, 2, 3)
+    assert ranking.semesters_avg_marks[0].tolist() == pytest.approx([8.5, 9, 6])
+    assert ranking.semesters_avg_marks[1].tolist() == pytest.approx([6.5, 7.5, 7])
+
+
+def test_get_students_ranking_by_weighted_avg_mark(sample_joined_df):
+    ranking = get_students_ranking(sample_joined_df, rank_by="weighted_avg_mark")
+
+    assert numpy.all(numpy.diff(ranking.weighted_avg_marks) <= 0)
+    assert ranking.ranks.tolist() == [1, 2, 3]
+
+
+def test_get_students_ranking_unknown_metric(sample_joined_df):
+    with pytest.raises(ValueError):
+        get_students_ranking(sample_joined_df, rank_by="median_mark")
+
+
+def test_get_students_with_avg_mark_matches_dict_path(sample_joined_df):
+    joined_df = pd.concat([sample_joined_df, sample_joined_df.iloc[[0]]], ignore_index=True)
+    joined_df.loc[3, "3.Химия/90:2.5:ЭК"] = 9
+
+    result = get_students_with_avg_mark(get_students_ranking(joined_df))
+    expected = get_dict_path_avg_marks(joined_df)
+
+    assert [full_name for full_name, _ in result] == [full_name for full_name, _ in expected]
+    assert [avg_mark for _, avg_mark in result] == pytest.approx(
+        [avg_mark for _, avg_mark in expected]
+    )
+
+
+def test_get_students_with_avg_mark_matches_dict_path_with_numpy_integers(sample_joined_df):
+    sample_joined_df["2.Математика/100:3:ЭК"] = pd.Series(
+        [numpy.int64(6), numpy.int64(7), "зч"], dtype=object
+    )
+
+    result = get_students_with_avg_mark(get_students_ranking(sample_joined_df))
+
+    assert result == get_dict_path_avg_marks(sample_joined_df)
+    assert dict(result)["Иванов Иван"] == 7
+
+
+def test_get_ranking_df(sample_joined_df):
+    ranking = get_students_ranking(sample_joined_df)
+
+    result = get_ranking_df(ranking, ["rank", "full_name", "semesters_avg_marks"])
+
+    assert result.columns.tolist() == [
+        "Место",
+        "ФИО",
+        "Средний балл за 1 семестр",
+        "Средний балл за 2 семестр",
+        "Средний балл за 3 семестр",
+    ]
+    assert result["ФИО"].tolist() == ranking.full_names
+
+    with pytest.raises(ValueError):
+        get_ranking_df(ranking, ["median_mark"])
@@ -0,0 +1,335 @@
+import datetime
+import json
+import os
+import threading
+
+import pandas as pd
+import pytest
+from docx import Document
+
+from backend import data_utils
+from backend.classes.progress_event import ProgressEvent
+from backend.classes.run_report import RunReport
+from backend.manifest_utils import MANIFEST_RANKING_KEY, MANIFEST_STATEMENTS_KEY, load_manifest
+from backend.runtime import runtime
+from backend.streaming_utils import ProducerError
+
+
+@pytest.fixture
+def state_holder(tmp_path, template_path):
+    semester_dfs = [
+        pd.DataFrame(
+            {
+                "ФИО": ["Иванов Иван", "Петров Петр"],
+                "Математика/120:3.5:ЭК": [5, 4],
+                "Физика/80:0:ЗЧ": ["зч", "зч"],
+            }
+        ),
+        pd.DataFrame(
+            {
+                "ФИО": ["Петров Петр", "Иванов Иван", "Сидоров Сидор"],
+                "Математика/100:3:ЭК": [7, 6, 8],
+                "Курсовая работа/40:1:КР": [9, 10, 4],
+                "Практика/60:2:ПР": [8, 9, 7],
+            }
+        ),
+    ]
+    semester_files_paths = []
+    for i, semester_df in enumerate(semester_dfs):
+        path = tmp_path / f"semester_{i + 1}.xlsx"
+        semester_df.to_excel(path, index=False)
+        semester_files_paths.append(str(path))
+
+    diploma_file_path = tmp_path / "themes.xlsx"
+    pd.DataFrame(
+        {"ФИО": ["Иванов Иван", "Петров Петр"], "Тема дипломного проекта": ["Тема 1", "Тема 2"]}
+    ).to_excel(diploma_file_path, index=False)
+
+    save_directory_path = tmp_path / "output"
+    save_directory_path.mkdir()
+
+    return {
+        'semester_files_count': 2,
+        'semester_files_paths': semester_files_paths,
+        'diploma_file_path': str(diploma_file_path),
+        'template_file_path': template_path,
+        'save_directory_path': str(save_directory_path),
+        'speciality_name': "Программное обеспечение информационных технологий",
+        'speciality_code': "1-40 01 01",
+        'speciality_area_name': "Программирование",
+        'speciality_area_code': "1-40 01 01-01",
+        'start_date': datetime.date(2020, 9, 1),
+        'end_date': datetime.date(2024, 6, 30),
+        'statement_date': datetime.date(2024, 7, 5),
+    }
+
+
+@pytest.mark.parametrize(
+    ("data_engine", "compact_configs"),
+    [("dict", False), ("dict", True), ("long", False), ("fused", False), ("fused", True)],
+)
+def test_runtime(state_holder, data_engine, compact_configs):
+    state_holder['data_engine'] = data_engine
+    state_holder['compact_configs'] = compact_configs
+
+    assert runtime(state_holder) == 4
+
+    save_directory_path = state_holder['save_directory_path']
+    document = Document(f"{save_directory_path}/Выписка_Иванов Иван.docx")
+    assert document.paragraphs[5].text == "Иванов Иван"
+    assert [cell.text for cell in document.tables[0].rows[1].cells] == [
+        "Математика",
+        "220 (6,5 з.е.)",
+        "пять, шесть",
+    ]
+    avg_marks_df = pd.read_excel(f"{save_directory_path}/СРЕДНИЕ БАЛЛЫ.xlsx")
+    assert avg_marks_df["ФИО"].tolist() == ["Иванов Иван", "Петров Петр"]
+    assert avg_marks_df["Средний балл"].tolist() == pytest.approx([7.5, 7.0])
+
+
+@pytest.mark.parametrize("ingest_executor", ["thread", "process"])
+def test_runtime_malformed_diploma_file(state_holder, tmp_path, ingest_executor):
+    state_holder['ingest_executor'] = ingest_executor
+    state_holder['diploma_file_path'] = str(tmp_path / "missing.xlsx")
+
+    assert runtime(state_holder) == 2
+
+
+@pytest.mark.parametrize("statements_workers", [1, 2])
+def test_runtime_streaming(state_holder, tmp_path, statements_workers):
+    expected_directory = tmp_path / "expected"
+    expected_directory.mkdir()
+    assert runtime({**state_holder, 'save_directory_path': str(expected_directory)}) == 4
+    state_holder['streaming'] = True
+    state_holder['streaming_queue_size'] = 1
+    state_holder['statements_workers'] = statements_workers
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 4
+
+    assert [stage_report.name for stage_report in report.stages] == [
+        "read_workbooks",
+        "join_workbooks",
+        "stream_statements",
+        "write_ranking",
+    ]
+    assert report.stages[2].counters == {"documents_written": 2, "students": 2}
+    save_directory_path = state_holder['save_directory_path']
+    for file_name in ("Выписка_Иванов Иван.docx", "Выписка_Петров Петр.docx"):
+        assert (
+            Document(f"{save_directory_path}/{file_name}").element.xml
+            == Document(expected_directory / file_name).element.xml
+        )
+    assert pd.read_excel(f"{save_directory_path}/СРЕДНИЕ БАЛЛЫ.xlsx").equals(
+        pd.read_excel(expected_directory / "СРЕДНИЕ БАЛЛЫ.xlsx")
+    )
+
+
+def test_runtime_streaming_malformed_mark(state_holder, tmp_path):
+    semester_file_path = tmp_path / "semester_3.xlsx"
+    pd.DataFrame({"ФИО": ["Иванов Иван", "Петров Петр"], "Химия/60:2:ЭК": [5, 11]}).to_excel(
+        semester_file_path, index=False
+    )
+    state_holder['semester_files_paths'].append(str(semester_file_path))
+    state_holder['streaming'] = True
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 1
+    assert report.error == "KeyError: 11"
+
+
+def test_runtime_missing_diploma_theme(state_holder, tmp_path):
+    diploma_file_path = tmp_path / "themes_incomplete.xlsx"
+    pd.DataFrame({"ФИО": ["Иванов Иван"], "Тема дипломного проекта": ["Тема 1"]}).to_excel(
+        diploma_file_path, index=False
+    )
+    state_holder['diploma_file_path'] = str(diploma_file_path)
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 2
+    assert report.error == "Students without a diploma theme: Петров Петр"
+    assert [stage_report.name for stage_report in report.stages] == [
+        "read_workbooks",
+        "join_workbooks",
+    ]
+
+
+def test_runtime_malformed_semester_file(state_holder, tmp_path):
+    state_holder['semester_files_paths'][1] = str(tmp_path / "missing.xlsx")
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 1
+    assert report.return_code == 1
+    assert "FileNotFoundError" in report.error
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_runtime_programming_error(monkeypatch, state_holder, streaming):
+    def get_student_config(*args, **kwargs):
+        raise TypeError("a bug")
+
+    monkeypatch.setattr(data_utils, "get_student_config", get_student_config)
+    state_holder['streaming'] = streaming
+
+    with pytest.raises((TypeError, ProducerError)) as excinfo:
+        runtime(state_holder)
+    error = excinfo.value.__cause__ if streaming else excinfo.value
+    assert isinstance(error, TypeError)
+
+
+def test_runtime_malformed_template(state_holder, tmp_path):
+    template_path = tmp_path / "short_template.docx"
+    Document().save(template_path)
+    state_holder['template_file_path'] = str(template_path)
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 3
+    assert report.stages == []
+    assert "TemplateError" in report.error
+    assert not os.listdir(state_holder['save_directory_path'])
+
+
+def test_runtime_incremental(state_holder):
+    state_holder['incremental'] = True
+    assert runtime(state_holder) == 4
+    save_directory_path = state_holder['save_directory_path']
+    avg_marks_path = f"{save_directory_path}/СРЕДНИЕ БАЛЛЫ.xlsx"
+    avg_marks_mtime_ns = os.stat(avg_marks_path).st_mtime_ns
+
+    assert runtime(state_holder) == 4
+
+    assert os.stat(avg_marks_path).st_mtime_ns == avg_marks_mtime_ns
+
+    state_holder['incremental'] = False
+    assert runtime(state_holder) == 4
+
+    manifest = load_manifest(save_directory_path)
+    assert manifest[MANIFEST_STATEMENTS_KEY] == {}
+    assert manifest[MANIFEST_RANKING_KEY] == {}
+
+    state_holder['incremental'] = True
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 4
+
+    stage_report = next(stage for stage in report.stages if stage.name == "build_statements")
+    assert stage_report.counters['documents_written'] == 2
+
+
+def test_runtime_ranking_columns(state_holder):
+    state_holder['ranking_columns'] = [
+        "rank",
+        "full_name",
+        "weighted_avg_mark",
+        "semesters_avg_marks",
+    ]
+    state_holder['ranking_metric'] = "weighted_avg_mark"
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 4
+
+    assert "rank" in [stage_report.name for stage_report in report.stages]
+    avg_marks_df = pd.read_excel(f"{state_holder['save_directory_path']}/СРЕДНИЕ БАЛЛЫ.xlsx")
+    assert avg_marks_df.columns.tolist() == [
+        "Место",
+        "ФИО",
+        "Средневзвешенный балл",
+        "Средний балл за 1 семестр",
+        "Средний балл за 2 семестр",
+    ]
+    assert avg_marks_df["Место"].tolist() == [1, 2]
+    assert avg_marks_df["ФИО"].tolist() == ["Иванов Иван", "Петров Петр"]
+    assert avg_marks_df["Средневзвешенный балл"].tolist() == pytest.approx([63.5 / 9.5, 60 / 9.5])
+    assert avg_marks_df["Средний балл за 2 семестр"].tolist() == pytest.approx([25 / 3, 8])
+
+
+def test_runtime_report(state_holder):
+    state_holder['ingest_executor'] = "thread"
+    state_holder['write_report'] = True
+    state_holder['trace_memory'] = True
+    state_holder['profile'] = True
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 4
+
+    assert [stage_report.name for stage_report in report.stages] == [
+        "read_workbooks",
+        "join_workbooks",
+        "transform",
+        "build_statements",
+        "write_ranking",
+    ]
+    counters = {stage_report.name: stage_report.counters for stage_report in report.stages}
+    assert counters["read_workbooks"] == {"semester_files": 2, "rows_read": 5}
+    assert counters["join_workbooks"] == {
+        "students": 2,
+        "disciplines_per_student": 5,
+        "dropped_students": 1,
+    }
+    assert report.dropped_students == ["Сидоров Сидор"]
+    assert counters["build_statements"] == {"documents_written": 2}
+    assert all(stage_report.memory_peak > 0 for stage_report in report.stages)
+    assert report.wall_time >= sum(stage_report.wall_time for stage_report in report.stages)
+    assert report.error is None
+    assert os.path.exists(report.profile_path)
+
+    save_directory_path = state_holder['save_directory_path']
+    with open(f"{save_directory_path}/run_report.json", encoding="utf-8") as file:
+        saved_report = json.load(file)
+    assert saved_report["return_code"] == 4
+    assert saved_report["stages"][3]["counters"] == {"documents_written": 2}
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_runtime_progress(state_holder, streaming):
+    state_holder['ingest_executor'] = "thread"
+    state_holder['streaming'] = streaming
+    events = []
+    state_holder['progress_callback'] = events.append
+
+    assert runtime(state_holder) == 4
+
+    statements_stage = "stream_statements" if streaming else "build_statements"
+    assert [event for event in events if event.stage == statements_stage] == [
+        ProgressEvent(statements_stage, 0, None),
+        ProgressEvent(statements_stage, 1, 2),
+        ProgressEvent(statements_stage, 2, 2),
+    ]
+    assert [event.stage for event in events if event.done == 0] == [
+        "read_workbooks",
+        "join_workbooks",
+        statements_stage if streaming else "transform",
+        *(() if streaming else (statements_stage,)),
+        "write_ranking",
+    ]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_runtime_cancel_between_students(state_holder, streaming):
+    state_holder['ingest_executor'] = "thread"
+    state_holder['streaming'] = streaming
+    cancel_event = threading.Event()
+    state_holder['cancel_event'] = cancel_event
+
+    def progress_callback(event):
+        if event.done == 1:
+            cancel_event.set()
+
+    state_holder['progress_callback'] = progress_callback
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 5
+
+    assert report.error == "Cancelled"
+    save_directory_path = state_holder['save_directory_path']
+    assert os.listdir(save_directory_path) == ["Выписка_Иванов Иван.docx"]
+
+
+def test_runtime_cancel_before_start(state_holder):
+    cancel_event = threading.Event()
+    cancel_event.set()
+    state_holder['cancel_event'] = cancel_event
+    report = RunReport()
+
+    assert runtime(state_holder, report) == 5
+    assert report.stages == []
@@ -0,0 +1,317 @@
+import contextlib
+import functools
+import http.client
+import io
+import json
+import multiprocessing
+import os
+import threading
+import zipfile
+
+import pandas as pd
+import pytest
+from docx import Document
+
+from backend import pandas_utils, service_utils
+from backend.classes.statements_request import StatementsRequest
+from backend.service_utils import ServiceRequestError
+
+FIELDS = [
+    ("speciality_name", "Программное обеспечение информационных технологий"),
+    ("speciality_code", "1-40 01 01"),
+    ("speciality_area_name", "Программирование"),
+    ("speciality_area_code", "1-40 01 01-01"),
+    ("start_date", "2020-09-01"),
+    ("end_date", "2024-06-30"),
+    ("statement_date", "2024-07-05"),
+]
+
+
+def _to_xlsx(df):
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def files():
+    return [
+        (
+            "semester_file",
+            "semester_1.xlsx",
+            _to_xlsx(
+                pd.DataFrame(
+                    {
+                        "ФИО": ["Иванов Иван", "Петров Петр"],
+                        "Математика/120:3.5:ЭК": [5, 4],
+                        "Физика/80:0:ЗЧ": ["зч", "зч"],
+                    }
+                )
+            ),
+        ),
+        (
+            "semester_file",
+            "semester_2.xlsx",
+            _to_xlsx(
+                pd.DataFrame(
+                    {
+                        "ФИО": ["Петров Петр", "Иванов Иван"],
+                        "Математика/100:3:ЭК": [7, 6],
+                        "Практика/60:2:ПР": [8, 9],
+                    }
+                )
+            ),
+        ),
+        (
+            "themes_file",
+            "themes.xlsx",
+            _to_xlsx(
+                pd.DataFrame(
+                    {
+                        "ФИО": ["Иванов Иван", "Петров Петр"],
+                        "Тема дипломного проекта": ["Тема 1", "Тема 2"],
+                    }
+                )
+            ),
+        ),
+    ]
+
+
+@pytest.fixture
+def server(template_path):
+    server = service_utils.make_statements_server(
+        0, template_path, executor=service_utils.THREAD_SERVICE_EXECUTOR, quiet=True
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def _request(server, method, path, body=None, headers=None):
+    host, port = server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, response.getheader("Content-Type"), response.read()
+    finally:
+        connection.close()
+
+
+def test_parse_statements_request(files):
+    content_type, body = service_utils.encode_multipart_form_data(FIELDS, files)
+
+    statements_request = service_utils.parse_statements_request(content_type, body)
+
+    assert statements_request.semester_files == [files[0][2], files[1][2]]
+    assert statements_request.themes_file == files[2][2]
+    assert statements_request.template_file is None
+    assert statements_request.common_config.speciality_area_name == "Программирование"
+    assert statements_request.common_config.start_date_month == "сентября"
+    assert statements_request.common_config.statement_date_day == "05"
+
+
+@pytest.mark.parametrize(
+    ("fields", "message"),
+    [
+        (FIELDS[1:], "Missing fields: speciality_name"),
+        ([*FIELDS, ("speciality_code", "1")], "Repeated fields: speciality_code"),
+        ([*FIELDS, ("output", "x")], "Unknown fields: output"),
+        (FIELDS[:4] + [("start_date", "01.09.2020")] + FIELDS[5:], "YYYY-MM-DD"),
+    ],
+)
+def test_parse_statements_request_malformed(files, fields, message):
+    content_type, body = service_utils.encode_multipart_form_data(fields, files)
+
+    with pytest.raises(ServiceRequestError, match=message) as excinfo:
+        service_utils.parse_statements_request(content_type, body)
+    assert excinfo.value.status == 400
+
+
+def test_parse_statements_request_not_multipart():
+    with pytest.raises(ServiceRequestError) as excinfo:
+        service_utils.parse_statements_request("application/json", b"{}")
+    assert excinfo.value.status == 415
+
+
+def test_build_statements_archive(files, template_path):
+    content_type, body = service_utils.encode_multipart_form_data(FIELDS, files)
+    statements_request = service_utils.parse_statements_request(content_type, body)
+
+    archive = service_utils.build_statements_archive(statements_request, template_path)
+
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        assert zip_file.namelist() == [
+            "Выписка_Иванов Иван.docx",
+            "Выписка_Петров Петр.docx",
+            pandas_utils.AVG_MARKS_FILE_NAME,
+        ]
+        document = Document(io.BytesIO(zip_file.read("Выписка_Петров Петр.docx")))
+        avg_marks_df = pd.read_excel(io.BytesIO(zip_file.read(pandas_utils.AVG_MARKS_FILE_NAME)))
+    assert document.paragraphs[5].text == "Петров Петр"
+    assert document.paragraphs[19].text.endswith("«Тема 2»")
+    assert list(avg_marks_df.iloc[:, 0]) == ["Иванов Иван", "Петров Петр"]
+
+
+def test_build_statements_archive_missing_theme(files, template_path):
+    files[2] = (
+        "themes_file",
+        "themes.xlsx",
+        _to_xlsx(pd.DataFrame({"ФИО": ["Иванов Иван"], "Тема дипломного проекта": ["Тема 1"]})),
+    )
+    content_type, body = service_utils.encode_multipart_form_data(FIELDS, files)
+    statements_request = service_utils.parse_statements_request(content_type, body)
+
+    with pytest.raises(ServiceRequestError, match="Петров Петр") as excinfo:
+        service_utils.build_statements_archive(statements_request, template_path)
+    assert excinfo.value.status == 400
+
+
+def test_build_statements_archive_without_template(files):
+    content_type, body = service_utils.encode_multipart_form_data(FIELDS, files)
+    statements_request = service_utils.parse_statements_request(content_type, body)
+
+    with pytest.raises(ServiceRequestError, match="template_file") as excinfo:
+        service_utils.build_statements_archive(statements_request, None)
+    assert excinfo.value.status == 400
+
+
+def test_statements_service_busy(monkeypatch, template_path, common_config):
+    started = threading.Event()
+    release = threading.Event()
+
+    def build_statements_archive(statements_request, default_template):
+        started.set()
+        release.wait()
+        return b"archive"
+
+    monkeypatch.setattr(service_utils, "build_statements_archive", build_statements_archive)
+    service = service_utils.StatementsService(
+        template_path, workers=1, queue_size=0, executor=service_utils.THREAD_SERVICE_EXECUTOR
+    )
+    statements_request = StatementsRequest([], b"", None, common_config)
+    results = []
+
+    def serve():
+        with service.reserve_slot():
+            results.append(service.build_archive(statements_request))
+
+    try:
+        thread = threading.Thread(target=serve)
+        thread.start()
+        started.wait()
+
+        with pytest.raises(ServiceRequestError) as excinfo, service.reserve_slot():
+            pass
+        assert excinfo.value.status == 503
+
+        release.set()
+        thread.join()
+        assert results == [b"archive"]
+        with service.reserve_slot():
+            assert service.build_archive(statements_request) == b"archive"
+    finally:
+        release.set()
+        service.close()
+
+
+def _crash_once_then_build(crashed_path, statements_request, default_template):
+    if not crashed_path.exists():
+        crashed_path.touch()
+        os._exit(1)
+    return b"archive"
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork", reason="the patched worker must be forked"
+)
+def test_statements_service_worker_crash(monkeypatch, tmp_path, common_config):
+    monkeypatch.setattr(
+        service_utils,
+        "build_statements_archive",
+        functools.partial(_crash_once_then_build, tmp_path / "crashed"),
+    )
+    service = service_utils.StatementsService(workers=1)
+    statements_request = StatementsRequest([], b"", None, common_config)
+    try:
+        with pytest.raises(ServiceRequestError) as excinfo:
+            service.build_archive(statements_request)
+        assert excinfo.value.status == 503
+
+        assert service.build_archive(statements_request) == b"archive"
+    finally:
+        service.close()
+
+
+def test_statements_service_malformed_default_template(tmp_path):
+    path = tmp_path / "blank.docx"
+    Document().save(path)
+
+    with pytest.raises(Exception, match="standard statement template"):
+        service_utils.StatementsService(str(path), executor=service_utils.THREAD_SERVICE_EXECUTOR)
+
+
+def test_server_health(server):
+    status, _, content = _request(server, "GET", service_utils.HEALTH_PATH)
+    health = json.loads(content)
+
+    assert status == 200
+    assert health["status"] == "ok"
+    assert health["default_template"] is True
+
+
+def test_server_statements(server, files):
+    content_type, body = service_utils.encode_multipart_form_data(FIELDS, files)
+
+    for _ in range(2):
+        status, response_content_type, archive = _request(
+            server,
+            "POST",
+            service_utils.STATEMENTS_PATH,
+            body,
+            {"Content-Type": content_type},
+        )
+        assert status == 200
+        assert response_content_type == "application/zip"
+
+        with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+            assert "Выписка_Иванов Иван.docx" in zip_file.namelist()
+
+
+def test_server_statements_bad_request(server, files):
+    content_type, body = service_utils.encode_multipart_form_data(FIELDS[1:], files)
+    status, _, content = _request(
+        server, "POST", service_utils.STATEMENTS_PATH, body, {"Content-Type": content_type}
+    )
+
+    assert status == 400
+    assert json.loads(content) == {"error": "Missing fields: speciality_name"}
+
+
+def test_server_not_found(server):
+    status, _, _ = _request(server, "GET", "/missing")
+
+    assert status == 404
+
+
+def test_server_busy_before_reading_body(server):
+    with contextlib.ExitStack() as stack:
+        for _ in range(server.service.workers + server.service.queue_size):
+            stack.enter_context(server.service.reserve_slot())
+
+        host, port = server.server_address[:2]
+        connection = http.client.HTTPConnection(host, port, timeout=5)
+        try:
+            connection.putrequest("POST", service_utils.STATEMENTS_PATH)
+            connection.putheader("Content-Type", "multipart/form-data; boundary=x")
+            connection.putheader("Content-Length", str(service_utils.MAX_REQUEST_BYTES))
+            connection.endheaders()
+            response = connection.getresponse()
+
+            assert response.status == 503
+            assert json.load(response) == {"error": "The service is busy, retry later"}
+        finally:
+            connection.close()
@@ -0,0 +1,54 @@
+import threading
+
+import pytest
+
+from backend.streaming_utils import ProducerError, iter_through_bounded_queue
+
+
+def test_iter_through_bounded_queue():
+    assert list(iter_through_bounded_queue(iter(range(100)), queue_size=3)) == list(range(100))
+
+
+def test_iter_through_bounded_queue_producer_error():
+    def produce():
+        yield 1
+        raise KeyError("нет отметки")
+
+    items = iter_through_bounded_queue(produce())
+
+    assert next(items) == 1
+    with pytest.raises(ProducerError) as exc_info:
+        next(items)
+    assert isinstance(exc_info.value.__cause__, KeyError)
+
+
+def test_iter_through_bounded_queue_producer_base_exception():
+    def produce():
+        yield 1
+        raise SystemExit(3)
+
+    items = iter_through_bounded_queue(produce())
+
+    assert next(items) == 1
+    with pytest.raises(SystemExit):
+        next(items)
+
+
+def test_iter_through_bounded_queue_stops_producer():
+    produced = []
+    finished = threading.Event()
+
+    def produce():
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield i
+        finally:
+            finished.set()
+
+    items = iter_through_bounded_queue(produce(), queue_size=2)
+    assert [next(items) for _ in range(3)] == [0, 1, 2]
+    items.close()
+
+    assert finished.is_set()
+    assert len(produced) < 10
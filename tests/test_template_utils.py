@@ -0,0 +1,112 @@
+import pytest
+from docx import Document
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+
+from backend.classes.template_anchors import TemplateAnchors
+from backend.template_utils import TemplateError, compile_template, get_element_text
+
+ANCHORED_TEMPLATE_PARAGRAPHS = (
+    "Выписка",
+    "{{full_name}}",
+    "{{study_period}}",
+    "{{speciality}}",
+    "{{speciality_area}}",
+    "{{diploma_theme}}",
+)
+
+
+def make_anchored_document(
+    paragraphs=ANCHORED_TEMPLATE_PARAGRAPHS,
+    tables_markers=("regular_disciplines", "course_disciplines", "practice_disciplines"),
+):
+    document = Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    for marker in tables_markers:
+        table = document.add_table(rows=1, cols=3)
+        table.rows[0].cells[0].text = f"Наименование {{{{{marker}}}}}"
+    paragraph = document.add_paragraph("г. Могилев")
+    paragraph._p.insert(
+        0, parse_xml(f'<w:bookmarkStart {nsdecls("w")} w:id="0" w:name="statement_date"/>')
+    )
+    return document
+
+
+def test_compile_template_anchors():
+    document = make_anchored_document()
+
+    anchors = compile_template(document.element.body)
+
+    assert anchors == TemplateAnchors(
+        full_name=1,
+        study_period=2,
+        speciality=3,
+        speciality_area=4,
+        diploma_theme=5,
+        statement_date=9,
+        regular_disciplines=6,
+        course_disciplines=7,
+        practice_disciplines=8,
+    )
+    assert [table.rows[0].cells[0].text for table in document.tables] == ["Наименование "] * 3
+
+
+def test_compile_template_legacy_positions(template_path):
+    document = Document(template_path)
+
+    anchors = compile_template(document.element.body)
+
+    body_elements = list(document.element.body)
+    assert get_element_text(body_elements[anchors.full_name]) == "Абзац 5"
+    assert get_element_text(body_elements[anchors.statement_date]) == "Абзац 31"
+    assert body_elements[anchors.practice_disciplines] is document.tables[2]._tbl
+
+
+def test_compile_template_marker_split_across_runs():
+    document = make_anchored_document(tables_markers=("course_disciplines", "practice_disciplines"))
+    table = document.add_table(rows=1, cols=3)
+    cell_paragraph = table.rows[0].cells[2].paragraphs[0]
+    cell_paragraph.add_run("Отметка {{regular_")
+    cell_paragraph.add_run("disciplines}}")
+
+    anchors = compile_template(document.element.body)
+
+    assert list(document.element.body)[anchors.regular_disciplines] is table._tbl
+    assert table.rows[0].cells[2].text == "Отметка "
+
+
+@pytest.mark.parametrize(
+    ("paragraphs", "tables_markers", "message"),
+    [
+        (ANCHORED_TEMPLATE_PARAGRAPHS[:-1], None, "Missing template anchors: diploma_theme"),
+        ((*ANCHORED_TEMPLATE_PARAGRAPHS, "{{full_name}}"), None, "Duplicated"),
+        ((*ANCHORED_TEMPLATE_PARAGRAPHS, "{{regular_disciplines}}"), None, "inside a table"),
+        ((*ANCHORED_TEMPLATE_PARAGRAPHS, "{{full_nam}}"), None, "Unknown"),
+        (ANCHORED_TEMPLATE_PARAGRAPHS, ("regular_disciplines", "full_name"), "outside tables"),
+    ],
+)
+def test_compile_template_malformed_anchors(paragraphs, tables_markers, message):
+    document = make_anchored_document(
+        paragraphs,
+        tables_markers or ("regular_disciplines", "course_disciplines", "practice_disciplines"),
+    )
+
+    with pytest.raises(TemplateError, match=message):
+        compile_template(document.element.body)
+
+
+def test_compile_template_table_columns():
+    document = make_anchored_document()
+    document.tables[1].add_column(document.tables[1].columns[0].width)
+
+    with pytest.raises(TemplateError, match="course_disciplines"):
+        compile_template(document.element.body)
+
+
+def test_compile_template_not_a_standard_template():
+    document = Document()
+    document.add_paragraph("Выписка")
+
+    with pytest.raises(TemplateError, match="standard statement template"):
+        compile_template(document.element.body)